@@ -0,0 +1,134 @@
+"""Save the benchmark suite's timings as a baseline, or compare a run of the suite
+with the baseline, failing if any benchmark has regressed.
+
+The baseline is stored in `benchmarks/baseline.json`, which is committed, and holds
+each benchmark's summary statistics (not its raw timings). Timings depend on the
+machine, so the committed baseline is a reference: save a baseline on your own
+machine before you make changes, and compare against it after.
+
+```
+$ python benchmarks/baseline.py save
+$ python benchmarks/baseline.py compare --tolerance 10
+```
+
+Any further arguments are passed to pytest, e.g. `-k formatters`.
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+
+# the statistics which are kept of each benchmark, in seconds
+STATS = ["min", "median", "mean", "stddev"]
+
+# the statistic by which runs are compared. noise (e.g. other processes, or garbage
+# collection) only ever adds time, so the minimum is the most stable
+COMPARE_STAT = "min"
+
+
+def run(pytest_args: list) -> dict:
+    """Run the benchmark suite, and return its summary statistics, keyed by
+    benchmark."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "benchmarks.json")
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                BENCHMARKS_DIR,
+                "-q",
+                f"--benchmark-json={path}",
+                *pytest_args,
+            ],
+            check=True,
+        )
+        with open(path, "r") as fin:
+            results = json.load(fin)
+
+    machine = results["machine_info"]
+    return {
+        "machine": {
+            "python": machine.get("python_version"),
+            "platform": machine.get("system"),
+            "processor": machine.get("cpu", {}).get("brand_raw")
+            or machine.get("processor"),
+        },
+        "benchmarks": {
+            benchmark["fullname"]: {stat: benchmark["stats"][stat] for stat in STATS}
+            for benchmark in results["benchmarks"]
+        },
+    }
+
+
+def save(pytest_args: list):
+    baseline = run(pytest_args)
+    baseline["saved"] = datetime.datetime.now().isoformat(timespec="seconds")
+
+    with open(BASELINE, "w") as fout:
+        json.dump(baseline, fout, indent=2, sort_keys=True)
+        fout.write("\n")
+
+    print(f"Saved {len(baseline['benchmarks'])} benchmarks to {BASELINE}")
+
+
+def compare(pytest_args: list, tolerance: float) -> int:
+    """Compare a run of the suite with the baseline. Returns the number of
+    benchmarks which have regressed by more than `tolerance` percent."""
+    with open(BASELINE, "r") as fin:
+        baseline = json.load(fin)["benchmarks"]
+
+    current = run(pytest_args)["benchmarks"]
+    regressions = 0
+
+    print(f"\n{'benchmark':<72}{'baseline (us)':>14}{'current (us)':>14}{'change':>9}")
+
+    for name, stats in sorted(current.items()):
+        if name not in baseline:
+            current_us = stats[COMPARE_STAT] * 1e6
+            print(f"{name:<72}{'-':>14}{current_us:>14.2f}{'new':>9}")
+            continue
+
+        before = baseline[name][COMPARE_STAT]
+        after = stats[COMPARE_STAT]
+        change = (after - before) / before * 100
+        regressed = change > tolerance
+        regressions += regressed
+        flag = " !" if regressed else ""
+        print(
+            f"{name:<72}{before * 1e6:>14.2f}{after * 1e6:>14.2f}{change:>+8.1f}%{flag}"
+        )
+
+    print(
+        f"\n{regressions} of {len(current)} benchmarks regressed by more than "
+        f"{tolerance}% ({COMPARE_STAT})"
+    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["save", "compare"])
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=10,
+        help="the regression, in percent, above which `compare` fails",
+    )
+    args, pytest_args = parser.parse_known_args()
+
+    if args.command == "save":
+        save(pytest_args)
+    elif compare(pytest_args, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Shared fixtures for the benchmark suite. Benchmarks run offline, against the
+static test data in `tests/`. See the developer guide for usage."""
+import json
+import os
+
+import knackpy
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests")
+
+OBJ = "object_3"
+
+# the number of records with which record-level benchmarks are run
+RECORD_COUNTS = [100, 1000]
+
+# the number of fields with which record-level benchmarks are run. `None` is all of
+# the object's fields
+FIELD_COUNTS = [8, None]
+
+
+def load(filename: str) -> dict:
+    with open(os.path.join(TESTS_DIR, filename), "r") as fin:
+        return json.loads(fin.read())
+
+
+@pytest.fixture(scope="session")
+def metadata():
+    return load("_metadata.json")
+
+
+@pytest.fixture(scope="session")
+def data():
+    return load("_all_fields.json")["records"]
+
+
+@pytest.fixture(scope="session")
+def app(metadata):
+    return knackpy.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+
+
+def scale(data: list, count: int) -> list:
+    """Repeat the fixture records until there are `count` of them, each with a unique
+    record ID."""
+    return [
+        dict(data[i % len(data)], id=f"{data[i % len(data)]['id']}_{i}")
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(params=RECORD_COUNTS, ids=lambda count: f"{count}_records")
+def records_data(request, data):
+    return scale(data, request.param)
+
+
+@pytest.fixture(params=FIELD_COUNTS, ids=lambda count: f"{count or 'all'}_fields")
+def field_defs(request, app):
+    field_defs = app._container_field_defs(OBJ)
+    return field_defs[: request.param] if request.param else field_defs
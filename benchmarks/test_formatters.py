@@ -0,0 +1,45 @@
+import inspect
+
+import knackpy
+import pytest
+from knackpy.record import Record
+
+FORMATTERS = [
+    name
+    for name, func in inspect.getmembers(knackpy.formatters, inspect.isfunction)
+    if func.__module__ == knackpy.formatters.__name__
+]
+
+
+@pytest.fixture
+def fields(app, data):
+    """Return a sample `Field` per formatter, from the first record which has a
+    value for a field of the formatter's type."""
+    field_defs = app._container_field_defs("object_3")
+    fields = {}
+
+    for raw in data:
+        record = Record(raw, field_defs, None, app.timezone)
+        for field in record.fields.values():
+            if field.raw is None:
+                continue
+            name = field.field_def.formatter.__name__
+            fields.setdefault(name, field)
+
+    return fields
+
+
+@pytest.mark.parametrize("formatter", FORMATTERS)
+def test_formatter(benchmark, fields, formatter):
+    field = fields.get(formatter)
+
+    if not field:
+        pytest.skip(f"No sample value for formatter: {formatter}")
+
+    value = field.knack_formatted_value or field.raw
+    kwargs = field._set_formatter_kwargs()
+    benchmark(field.field_def.formatter, value, **kwargs)
+
+
+def test_correct_knack_timestamp(benchmark, app):
+    benchmark(knackpy.utils.correct_knack_timestamp, 1568218440000, app.timezone)
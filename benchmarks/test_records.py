@@ -0,0 +1,31 @@
+import knackpy
+from knackpy.record import Record
+
+from conftest import OBJ
+
+
+def build_records(data, field_defs, timezone):
+    return [Record(record, field_defs, None, timezone) for record in data]
+
+
+def test_field_defs_from_metadata(benchmark, metadata):
+    benchmark(knackpy.fields.field_defs_from_metadata, metadata["application"])
+
+
+def test_record_construction(benchmark, app, records_data, field_defs):
+    benchmark(build_records, records_data, field_defs, app.timezone)
+
+
+def test_record_format(benchmark, app, records_data, field_defs):
+    records = build_records(records_data, field_defs, app.timezone)
+    benchmark(lambda: [record.format() for record in records])
+
+
+def test_unpack_subfields(benchmark, app, records_data, field_defs):
+    records = build_records(records_data, field_defs, app.timezone)
+    benchmark(app._unpack_subfields, records)
+
+
+def test_app_records(benchmark, app, records_data):
+    app.data[OBJ] = records_data
+    benchmark(app._records, OBJ)
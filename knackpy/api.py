@@ -8,10 +8,28 @@ import typing
 
 import requests
 
+from . import decoding
+from . import hooks as _hooks
 from .models import MAX_ROWS_PER_PAGE
+from .multipart import DEFAULT_CHUNK_SIZE, MultipartEncoder
 
 logger = logging.getLogger(__name__)
 
+# Knack compresses responses when asked. Paginated record bodies are large and very
+# repetitive, so we always ask.
+DEFAULT_HEADERS = {"Accept-Encoding": "gzip"}
+
+# bytes read from the response at a time when decoding records incrementally
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# overrides the base URL of all requests when set, e.g. to send requests to a
+# `knackpy.testing.server.MockServer`. Application slugs are then ignored.
+BASE_URL = None
+
+# the `knackpy.cassette.Cassette` through which requests are sent, if any
+CASSETTE = None
+
+
 def _random_pause():
     """sleep for at least .333 seconds"""
     seconds = random.randrange(3, 10, 1)
@@ -34,6 +52,9 @@ def _url(*, route: str, slug: str = None) -> str:
     Returns:
         str: [description]
     """
+    if BASE_URL:
+        return f"{BASE_URL}{route}"
+
     return (
         f"https://{slug}-api.knack.com/v1{route}"
         if slug
@@ -104,10 +125,21 @@ def _request(
     params: dict = None,
     data: dict = None,
     files: BufferedReader = None,
+    body: MultipartEncoder = None,
+    stream: bool = False,
+    session: requests.Session = None,
+    hooks: typing.Iterable[typing.Callable] = None,
 ) -> requests.Response:
-    session = requests.Session()
+    session = session if session else requests.Session()
+    headers = {**DEFAULT_HEADERS, **(headers or {})}
     req = requests.Request(
-        method, url, headers=headers, params=params, json=data, files=files
+        method,
+        url,
+        headers=headers,
+        params=params,
+        json=data,
+        files=files,
+        data=body,
     )
     prepped = req.prepare()
 
@@ -118,19 +150,73 @@ def _request(
             f"{method} to {url} with {params or 'no params'} (Attempt {attempts}/{max_attempts})"  # noqa:E501
         )
 
+        start = time.perf_counter()
+
         try:
-            res = session.send(prepped, timeout=timeout)
+            res = (
+                CASSETTE.send(session, prepped, timeout=timeout, stream=stream)
+                if CASSETTE
+                else session.send(prepped, timeout=timeout, stream=stream)
+            )
+            if hooks:
+                _hooks.emit(
+                    hooks,
+                    _hooks.REQUEST,
+                    prepped,
+                    start,
+                    attempts,
+                    max_attempts,
+                    res=res,
+                    stream=stream,
+                )
             res.raise_for_status()
 
         except (requests.exceptions.Timeout, requests.exceptions.HTTPError) as e:
-            """5xx errors (a recurring problem with the Knack API) and Timeouts
-            (both  ConnectTimeout and ReadTimeout) are suppresed based on
-            max_attempts. Any other error is raised"""
-            if e.response and e.response.status_code < 500:
+            """5xx errors (a recurring problem with the Knack API), 429 (rate
+            limited) errors and Timeouts (both  ConnectTimeout and ReadTimeout) are
+            suppresed based on max_attempts. Any other error is raised"""
+            if hooks and e.response is None:
+                # the request timed out, so no request event has been emitted
+                _hooks.emit(
+                    hooks,
+                    _hooks.REQUEST,
+                    prepped,
+                    start,
+                    attempts,
+                    max_attempts,
+                    error=e,
+                )
+
+            if (
+                e.response is not None
+                and e.response.status_code < 500
+                and e.response.status_code != 429
+            ):
                 raise e
 
             if attempts < max_attempts:
                 logger.debug(f"Error on attempt #{attempts}: {e.__repr__()}")
+
+                if hooks:
+                    _hooks.emit(
+                        hooks,
+                        _hooks.RETRY,
+                        prepped,
+                        start,
+                        attempts,
+                        max_attempts,
+                        res=e.response,
+                        error=e,
+                        stream=stream,
+                    )
+
+                if body is not None:
+                    # a streamed body has been (partially) consumed by the failed
+                    # attempt. it can only be re-sent if it can be re-read
+                    if not body.rewindable:
+                        raise e
+                    body.rewind()
+
                 attempts += 1
                 _random_pause()
                 continue
@@ -140,6 +226,12 @@ def _request(
     return res
 
 
+def _decode(res: requests.Response):
+    """Decode a response's JSON body with the fastest available decoder. See
+    `knackpy.decoding`."""
+    return decoding.loads(res.content)
+
+
 def _continue(total_records: int, current_record_count: int, record_limit: int) -> bool:
     if total_records is None:
         # this case only happens on the *first* API request
@@ -159,6 +251,10 @@ def _get_paginated_records(
     api_key: str = None,
     timeout: int = None,
     filters: typing.Union[dict, list] = None,
+    transform: typing.Callable = None,
+    sort_field: str = None,
+    sort_order: str = None,
+    hooks: typing.Iterable[typing.Callable] = None,
 ) -> list:
     headers = _headers(app_id, api_key)
     records = []
@@ -166,7 +262,13 @@ def _get_paginated_records(
     page = 1
 
     while _continue(total_records, len(records), record_limit):
-        params = {"page": page, "rows_per_page": rows_per_page, "filters": filters}
+        params = {
+            "page": page,
+            "rows_per_page": rows_per_page,
+            "filters": filters,
+            "sort_field": sort_field,
+            "sort_order": sort_order,
+        }
         logger.debug(f"Getting {rows_per_page} records from page {page} from {url}")
         res = _request(
             method="GET",
@@ -175,22 +277,93 @@ def _get_paginated_records(
             timeout=timeout,
             max_attempts=max_attempts,
             params=params,
+            hooks=hooks,
         )
 
-        fetched_records = res.json()["records"]        
+        # decode each page exactly once
+        content = _decode(res)
+        fetched_records = content["records"]
+
+        if transform:
+            fetched_records = [transform(record) for record in fetched_records]
+
         if len(fetched_records) == 0:
-            """Failsafe to handle edge case in which Knack returns fewer records than expected from 
+            """Failsafe to handle edge case in which Knack returns fewer records than expected from
             total_records. Consider `total_records` an estimate"""
             break
 
         records += fetched_records
         page += 1
-        total_records = res.json()["total_records"]
+        total_records = content["total_records"]
 
     # lazily shaving off any remainder to keep the client happy
     return records[0:record_limit] if record_limit < math.inf else records
 
 
+def _generate_paginated_records(
+    *,
+    app_id: str,
+    url: str,
+    max_attempts: int,
+    record_limit: int,
+    rows_per_page: int,
+    api_key: str = None,
+    timeout: int = None,
+    filters: typing.Union[dict, list] = None,
+    transform: typing.Callable = None,
+    sort_field: str = None,
+    sort_order: str = None,
+    hooks: typing.Iterable[typing.Callable] = None,
+):
+    """The streaming counterpart of `_get_paginated_records`. Response bodies are
+    decoded incrementally and records are yielded one at a time as they are decoded.
+    See `knackpy.decoding.RecordPage`."""
+    headers = _headers(app_id, api_key)
+    record_count = 0
+    total_records = None
+    page = 1
+
+    while _continue(total_records, record_count, record_limit):
+        params = {
+            "page": page,
+            "rows_per_page": rows_per_page,
+            "filters": filters,
+            "sort_field": sort_field,
+            "sort_order": sort_order,
+        }
+        logger.debug(f"Streaming {rows_per_page} records from page {page} from {url}")
+        res = _request(
+            method="GET",
+            url=url,
+            headers=headers,
+            timeout=timeout,
+            max_attempts=max_attempts,
+            params=params,
+            stream=True,
+            hooks=hooks,
+        )
+
+        page_count = 0
+        records = decoding.RecordPage(res.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+
+        try:
+            for record in records:
+                yield transform(record) if transform else record
+                page_count += 1
+                record_count += 1
+                if record_count >= record_limit:
+                    return
+        finally:
+            res.close()
+
+        if page_count == 0:
+            # see failsafe note in _get_paginated_records
+            break
+
+        page += 1
+        total_records = records.meta["total_records"]
+
+
 def get(
     *,
     app_id: str,
@@ -203,10 +376,19 @@ def get(
     filters: dict = None,
     max_attempts: int = 5,
     timeout: int = 30,
+    stream: bool = False,
+    transform: typing.Callable = None,
+    sort_field: str = None,
+    sort_order: str = None,
+    hooks: typing.Iterable[typing.Callable] = None,
 ) -> [list, requests.Response]:
     """Get records from a knack object or view. This is the raw stuff with
     incorrect timestamps!
 
+    Set `stream=True` to bound memory usage when fetching wide records: each page is
+    then decoded incrementally as it is received, and records are yielded one at a
+    time rather than returned as a list.
+
     Args:
         app_id (str): [description]
         api_key (str, optional): [description]. Defaults to None.
@@ -221,9 +403,19 @@ def get(
         timeout (int, optional): [description]. Defaults to 30.
         filters ([list, dict], optional): Knack record filter dict or list. Defaults
             to None.
+        stream (bool, optional): If True, returns a generator which yields records as
+            they are decoded from the response stream. Defaults to False.
+        transform (callable, optional): A function which is applied to each record as
+            soon as its page has been decoded, and which returns the record to keep.
+            See `knackpy.ingest`. Defaults to None.
+        sort_field (str, optional): The key of the field by which records will be
+            sorted. Defaults to None (Knack's default sort order).
+        sort_order (str, optional): `asc` or `desc`. Defaults to None.
+        hooks (list, optional): Callables which are called with a
+            `knackpy.hooks.Event` for each request. Defaults to None.
 
     Returns:
-        list: Knack records.
+        list or generator: Knack records.
     """
     route = _route(obj=obj, scene=scene, view=view)
     url = _url(slug=slug, route=route)
@@ -232,19 +424,80 @@ def get(
     rows_per_page = (
         MAX_ROWS_PER_PAGE if record_limit >= MAX_ROWS_PER_PAGE else record_limit
     )
-    return _get_paginated_records(
+    paginate = _generate_paginated_records if stream else _get_paginated_records
+    return paginate(
         app_id=app_id,
         api_key=api_key,
         url=url,
         max_attempts=max_attempts,
         record_limit=record_limit,
         rows_per_page=rows_per_page,
+        timeout=timeout,
         filters=filters,
+        transform=transform,
+        sort_field=sort_field,
+        sort_order=sort_order,
+        hooks=hooks,
     )
 
 
+def get_record(
+    *,
+    app_id: str,
+    api_key: str,
+    obj: str,
+    record_id: str,
+    slug: str = None,
+    max_attempts: int = 5,
+    timeout: int = 30,
+    transform: typing.Callable = None,
+    hooks: typing.Iterable[typing.Callable] = None,
+) -> dict:
+    """Get a single record from a Knack object, by record ID. This is the raw stuff
+    with incorrect timestamps!
+
+    Args:
+        app_id (str): Knack [application ID](https://www.knack.com/developer-documentation/#find-your-api-key-amp-application-id)  # noqa:E501
+            string.
+        api_key (str): [Knack API key](https://www.knack.com/developer-documentation/#find-your-api-key-amp-application-id).
+        obj (str): The Knack object key which holds the record.
+        record_id (str): The Knack record ID.
+        slug (str, optional): Your organization's slug (aka, subdomain). As found in
+            your app metadata under accounts/slug.
+        max_attempts (int): The maximum number of attempts to make if a request times
+            out. Defaults to 5.
+        timeout (int, optional): Number of seconds to wait before a Knack API request
+            times out. Defaults to 30.
+        transform (callable, optional): A function which is applied to the record. See
+            `knackpy.ingest`. Defaults to None.
+        hooks (list, optional): Callables which are called with a
+            `knackpy.hooks.Event` for each request. Defaults to None.
+
+    Returns:
+        dict: The Knack record.
+    """
+    route = _route(obj=obj, record_id=record_id)
+    url = _url(slug=slug, route=route)
+    record = _decode(
+        _request(
+            method="GET",
+            url=url,
+            headers=_headers(app_id, api_key),
+            max_attempts=max_attempts,
+            timeout=timeout,
+            hooks=hooks,
+        )
+    )
+    return transform(record) if transform else record
+
+
 def get_metadata(
-    *, app_id: str, slug: str = None, timeout: int = 30, max_attempts: int = 5
+    *,
+    app_id: str,
+    slug: str = None,
+    timeout: int = 30,
+    max_attempts: int = 5,
+    hooks: typing.Iterable[typing.Callable] = None,
 ) -> dict:
     """Fetch Knack application metadata. You can find your app's metadata at:
     `https://api.knack.com/v1/applications/<app_id:str>`.
@@ -253,15 +506,24 @@ def get_metadata(
         app_id (str): A Knack application ID.
         slug (str, optional): Your organization's slug (aka, subdomain). As found in
             your app metadata under accounts/slug.
+        hooks (list, optional): Callables which are called with a
+            `knackpy.hooks.Event` for each request. Defaults to None.
 
     Returns:
         dict: A dictionary of Knack application metadata.
     """
     route = _route(app_id=app_id)
     url = _url(slug=slug, route=route)
-    return _request(
-        method="GET", url=url, headers=None, max_attempts=max_attempts
-    ).json()
+    return _decode(
+        _request(
+            method="GET",
+            url=url,
+            headers=None,
+            timeout=timeout,
+            max_attempts=max_attempts,
+            hooks=hooks,
+        )
+    )
 
 
 def _handle_method(method: str):
@@ -291,6 +553,8 @@ def record(
     slug: str = None,
     max_attempts: int = 5,
     timeout: int = 30,
+    session: requests.Session = None,
+    hooks: typing.Iterable[typing.Callable] = None,
 ):
     """Create, update, or delete a Knack record.
 
@@ -308,6 +572,11 @@ def record(
         timeout (int, optional): Number of seconds to wait before a Knack API request
             times out. Further reading:
             [Requests docs](https://requests.readthedocs.io/en/master/user/quickstart/).
+        session (requests.Session, optional): A session with which to make the
+            request, so that its connections can be reused across many requests.
+            Defaults to None (a new session).
+        hooks (list, optional): Callables which are called with a
+            `knackpy.hooks.Event` for each request. Defaults to None.
 
     Returns:
         dict: The updated or newly created Knack record data, or, if deleting a
@@ -318,14 +587,18 @@ def record(
     route = _route(obj=obj, record_id=record_id)
     method = _handle_method(method)
     url = _url(slug=slug, route=route)
-    return _request(
-        method=method,
-        url=url,
-        headers=headers,
-        data=data,
-        max_attempts=max_attempts,
-        timeout=timeout,
-    ).json()
+    return _decode(
+        _request(
+            method=method,
+            url=url,
+            headers=headers,
+            data=data,
+            max_attempts=max_attempts,
+            timeout=timeout,
+            session=session,
+            hooks=hooks,
+        )
+    )
 
 
 def upload(
@@ -334,18 +607,26 @@ def upload(
     api_key: str,
     obj: str,
     field: str,
-    path: str,
     asset_type: str,
+    path: str = None,
+    file: typing.Union[typing.BinaryIO, typing.Iterable[bytes]] = None,
+    filename: str = None,
     record_id: str = None,
     slug: str = None,
     max_attempts: int = 5,
     timeout: int = 30,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    callback: typing.Callable = None,
+    hooks: typing.Iterable[typing.Callable] = None,
 ):
     """Upload a file or image to Knack. This is a two-step process:
 
     1) Upload file asset to Knack storage
     2) Create/update a record that links to the file in storage
 
+    The file is streamed from its source in chunks of `chunk_size` bytes, so the
+    upload's memory footprint does not grow with the size of the file.
+
     Knack docs: https://www.knack.com/developer-documentation/#file-image-uploads
 
     Args:
@@ -354,9 +635,17 @@ def upload(
         api_key (str): [Knack API key](https://www.knack.com/developer-documentation/#find-your-api-key-amp-application-id).  # noqa:E501
         obj (str): The Knack object key which holds the record data.
         field (str): The knack field key of the field you're uploading into.
-        path (str): The path to the file to be uploaded.
         asset_type (str): The type of Knack field you're uploading to. Must be `file` or
             `image`.
+        path (str, optional*): The path to the file to be uploaded. Either `path` or
+            `file` is required.
+        file (file-like or iterable, optional*): A binary file-like object, or an
+            iterable which yields `bytes`, to be uploaded instead of `path`. Uploads
+            from an iterable are sent with chunked transfer encoding and cannot be
+            retried.
+        filename (str, optional): The name of the file in Knack. Defaults to the
+            basename of `path` (or `file.name`). Required when uploading from an
+            iterable.
         record_id (str, optional): The knack record ID to which the upload will be
             attached. If `None`, will create a new record. Otherwise will update an
             existing record.
@@ -367,20 +656,53 @@ def upload(
         timeout (int, optional): Number of seconds to wait before a Knack API request
             times out. Further reading:
             [Requests docs](https://requests.readthedocs.io/en/master/user/quickstart/).
+        chunk_size (int, optional): The number of bytes to read from the file at a
+            time. Defaults to 1mb.
+        callback (callable, optional): A function which will be called with
+            `(bytes_sent, total_bytes)` as the file is uploaded. `total_bytes` is
+            `None` when uploading from an iterable.
+        hooks (list, optional): Callables which are called with a
+            `knackpy.hooks.Event` for each request. Defaults to None.
+
+    Raises:
+        TypeError: If neither or both of `path` and `file` are provided.
     """
+    if (path is None) == (file is None):
+        raise TypeError("Exactly one of `path` or `file` is required")
+
     headers = _headers(app_id, api_key)
     route = _route(app_id=app_id, asset_type=asset_type)
     url = _url(route=route, slug=slug)
     method = "create" if not record_id else "update"
 
-    with open(path, "rb") as file:
-        files = {"files": file}
-        res = _request(method="POST", url=url, headers=headers, files=files)
+    with MultipartEncoder(
+        path if path is not None else file,
+        filename=filename,
+        chunk_size=chunk_size,
+        callback=callback,
+    ) as body:
+        headers["Content-Type"] = body.content_type
+        res = _request(
+            method="POST",
+            url=url,
+            headers=headers,
+            body=body,
+            max_attempts=max_attempts,
+            timeout=timeout,
+            hooks=hooks,
+        )
+        logger.debug(f"Uploaded {body.bytes_read} bytes to {url}")
 
-    file_id = res.json()["id"]
+    file_id = _decode(res)["id"]
 
     data = {f"{field}": f"{file_id}", "id": record_id}
 
     return record(
-        app_id=app_id, api_key=api_key, method=method, data=data, slug=slug, obj=obj
+        app_id=app_id,
+        api_key=api_key,
+        method=method,
+        data=data,
+        slug=slug,
+        obj=obj,
+        hooks=hooks,
     )
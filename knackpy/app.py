@@ -1,19 +1,31 @@
+import collections
+import concurrent.futures
 import csv
 import datetime
 import logging
 import os
+import sys
 import warnings
 import typing
 
 import requests
 import pytz
 
-from . import api, fields, utils
+from . import api, bulk, diffs, fields, indexes, ingest, parallel, utils
+from . import filters as _filters
+from . import plan as _plan
+from . import stats as _stats
 from . import record as knackpy_record
+from . import shards as _shards
 from .models import TIMEZONES, FIELD_SETTINGS
 
 logger = logging.getLogger(__name__)
 
+# the number of concurrent requests made when fetching records one at a time. the
+# Knack API allows roughly 10 requests per second
+FETCH_WORKERS = 8
+
+
 class App:
     """Knackpy is designed around the `App` class. It provides helpers for querying
     and manipulating Knack application data. You should use the `App` class
@@ -39,6 +51,20 @@ class App:
         timeout (int, optional): Number of seconds to wait before a Knack API request
             times out. Further reading:
             [Requests docs](https://requests.readthedocs.io/en/master/user/quickstart/).
+        strip_formatted (bool, optional): If True, Knack's formatted field values are
+            dropped from fetched records wherever they are redundant with the
+            field's raw value, roughly halving the memory held in `App.data`. See
+            `knackpy.ingest.strip_formatted_keys`. Defaults to False.
+        intern_values (bool, optional): If True, repeated field keys and repeated
+            values of low-cardinality fields (multiple choice, connections,
+            addresses) share a single object across all of a container's records.
+            See `knackpy.ingest.Interner`. Defaults to False.
+        rate_limit (float, optional): The maximum number of requests per second made
+            by bulk operations, such as `App.upsert`. Defaults to
+            `knackpy.bulk.DEFAULT_RATE_LIMIT`.
+        hooks (list, optional): Callables which are called with a
+            `knackpy.hooks.Event` for each Knack API request the app makes, e.g. to
+            collect metrics. Defaults to None.
     """
 
     def __repr__(self):
@@ -54,6 +80,10 @@ class App:
         tzinfo: datetime.tzinfo = None,
         max_attempts: int = 5,
         timeout: int = 30,
+        strip_formatted: bool = False,
+        intern_values: bool = False,
+        rate_limit: float = bulk.DEFAULT_RATE_LIMIT,
+        hooks: typing.Iterable[typing.Callable] = None,
     ):
 
         if not api_key:
@@ -65,10 +95,19 @@ class App:
         self.api_key = api_key
         self.timeout = timeout
         self.max_attempts = max_attempts
+        # counters of the app's requests and records. see `App.stats`
+        self._stats = _stats.Stats()
+        self.hooks = [self._stats] + (list(hooks) if hooks else [])
+        self.strip_formatted = strip_formatted
+        self.intern_values = intern_values
+        self._interners = {}
+        # (container key, formatted) -> knackpy.plan.Plan. see `App._dicts`
+        self._plans = {}
+        self.rate_limiter = bulk.RateLimiter(rate_limit)
         self.metadata = (
-            api.get_metadata(app_id=self.app_id, timeout=self.timeout, slug=slug)[
-                "application"
-            ]
+            api.get_metadata(
+                app_id=self.app_id, timeout=self.timeout, slug=slug, hooks=self.hooks
+            )["application"]
             if not metadata
             else metadata["application"]
         )
@@ -79,10 +118,18 @@ class App:
         self.containers = utils.generate_containers(self.metadata)
         self.data = {}
         self.records = {}
+        self.indexes = {}
+        # container key -> (data, {record ID: position}). see `App._positions`
+        self._record_positions = {}
+        # (identifier, field, kind) -> (container key, index), so that lookups needn't
+        # resolve container and field names
+        self._index_aliases = {}
         logger.debug(self)
 
     def _get_metadata(self):
-        return api.get_metadata(app_id=self.app_id, timeout=self.timeout)
+        return api.get_metadata(
+            app_id=self.app_id, timeout=self.timeout, hooks=self.hooks
+        )
 
     def info(self):
         """Returns a `dict` of basic app information:
@@ -103,6 +150,103 @@ class App:
             "size": total_size,
         }
 
+    def stats(self, reset: bool = False) -> dict:
+        """Returns a `dict` of the app's performance counters, which are collected
+        from the moment the app is constructed:
+            - requests: Knack API requests, including retries
+            - retries: Requests which were retried
+            - timeouts, rate_limited, server_errors: Requests which timed out, or
+                failed with a 429 or a 5xx
+            - pages: Pages of records which were fetched
+            - records: `knackpy.record.Record`s which were constructed
+            - cache_hits, cache_misses: Calls to `App.get` which were (or were not)
+                served without fetching records
+            - bytes_received, bytes_sent: Response and request body sizes
+            - latency: Latency summaries (in seconds), keyed by endpoint (e.g.
+                "GET object"), including a count, mean, min, max, approximate
+                p50, p90 and p99, and a histogram of counts keyed by bucket upper
+                bound. See `knackpy.stats`.
+
+        Args:
+            reset (bool, optional): If True, reset the counters to zero once they have
+                been returned. Defaults to False.
+        """
+        return self._stats.summary(reset=reset)
+
+    def memory_usage(self, identifier: str = None, sample: int = None) -> dict:
+        """Returns the approximate memory held by a container (or by each container
+        which has been fetched), to find out which is responsible for high memory
+        use. See `utils.humanize_bytes` to make the numbers readable.
+
+        Usage is reported as a `dict` of:
+            - records: The number of raw records in `App.data`
+            - data_bytes: Bytes held by the raw records in `App.data`
+            - record_objects: The number of `Record`s in `App.records`, or `None` if
+                they are generated on demand (see `App.get`)
+            - fields: The number of `Field`s held by those `Record`s
+            - records_bytes: Bytes held by those `Record`s and `Field`s, besides the
+                raw data they share with `App.data`
+            - index_bytes: Bytes held by the container's indexes, besides the
+                `Record`s they reference (see `App.index`)
+            - total_bytes: The sum of the above
+
+        Objects which are shared by every container, such as field definitions, are
+        not counted. Values which are shared between records (see `intern_values`)
+        are counted once.
+
+        Args:
+            identifier (str, optional): An object or view key or name. If `None`,
+                usage is reported for every container which holds data, records or
+                indexes. Defaults to None.
+            sample (int, optional): Measure about this many evenly-spaced records of
+                each container, and extrapolate, which is much faster for large
+                containers. Defaults to None (measure every record).
+
+        Returns:
+            dict: The container's usage, or, if `identifier` is `None`, the usage of
+                each container, keyed by container key.
+        """
+        if identifier:
+            container = self._find_container(identifier)
+            return self._memory_usage(container.obj or container.view, sample)
+
+        container_keys = sorted(set(self.data) | set(self.records) | set(self.indexes))
+        return {key: self._memory_usage(key, sample) for key in container_keys}
+
+    def _memory_usage(self, container_key: str, sample: int = None) -> dict:
+        skip = (fields.FieldDef, datetime.tzinfo)
+        seen = set()
+        data = self.data.get(container_key) or []
+        records = self.records.get(container_key)
+        generated = records is not None and not isinstance(records, list)
+        record_objects = [] if generated else records or []
+
+        def sampled_size(items, item_skip):
+            """Return the size of a list of items, extrapolated from a sample."""
+            step = max(len(items) // sample, 1) if sample else 1
+            subset = items[::step]
+            size = sum(utils.deep_sizeof(item, seen, item_skip) for item in subset)
+            scale = len(items) / len(subset) if subset else 0
+            return sys.getsizeof(items) + round(size * scale)
+
+        # records share their raw values with App.data, which is measured first so
+        # that shared values are only counted once
+        data_bytes = sampled_size(data, skip)
+        records_bytes = sampled_size(record_objects, skip)
+        index_bytes = utils.deep_sizeof(
+            self.indexes.get(container_key, {}), seen, skip + (knackpy_record.Record,)
+        )
+
+        return {
+            "records": len(data),
+            "data_bytes": data_bytes,
+            "record_objects": None if generated else len(record_objects),
+            "fields": sum(len(record.fields) for record in record_objects),
+            "records_bytes": records_bytes,
+            "index_bytes": index_bytes,
+            "total_bytes": data_bytes + records_bytes + index_bytes,
+        }
+
     @staticmethod
     def _get_timezone(tzinfo: str):
         # TODO: move to utils
@@ -189,6 +333,12 @@ class App:
         record_limit: int = None,
         filters: typing.Union[dict, list] = None,
         generate=False,
+        shard_by: str = None,
+        shards: int = 4,
+        include: list = None,
+        as_dicts: bool = False,
+        formatted: bool = False,
+        processes: int = None,
     ):
         """Get records from a knack object or view.
 
@@ -197,6 +347,16 @@ class App:
             basis. They are not stored in state. Whereas `max_attempts` and
             `timeout` are set on App construction and persist in `App` state.
 
+            Very large containers can be fetched faster by sharding the query by a
+            date field. The query is split into `shards` non-overlapping date ranges
+            (plus one shard for records with no date), each of which is paginated
+            concurrently. Any shard which fails is retried once on its own.
+
+            The objects which a container's connection fields connect to can be
+            fetched alongside it with `include`. They are fetched concurrently with
+            the container, and their records are then available via `App.get` and
+            `App.join`.
+
             Args:
                 identifier (str, optional*): an object or view key or name string that
                     exists in the app. If None is provided and only one container has
@@ -209,6 +369,32 @@ class App:
                     See: https://www.knack.com/developer-documentation/#filters.
                 generate (bool, optional): If True, will return a generator which
                     yields knacky.Record objects instead of return a list of of them.
+                shard_by (str, optional): The key or name of a `date_time` field by
+                    which to shard the query. Cannot be combined with `record_limit`
+                    or with filters that `match` "or". Defaults to None.
+                shards (int, optional): The number of date ranges to split the query
+                    into when `shard_by` is set. Defaults to 4.
+                include (list, optional): The keys or names of connection fields whose
+                    connected objects should also be fetched, in their entirety.
+                    Objects which have already been fetched are only fetched again if
+                    `refresh`. `record_limit` and `filters` do not apply to them.
+                    Defaults to None.
+                as_dicts (bool, optional): If True, return plain `dict`s instead of
+                    `Record`s. The dicts hold the same (timestamp-corrected) values,
+                    but are built several times faster, as no `Record` or `Field`
+                    objects are constructed. They are not held in `App.records`.
+                    Defaults to False.
+                formatted (bool, optional): If `as_dicts`, key the dicts by field
+                    name and format their values, as `Record.format()` does.
+                    Otherwise, dicts are keyed by field key and hold raw values.
+                    Defaults to False.
+                processes (int, optional): If set, records are normalized and
+                    formatted (and, if `as_dicts`, built) across a pool of this many
+                    processes, to use more than one core on very large containers.
+                    `Record` objects are still assembled in this process, which
+                    limits their speedup to about 2x; dicts scale with `processes`.
+                    Records are returned in order. Cannot be combined with
+                    `generate`. See `knackpy.parallel`. Defaults to None.
 
             Returns:
                 A `generator` which yields knackpy Record objects.
@@ -218,41 +404,522 @@ class App:
         elif not identifier:
             raise TypeError("Missing 1 required argument: identifier")
 
+        if shard_by and record_limit:
+            raise ValueError("`record_limit` cannot be combined with `shard_by`")
+
+        if processes and generate:
+            raise ValueError("`processes` cannot be combined with `generate`")
+
         container = self._find_container(identifier)
+        included = (
+            self._included_containers(container, include, refresh) if include else []
+        )
+
+        if not included:
+            return self._get_container(
+                container,
+                refresh,
+                record_limit,
+                filters,
+                generate,
+                shard_by,
+                shards,
+                as_dicts,
+                formatted,
+                processes,
+            )
+
+        logger.debug(f"Fetching {len(included)} connected objects")
+
+        with concurrent.futures.ThreadPoolExecutor(len(included)) as executor:
+            futures = [
+                (target, executor.submit(self._fetch, target)) for target in included
+            ]
 
+            records = self._get_container(
+                container,
+                refresh,
+                record_limit,
+                filters,
+                generate,
+                shard_by,
+                shards,
+                as_dicts,
+                formatted,
+                processes,
+            )
+
+            for target, future in futures:
+                self.data[target.obj] = future.result()
+                # records are built from the new data when they are next requested
+                self.records.pop(target.obj, None)
+
+        return records
+
+    def _get_container(
+        self,
+        container,
+        refresh: bool,
+        record_limit: int,
+        filters: typing.Union[dict, list],
+        generate: bool,
+        shard_by: str,
+        shards: int,
+        as_dicts: bool = False,
+        formatted: bool = False,
+        processes: int = None,
+    ):
+        """Return a container's records, fetching them if needed. See `App.get`."""
         # note that data is always assigned to an object or view key, regardless of
         # whether or not the client provides an object or view *name*
         container_key = container.obj or container.view
 
-        if self.records.get(container_key) and not refresh:
+        if self.records.get(container_key) and not refresh and not as_dicts:
             # if the data has already been retrieved we do not fetch it again or convert
             # the data into knackpy.record.Record's again, unless refresh.
+            self._stats.incr("cache_hits")
             return self.records[container_key]
 
-        if not self.data.get(container_key) or refresh:
-            self.data[container_key] = api.get(
-                app_id=self.app_id,
-                api_key=self.api_key,
-                obj=container.obj,
-                scene=container.scene,
-                view=container.view,
-                filters=filters,
-                slug=self.slug,
-                max_attempts=self.max_attempts,
-                timeout=self.timeout,
-                record_limit=record_limit,
+        if self.data.get(container_key) and not refresh:
+            self._stats.incr("cache_hits")
+        else:
+            self._stats.incr("cache_misses")
+            if shard_by:
+                self.data[container_key] = self._fetch_sharded(
+                    container, shard_by, shards, filters
+                )
+            else:
+                self.data[container_key] = self._fetch(
+                    container, filters=filters, record_limit=record_limit
+                )
+            # records are built from the new data when they are next requested
+            self.records.pop(container_key, None)
+
+        if as_dicts:
+            return self._dicts(container_key, formatted, generate, processes)
+
+        self.records[container_key] = self._records(container_key, generate, processes)
+        return self.records[container_key]
+
+    def _included_containers(self, container, include: list, refresh: bool) -> list:
+        """Return the objects which a container's connection fields connect to, and
+        which need to be fetched.
+
+        Raises:
+            ValueError: If a field is not a connection field in the container.
+        """
+        container_key = container.obj or container.view
+        targets = []
+
+        for field in include:
+            field_def = self._find_container_field_def(container_key, field)
+
+            if field_def.type != "connection":
+                raise ValueError(f"Cannot include non-connection field: '{field}'")
+
+            target = self._find_container(field_def.relationship["object"])
+
+            if target.obj == container_key or target in targets:
+                continue
+            elif refresh or not self.data.get(target.obj):
+                targets.append(target)
+
+        return targets
+
+    def _fetch(self, container, **kwargs) -> list:
+        """Fetch a container's raw records with the app's settings. Keyword arguments
+        are passed through to `knackpy.api.get`."""
+        return api.get(
+            app_id=self.app_id,
+            api_key=self.api_key,
+            obj=container.obj,
+            scene=container.scene,
+            view=container.view,
+            slug=self.slug,
+            max_attempts=self.max_attempts,
+            timeout=self.timeout,
+            transform=self._ingest_transform(container.obj or container.view),
+            hooks=self.hooks,
+            **kwargs,
+        )
+
+    def _fetch_sharded(
+        self,
+        container,
+        field: str,
+        shards: int,
+        filters: typing.Union[dict, list] = None,
+    ) -> list:
+        """Fetch a container's raw records by splitting the query into date ranges
+        which are fetched concurrently. See `knackpy.shards`.
+
+        Returns:
+            list: The container's records, de-duplicated by record ID.
+        """
+        container_key = container.obj or container.view
+        field_def = self._find_container_field_def(container_key, field)
+
+        if field_def.type != "date_time":
+            raise ValueError(f"Cannot shard by non-date field: '{field}'")
+
+        key_raw = f"{field_def.key}_raw"
+        not_blank = _shards.not_blank_filters(field_def.key, filters)
+
+        # the earliest and latest dates bound the shards
+        bounds = [
+            self._fetch(
+                container,
+                filters=not_blank,
+                record_limit=1,
+                sort_field=field_def.key,
+                sort_order=sort_order,
             )
+            for sort_order in ["asc", "desc"]
+        ]
+
+        ranges = (
+            _shards.date_ranges(
+                _shards.parse_date(bounds[0][0][key_raw]),
+                _shards.parse_date(bounds[1][0][key_raw]),
+                shards,
+            )
+            if bounds[0] and bounds[1]
+            else []
+        )
+
+        shard_filters = _shards.shard_filters(field_def.key, ranges, filters)
+        logger.debug(f"Fetching {container_key} in {len(shard_filters)} shards")
+
+        with concurrent.futures.ThreadPoolExecutor(len(shard_filters)) as executor:
+            futures = [
+                executor.submit(self._fetch, container, filters=shard)
+                for shard in shard_filters
+            ]
+
+            results = []
+
+            for shard, future in zip(shard_filters, futures):
+                try:
+                    results.append(future.result())
+                except requests.exceptions.RequestException as e:
+                    # shards fail independently. retry just this one
+                    logger.debug(f"Retrying failed shard {shard}: {e.__repr__()}")
+                    results.append(self._fetch(container, filters=shard))
 
-        self.records[container_key] = self._records(container_key, generate)
+        # records whose date falls on a shard boundary may be returned by two shards
+        record_ids = set()
+        records = []
+
+        for result in results:
+            for record in result:
+                if record["id"] not in record_ids:
+                    record_ids.add(record["id"])
+                    records.append(record)
+
+        return records
+
+    def filter(self, identifier: str, filters: typing.Union[dict, list]) -> list:
+        """Filter a container's records locally, without making another request to
+        the Knack API.
+
+        Filters take the same form as the `filters` passed to `App.get`, and are
+        evaluated against the container's records as they have already been fetched
+        (the container is fetched first, if it has not been). See `knackpy.filters`.
+
+        Args:
+            identifier (str): an object or view key or name string that exists in
+                the app.
+            filters (dict or list): A dict or list of Knack API filters.
+                See: https://www.knack.com/developer-documentation/#filters.
+
+        Raises:
+            ValueError: If a filter references a field which is not in the container,
+                or uses an unsupported operator.
+
+        Returns:
+            list: The knackpy.record.Record's which meet the filters.
+        """
+        container = self._find_container(identifier)
+        container_key = container.obj or container.view
+        match = _filters.matcher(
+            filters, self._container_field_defs(container_key), self.timezone
+        )
+        return [record for record in self._record_list(identifier) if match(record.raw)]
+
+    def _record_list(self, identifier: str) -> list:
+        """Return a container's records as a list, fetching them if needed. Records
+        which were requested with `generate=True` are rebuilt from `App.data`."""
+        records = self.get(identifier)
+
+        if isinstance(records, list):
+            return records
+
+        container = self._find_container(identifier)
+        container_key = container.obj or container.view
+        self.records[container_key] = self._records(container_key)
         return self.records[container_key]
 
-    def _records(self, container_key, generate=False):
+    def index(self, identifier: str, field: str, kind: str = "hash"):
+        """Build an index of a container's records by the raw value of a field, for
+        fast lookups with `App.lookup` (a "hash" index) or `App.range` (a "sorted"
+        index).
+
+        The index is kept up to date as the container's records change, e.g. via
+        `App.record` or `App.get(refresh=True)`. See `knackpy.indexes`.
+
+        Args:
+            identifier (str): an object or view key or name string that exists in
+                the app.
+            field (str): The key or name of the field to index.
+            kind (str, optional): "hash" or "sorted". Sorted indexes are only
+                supported for `date_time` and numeric fields. Defaults to "hash".
+
+        Raises:
+            ValueError: If the field is not in the container, or cannot be indexed
+                by `kind`.
+
+        Returns:
+            knackpy.indexes.HashIndex or knackpy.indexes.SortedIndex: The index.
+        """
+        if kind not in ["hash", "sorted"]:
+            raise ValueError(f"Unknown index kind: '{kind}'")
+
+        container = self._find_container(identifier)
+        container_key = container.obj or container.view
+        field_def = self._find_container_field_def(container_key, field)
+        container_indexes = self.indexes.setdefault(container_key, {})
+
+        if (kind, field_def.key) not in container_indexes:
+            container_indexes[(kind, field_def.key)] = (
+                indexes.SortedIndex(field_def, self.timezone)
+                if kind == "sorted"
+                else indexes.HashIndex(field_def)
+            )
+
+        index = container_indexes[(kind, field_def.key)]
+        records = self._record_list(identifier)
+
+        if index.source is not records:
+            # the container's records have been rebuilt since the index was built
+            index.build(records)
+
+        self._index_aliases[(identifier, field, kind)] = (container_key, index)
+        return index
+
+    def _cached_index(self, identifier: str, field: str, kind: str):
+        """Return an up-to-date index, without resolving container and field names
+        if the index has been requested with the same arguments before."""
+        container_key, index = self._index_aliases.get(
+            (identifier, field, kind), (None, None)
+        )
+
+        if not index or index.source is not self.records.get(container_key):
+            index = self.index(identifier, field, kind=kind)
+
+        return index
+
+    def lookup(self, identifier: str, field: str, value) -> list:
+        """Find a container's records by the raw value of a field, without scanning
+        every record. The field is indexed on first use. See `App.index`.
+
+        Args:
+            identifier (str): an object or view key or name string that exists in
+                the app.
+            field (str): The key or name of the field to search.
+            value: The raw field value to find. For connection fields, a record ID.
+                Records whose field holds many values are found by any one of them.
+
+        Raises:
+            TypeError: If the value is a `list` or `tuple`. See
+                `knackpy.indexes.HashIndex.lookup`.
+
+        Returns:
+            list: The knackpy.record.Record's which have the value.
+        """
+        return self._cached_index(identifier, field, "hash").lookup(value)
+
+    def range(self, identifier: str, field: str, start=None, end=None) -> list:
+        """Find a container's records whose `date_time` or numeric field value is
+        within a range, without scanning every record. The field is indexed on first
+        use. See `App.index`.
+
+        Args:
+            identifier (str): an object or view key or name string that exists in
+                the app.
+            field (str): The key or name of a `date_time` or numeric field.
+            start (datetime, date, int or float, optional): The inclusive lower
+                bound. Naive datetimes are in the app's timezone, and numbers are
+                compared with the field's value, which, for `date_time` fields, is a
+                unix timestamp in milliseconds. Defaults to None (no lower bound).
+            end (datetime, date, int or float, optional): The exclusive upper bound.
+                Defaults to None (no upper bound).
+
+        Raises:
+            ValueError: If the field is not a `date_time` or numeric field.
+
+        Returns:
+            list: The knackpy.record.Record's in the range, ordered by the field.
+        """
+        return self._cached_index(identifier, field, "sorted").range(start, end)
+
+    def join(
+        self,
+        identifier: str,
+        connection_field: str,
+        target: str = None,
+        referenced_only: bool = False,
+    ) -> list:
+        """Resolve a connection field to the full records it connects to.
+
+        Each connected record is found by its record ID in a hash index of the
+        target container (see `App.index`), so that the target is scanned once
+        rather than once per record.
+
+        Args:
+            identifier (str): an object or view key or name string that exists in
+                the app.
+            connection_field (str): The key or name of a connection field.
+            target (str, optional): The object or view key or name of the container
+                which holds the connected records. Defaults to the object which the
+                field connects to.
+            referenced_only (bool, optional): If True, and the target has not already
+                been fetched, only the connected records are fetched, each by record
+                ID, rather than the entire target. Requests are limited to the app's
+                `rate_limit`. The target must be an object. Defaults to False.
+
+        Raises:
+            ValueError: If the field is not a connection field in the container.
+
+        Returns:
+            list: A list of `(record, connected_records)` tuples, one per record in
+                the container, where `connected_records` is a list of the target's
+                knackpy.record.Record's. Connected records which are not in the
+                target are omitted.
+        """
+        container = self._find_container(identifier)
+        container_key = container.obj or container.view
+        field_def = self._find_container_field_def(container_key, connection_field)
+
+        if field_def.type != "connection":
+            raise ValueError(
+                f"Cannot join on non-connection field: '{connection_field}'"
+            )
+
+        target = self._find_container(target or field_def.relationship["object"])
+        target_key = target.obj or target.view
+        key_raw = f"{field_def.key}_raw"
+        records = self._record_list(identifier)
+
+        rows = [
+            (
+                record,
+                [val["id"] for val in record.raw.get(key_raw) or [] if "id" in val],
+            )
+            for record in records
+        ]
+
+        if referenced_only and not self.data.get(target_key):
+            record_ids = {record_id for record, ids in rows for record_id in ids}
+            connected = self._fetch_by_id(target, record_ids)
+            return [
+                (record, [connected[val] for val in ids if val in connected])
+                for record, ids in rows
+            ]
+
+        index = self.index(target_key, "id")
+        return [
+            (record, [match for val in ids for match in index.lookup(val)])
+            for record, ids in rows
+        ]
+
+    def _fetch_by_id(self, container, record_ids) -> dict:
+        """Fetch an object's records concurrently, one request per record ID.
+        Requests are limited to the app's `rate_limit`.
+
+        Knack's record filters match field values, not record IDs, so records
+        cannot be fetched a page of IDs at a time. Records which no longer exist
+        (404) are omitted.
+
+        Returns:
+            dict: knackpy.record.Record's keyed by record ID.
+        """
+        if not container.obj:
+            raise ValueError("Records can only be fetched by ID from an object")
+
+        field_defs = self._container_field_defs(container.obj)
+        identifier = self._container_identifier(field_defs)
+        transform = self._ingest_transform(container.obj)
+
+        def fetch(record_id):
+            self.rate_limiter.wait()
+            try:
+                return api.get_record(
+                    app_id=self.app_id,
+                    api_key=self.api_key,
+                    obj=container.obj,
+                    record_id=record_id,
+                    slug=self.slug,
+                    max_attempts=self.max_attempts,
+                    timeout=self.timeout,
+                    transform=transform,
+                    hooks=self.hooks,
+                )
+            except requests.exceptions.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    logger.debug(f"Record not found: {record_id}")
+                    return None
+                raise e
+
+        with concurrent.futures.ThreadPoolExecutor(FETCH_WORKERS) as executor:
+            data = executor.map(fetch, sorted(record_ids))
+
+            records = {
+                record["id"]: knackpy_record.Record(
+                    record, field_defs, identifier, self.timezone
+                )
+                for record in data
+                if record is not None
+            }
+
+        self._stats.incr("records", len(records))
+        return records
+
+    def _container_field_defs(self, container_key):
+        """Return the field defs of the fields which appear in an object or view."""
+        return [
+            field_def
+            for field_def in self.field_defs
+            if container_key == field_def.obj or container_key in field_def.views
+        ]
+
+    def _ingest_transform(self, container_key):
+        """Return the function which is applied to each of a container's records as
+        they are fetched, or `None` if records are stored as-is. See `knackpy.ingest`.
+        """
+        if not self.strip_formatted and not self.intern_values:
+            return None
+
+        field_defs = self._container_field_defs(container_key)
+        strip = (
+            ingest.strip_formatted_keys(field_defs) if self.strip_formatted else None
+        )
+
+        if self.intern_values and container_key not in self._interners:
+            # interners persist so that new records are de-duplicated against
+            # those already held in state
+            self._interners[container_key] = ingest.Interner(field_defs)
+
+        return ingest.chain(strip, self._interners.get(container_key))
+
+    def _records(self, container_key, generate=False, processes=None):
         """Return a list or generator of knackpy.record.Record objects.
 
         Args:
             container_key (str): An Knack object or view key.
             generate (bool, optional): If true, will return a Record generator function
                 instead of a list of Record's.
+            processes (int, optional): The number of processes across which to
+                normalize and format records. See `knackpy.parallel`.
 
         Returns:
             list or generator: A list or generator of knackpy.record.Record's.
@@ -260,31 +927,71 @@ class App:
         data = self.data[container_key]
 
         # filter field defs by requested container
-        field_defs = [
-            field_def
-            for field_def in self.field_defs
-            if container_key == field_def.obj or container_key in field_def.views
-        ]
-
-        try:
-            identifier = [
-                field_def.key for field_def in field_defs if field_def.identifier
-            ][0]
-        except IndexError:
-            identifier = None
+        field_defs = self._container_field_defs(container_key)
+        identifier = self._container_identifier(field_defs)
 
         if generate:
             return self._generate_records(data, field_defs, identifier)
 
+        self._stats.incr("records", len(data))
+
+        if processes:
+            return parallel.records(
+                data, field_defs, identifier, self.timezone, processes
+            )
+
         return [
             knackpy_record.Record(record, field_defs, identifier, self.timezone)
             for record in data
         ]
 
+    def _dicts(self, container_key, formatted=False, generate=False, processes=None):
+        """Return a list or generator of plain `dict`s built from a container's data.
+        See `App.get` and `knackpy.plan.Plan`."""
+        if processes:
+            return parallel.dicts(
+                self.data[container_key],
+                self._container_field_defs(container_key),
+                self.timezone,
+                processes,
+                formatted,
+            )
+
+        plan_key = (container_key, formatted)
+
+        if plan_key not in self._plans:
+            self._plans[plan_key] = _plan.Plan(
+                self._container_field_defs(container_key), self.timezone, formatted
+            )
+
+        plan = self._plans[plan_key]
+        data = self.data[container_key]
+        return (plan(record) for record in data) if generate else list(map(plan, data))
+
+    def _container_identifier(self, field_defs):
+        """Return the key of a container's identifier field, if it has one."""
+        identifiers = [
+            field_def.key for field_def in field_defs if field_def.identifier
+        ]
+        return identifiers[0] if identifiers else None
+
     def _generate_records(self, data, field_defs, identifier):
         for record in data:
+            self._stats.incr("records")
             yield knackpy_record.Record(record, field_defs, identifier, self.timezone)
 
+    def _find_container_field_def(self, container_key, field):
+        """Return the field def of a field in an object or view, by field key or name.
+
+        Raises:
+            ValueError: If the field is not in the container.
+        """
+        for field_def in self._container_field_defs(container_key):
+            if field in [field_def.key, field_def.name]:
+                return field_def
+
+        raise ValueError(f"Field not found: '{field}'")
+
     def _find_field_def(self, identifier, obj):
         return [
             field_def
@@ -415,7 +1122,9 @@ class App:
                 # reverse traverse to ensure that field labels are prepended in
                 # sequence provided.
                 for field in reversed(label_keys):
-                    filename = f"{record.raw.get(field)}_{filename}"
+                    # the formatted value may have been stripped on ingest
+                    label = record.raw.get(field, record.raw.get(f"{field}_raw"))
+                    filename = f"{label}_{filename}"
 
             file_dict["filename"] = os.path.join(out_dir, filename)
 
@@ -506,15 +1215,37 @@ class App:
 
         return download_count
 
-    def _replace_record(self, record, obj):
-        for rec in self.data[obj]:
-            if rec["id"] == record["id"]:
-                rec = record
-                return self.data[obj]
+    def _positions(self, container_key: str) -> dict:
+        """Return a map of record ID -> position of each of a container's records in
+        `App.data` (and `App.records`, which is kept in the same order). The map is
+        rebuilt whenever the container's data is replaced, e.g. by a refresh."""
+        data = self.data[container_key]
+        cached = self._record_positions.get(container_key)
+
+        if cached and cached[0] is data:
+            return cached[1]
+
+        positions = {record["id"]: position for position, record in enumerate(data)}
+        self._record_positions[container_key] = (data, positions)
+        return positions
+
+    def _record(self, container_key: str, data: dict) -> knackpy_record.Record:
+        """Construct a single knackpy.record.Record of a container."""
+        field_defs = self._container_field_defs(container_key)
+        self._stats.incr("records")
+        return knackpy_record.Record(
+            data, field_defs, self._container_identifier(field_defs), self.timezone
+        )
 
     def _update_record_state(self, res, obj, method, record_id=None):
         """ Keep local data and records in sync with CRUD operations.
 
+        Only the affected record is changed: its raw data in `self.data[key]`, its
+        `Record` in `self.records[key]` and its entries in the container's indexes.
+        Records are found by position, so creates and updates take constant time
+        (indexes aside). Deletes keep the container's order, and only shift the
+        positions of the records which follow the deleted record.
+
         Args:
             res (dict): Knack API response. Either a record `dict` or `{"delete": True}`
             obj (str): The Knack object key that was updated.
@@ -522,30 +1253,127 @@ class App:
             record_id (str): The Knack record ID of the affected record, if applicable.
 
         Side-Effects:
-            Update `self.data[key]` accordingly; regenerate `self.records[key]`.
+            Update `self.data[key]`, `self.records[key]` and `self.indexes[key]`
+            accordingly.
 
         Returns:
             None
         """
+        transform = self._ingest_transform(obj)
+
+        if transform and method in ["create", "update"]:
+            # the response is also returned to the client, so we leave it untouched
+            res = transform(dict(res))
+
+        data = self.data[obj]
+        positions = self._positions(obj)
+        records = self.records.get(obj)
+
+        if not isinstance(records, list) or len(records) != len(data):
+            # e.g., a generator. records are rebuilt from data when next requested
+            self.records.pop(obj, None)
+            records = None
+
+        # indexes which were built from other records are rebuilt when next used
+        container_indexes = [
+            index
+            for index in self.indexes.get(obj, {}).values()
+            if records is not None and index.source is records
+        ]
+
         if method == "create":
-            self.data[obj].append(res)
+            positions[res["id"]] = len(data)
+            data.append(res)
+
+            if records is not None:
+                record = self._record(obj, res)
+                records.append(record)
+                for index in container_indexes:
+                    index.add(record)
 
         elif method == "update":
-            self.data[obj] = self._replace_record(res, obj)
+            position = positions.get(res["id"])
+
+            if position is None:
+                logger.debug(f"Updated record {res['id']} is not held locally")
+                return None
+
+            # Knack responds with the entire record, but we guard against a partial
+            # response by keeping any values it omits
+            data[position] = {**data[position], **res}
+
+            if records is not None:
+                record = self._record(obj, data[position])
+                for index in container_indexes:
+                    index.remove(records[position])
+                    index.add(record)
+                records[position] = record
 
         elif method == "delete":
             # the Knack API responds with {"delete": True} when deleting records so we
             # need to have the record_id of the deleted record explicitly here (ie
             # there is no `record` response to work with)
-            self.data[obj] = [
-                record for record in self.data[obj] if record["id"] != record_id
-            ]
+            position = positions.pop(record_id, None)
+
+            if position is None:
+                return None
+
+            del data[position]
+
+            for following, record_data in enumerate(data[position:], position):
+                positions[record_data["id"]] = following
+
+            if records is not None:
+                removed = records.pop(position)
+                for index in container_indexes:
+                    index.remove(removed)
 
-        self.records[obj] = self._records(obj)
         return None
 
+    def diff(self, identifier: str, incoming: dict) -> dict:
+        """Compare a record payload with the record as it was last fetched, and return
+        only the values which have changed.
+
+        Values are compared as Knack would store them, so that, e.g., a connection
+        sent as a record ID matches the connection Knack returns, dates match
+        regardless of their format, and subfields which are omitted from the payload
+        are ignored. See `knackpy.diffs`.
+
+        Args:
+            identifier (str): an object or view key or name string that exists in
+                the app. The container is fetched if it has not been.
+            incoming (dict): A Knack record payload, which must include the record's
+                `id`. Fields may be given by key or name.
+
+        Raises:
+            ValueError: If the record is not in the container, or a field is not in
+                the container.
+
+        Returns:
+            dict: The payload's changed values, keyed by field key.
+        """
+        container = self._find_container(identifier)
+        container_key = container.obj or container.view
+        matches = self.lookup(identifier, "id", incoming["id"])
+
+        if not matches:
+            raise ValueError(f"Record not found: '{incoming['id']}'")
+
+        payload = {}
+        field_defs = {}
+
+        for field, value in incoming.items():
+            if field == "id":
+                continue
+            field_def = self._find_container_field_def(container_key, field)
+            payload[field_def.key] = value
+            field_defs[field_def.key] = field_def
+
+        # Record.data is the record as it is held in App.data, with Knack's timestamps
+        return diffs.changes(matches[0].data, payload, field_defs)
+
     def record(
-        self, *, data: dict, method: str, obj: str,
+        self, *, data: dict, method: str, obj: str, only_changed: bool = False,
     ):
         """Create, update, or delete a Knack record.
 
@@ -554,6 +1382,10 @@ class App:
             method (str): Choose from `create`, `update`, or `delete`.
             obj (str, optional): The Knack object key or name which holds the record
                 data.
+            only_changed (bool, optional): If True, and the object's records have
+                been fetched, an update sends only the values which differ from the
+                record as it was fetched, and no request is made at all if nothing
+                has changed. See `App.diff`. Defaults to False.
 
         Returns:
             dict: The updated or newly created Knack record data, or, if deleting a
@@ -564,6 +1396,17 @@ class App:
         # Knack API raises an HTTPError
         container = self._find_container(obj)
 
+        if only_changed and method == "update" and self.data.get(container.obj):
+            matches = self.lookup(container.obj, "id", data["id"])
+            changed = self.diff(container.obj, data) if matches else None
+
+            if changed == {}:
+                logger.debug(f"Skipping update of unchanged record {data['id']}")
+                # a copy, so that changes to it do not reach `App.data`
+                return dict(matches[0].data)
+            elif changed:
+                data = {"id": data["id"], **changed}
+
         res = api.record(
             app_id=self.app_id,
             api_key=self.api_key,
@@ -572,40 +1415,271 @@ class App:
             obj=container.obj,
             slug=self.slug,
             max_attempts=self.max_attempts,
+            hooks=self.hooks,
             timeout=self.timeout,
         )
 
-        if self.data.get(obj):
+        if self.data.get(container.obj):
             # if data for the affected obj is stored locally, update it accordingly.
-            self._update_record_state(res, obj, method, record_id=data.get("id"))
+            self._update_record_state(
+                res, container.obj, method, record_id=data.get("id")
+            )
         return res
 
+    def upsert(
+        self, identifier: str, rows: list, key: str, workers: int = FETCH_WORKERS,
+    ) -> list:
+        """Create or update many records, matching each row to an existing record by
+        the value of a key field, such as an asset ID.
+
+        Each row is classified against the object's records (which are fetched if
+        they have not been) via a hash index of the key field: rows which match no
+        record are created, rows which match a record are updated with only their
+        changed values (see `App.diff`), and rows which match a record and have no
+        changes are skipped. Writes are made concurrently, within the app's rate
+        limit, and local state is kept in sync.
+
+        Key values are matched after the same normalization as `App.diff` (see
+        `knackpy.diffs.key`), e.g. a row whose key is `5` matches a record whose key
+        is `"5"`. Rows which share a key value are ambiguous: none of them is
+        written, and each is reported with a `ValueError`, as is each row with a
+        field which is not in the object. Failed writes do not stop the others:
+        errors are reported per row.
+
+        Args:
+            identifier (str): an object key or name string that exists in the app.
+            rows (list): Knack record payloads, without record IDs. Fields may be
+                given by key or name.
+            key (str): The key or name of the field by which rows are matched to
+                records.
+            workers (int, optional): The maximum number of concurrent requests.
+                Defaults to `FETCH_WORKERS`.
+
+        Raises:
+            ValueError: If the container is not an object, or the key field is not
+                in the object.
+
+        Returns:
+            list: A `knackpy.bulk.Result` per row, in the order of `rows`.
+        """
+        container = self._find_container(identifier)
+
+        if not container.obj:
+            raise ValueError("Records can only be written to an object")
+
+        obj = container.obj
+        field_def = self._find_container_field_def(obj, key)
+        results = [None] * len(rows)
+        writes = []
+
+        # records by normalized key value. records are de-duplicated by identity, as
+        # fields with many values index a record under each of them
+        records_by_key = {}
+        for indexed, records in self._cached_index(obj, field_def.key, "hash").items():
+            matches = records_by_key.setdefault(diffs.key(field_def, indexed), {})
+            matches.update((id(record), record) for record in records)
+
+        # field keys by field key or name, as matched by `_find_container_field_def`
+        field_keys = {}
+        for container_field_def in reversed(self._container_field_defs(obj)):
+            field_keys[container_field_def.name] = container_field_def.key
+        field_keys.update({field: field for field in field_keys.values()})
+
+        payloads = [
+            {field_keys.get(field, field): value for field, value in row.items()}
+            for row in rows
+        ]
+        values = [payload.get(field_def.key) for payload in payloads]
+        row_keys = [diffs.key(field_def, value) for value in values]
+        key_counts = collections.Counter(row_keys)
+
+        for index, row in enumerate(rows):
+            payload, value, row_key = payloads[index], values[index], row_keys[index]
+            matches = list(records_by_key.get(row_key, {}).values())
+            unknown = [field for field in payload if field not in field_keys]
+
+            if unknown:
+                error = ValueError(f"Field not found: '{unknown[0]}'")
+                results[index] = bulk.Result(index, None, row, None, error)
+            elif row_key is not None and key_counts[row_key] > 1:
+                error = ValueError(f"Multiple rows have {key} '{value}'")
+                results[index] = bulk.Result(index, None, row, None, error)
+            elif len(matches) > 1:
+                error = ValueError(f"Multiple records have {key} '{value}'")
+                results[index] = bulk.Result(index, None, row, None, error)
+            elif not matches:
+                writes.append((index, "create", payload))
+            else:
+                record_id = matches[0]["id"]
+                changed = self.diff(obj, dict(payload, id=record_id))
+
+                if changed:
+                    writes.append((index, "update", {"id": record_id, **changed}))
+                else:
+                    results[index] = bulk.Result(
+                        index, None, row, dict(matches[0].data), None
+                    )
+
+        logger.debug(f"Upserting {len(writes)} of {len(rows)} rows to {obj}")
+
+        for result in self._write_many(obj, writes, workers):
+            results[result.index] = result
+
+        return results
+
+    def records_many(
+        self,
+        method: str,
+        identifier: str,
+        payloads: typing.Iterable,
+        workers: int = FETCH_WORKERS,
+    ) -> list:
+        """Create, update, or delete many Knack records concurrently.
+
+        Requests are made by a bounded pool of workers which share one session (and
+        so reuse connections), within the app's rate limit. Payloads are consumed as
+        they are written, so `payloads` may be a generator. A failed write does not
+        stop the others: errors are collected and reported per payload. Local state
+        is kept in sync, as with `App.record`.
+
+        Args:
+            method (str): Choose from `create`, `update`, or `delete`.
+            identifier (str): an object key or name string that exists in the app.
+            payloads (iterable): Knack record payloads. When deleting, these may be
+                record IDs.
+            workers (int, optional): The maximum number of concurrent requests.
+                Defaults to `FETCH_WORKERS`.
+
+        Raises:
+            TypeError: If the method is unknown.
+            ValueError: If the container is not an object.
+
+        Returns:
+            list: A `knackpy.bulk.Result` per payload, in the order of `payloads`.
+        """
+        if method not in ["create", "update", "delete"]:
+            raise TypeError(
+                f"Unknown record method requested: {method}. Choose from create, "
+                "update, or delete."
+            )
+
+        container = self._find_container(identifier)
+
+        if not container.obj:
+            raise ValueError("Records can only be written to an object")
+
+        writes = (
+            (
+                index,
+                method,
+                {"id": payload} if isinstance(payload, str) else payload,
+            )
+            for index, payload in enumerate(payloads)
+        )
+
+        return list(self._write_many(container.obj, writes, workers))
+
+    def _write_many(self, obj: str, writes: typing.Iterable, workers: int):
+        """Make many record requests concurrently, and update local state with each
+        response, from the calling thread.
+
+        Args:
+            obj (str): A Knack object key.
+            writes (iterable): `(index, method, data)` tuples.
+            workers (int): The maximum number of concurrent requests.
+
+        Yields:
+            knackpy.bulk.Result: The result of each write, in the order of `writes`.
+        """
+        pending = collections.deque()
+
+        # the session is closed even if the caller stops iterating early
+        with bulk.session(workers) as session, concurrent.futures.ThreadPoolExecutor(
+            workers
+        ) as executor:
+            for index, method, data in writes:
+                future = executor.submit(self._write, obj, method, data, session)
+                pending.append((index, method, data, future))
+
+                # bound the number of queued requests, so that writes are streamed
+                # rather than all submitted (and held in memory) at once
+                if len(pending) >= 2 * workers:
+                    yield self._write_result(obj, *pending.popleft())
+
+            while pending:
+                yield self._write_result(obj, *pending.popleft())
+
+    def _write_result(self, obj, index, method, data, future) -> bulk.Result:
+        try:
+            res = future.result()
+        except Exception as e:
+            # any failed write, e.g. an update without a record ID, is reported in
+            # its result, rather than stopping the others
+            logger.debug(f"Failed to {method} record: {e.__repr__()}")
+            return bulk.Result(index, method, data, None, e)
+
+        if self.data.get(obj):
+            self._update_record_state(res, obj, method, record_id=data.get("id"))
+
+        return bulk.Result(index, method, data, res, None)
+
+    def _write(
+        self, obj: str, method: str, data: dict, session: requests.Session = None
+    ) -> dict:
+        """Make a single, rate-limited record request. Local state is not updated."""
+        self.rate_limiter.wait()
+        return api.record(
+            app_id=self.app_id,
+            api_key=self.api_key,
+            data=data,
+            method=method,
+            obj=obj,
+            slug=self.slug,
+            max_attempts=self.max_attempts,
+            timeout=self.timeout,
+            hooks=self.hooks,
+            session=session,
+        )
+
     def upload(
         self,
         *,
         container: str,
         field: str,
-        path: str,
         asset_type: str,
+        path: str = None,
+        file: typing.Union[typing.BinaryIO, typing.Iterable[bytes]] = None,
+        filename: str = None,
         record_id: str = None,
+        callback: typing.Callable = None,
     ):
         """Upload a file or image to Knack. This is a two-step process:
 
         1) Upload file asset to Knack storage
         2) Create/update a record that links to the file in storage
 
+        The file is streamed from disk (or from `file`) in chunks rather than read into
+        memory. See `knackpy.api.upload`.
+
         Knack docs: https://www.knack.com/developer-documentation/#file-image-uploads
 
         Args:
             container (str): The name or key of the object from which files will be
                 downloaded.
             field (str): The knack field key of the field you're uploading into.
-            path (str): The path to the file to be uploaded.
             asset_type (str): The type of Knack field you're uploading to. Must be
                 `file` or `image`.
+            path (str, optional*): The path to the file to be uploaded. Either `path`
+                or `file` is required.
+            file (file-like or iterable, optional*): A binary file-like object, or an
+                iterable which yields `bytes`, to be uploaded instead of `path`.
+            filename (str, optional): The name of the file in Knack. Defaults to the
+                basename of `path`. Required when uploading from an iterable.
             record_id (str, optional): The knack record ID to which the upload will be
                 attached. If `None`, will create a new record. Otherwise will update an
                 existing record.
+            callback (callable, optional): A function which will be called with
+                `(bytes_sent, total_bytes)` as the file is uploaded.
         """
         download_container = self._find_container(container)
 
@@ -615,9 +1689,13 @@ class App:
             obj=download_container.obj,
             field=field,
             path=path,
+            file=file,
+            filename=filename,
             asset_type=asset_type,
             record_id=record_id,
             slug=self.slug,
             max_attempts=self.max_attempts,
             timeout=self.timeout,
+            hooks=self.hooks,
+            callback=callback,
         )
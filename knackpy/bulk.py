@@ -0,0 +1,57 @@
+"""Helpers for writing many records concurrently. See `knackpy.app.App.records_many`
+and `knackpy.app.App.upsert`."""
+import collections
+import threading
+import time
+
+import requests
+
+# the Knack API allows roughly 10 requests per second, per application
+DEFAULT_RATE_LIMIT = 10
+
+# the outcome of writing one record. `method` is "create", "update", "delete" or
+# `None` (if no request was needed). `response` is the Knack record, and `error` is
+# the exception raised by the request, if any.
+Result = collections.namedtuple("Result", "index method data response error")
+
+
+class RateLimiter:
+    """A thread-safe limit on the rate at which requests are made. Requests are
+    spaced evenly, so that no more than `rate` are made in any one second.
+
+    Args:
+        rate (float, optional): The maximum number of requests per second. If `None`
+            or 0, requests are not limited. Defaults to `DEFAULT_RATE_LIMIT`.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT):
+        self.rate = rate
+        self.interval = 1 / rate if rate else 0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def __repr__(self):
+        return f"<RateLimiter ({self.rate}/s)>"
+
+    def wait(self):
+        """Block until the next request may be made."""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+
+        if start > now:
+            time.sleep(start - now)
+
+
+def session(workers: int) -> requests.Session:
+    """Return a `requests.Session` which can be shared by `workers` threads, keeping
+    one connection open per thread."""
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=workers)
+    shared = requests.Session()
+    shared.mount("https://", adapter)
+    shared.mount("http://", adapter)
+    return shared
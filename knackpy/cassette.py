@@ -0,0 +1,212 @@
+"""Record Knack API responses to disk, and replay them, so that code which uses
+Knackpy can be run (and profiled) against production-shaped responses without network
+access or API quota.
+
+While a cassette is in use, every request made by `knackpy.api` passes through it. In
+`record` mode, requests are sent, and each response (or timeout) is recorded with the
+time it took. In `replay` mode, no requests are sent: each request is answered with
+the next response which was recorded for the same method, route and query, optionally
+after the recorded delay.
+
+```
+>>> with cassette.Cassette("sync.json.gz", mode="record"):
+...     records = app.get("object_1")
+>>> with cassette.Cassette("sync.json.gz", speed=10):
+...     records = app.get("object_1")  # ten times faster than it was recorded
+```
+"""
+import base64
+import collections
+import gzip
+import io
+import json
+import logging
+import threading
+import time
+import urllib.parse
+
+import requests
+
+from . import api
+
+logger = logging.getLogger(__name__)
+
+MODES = ["record", "replay"]
+
+# response headers which are recorded. bodies are recorded decoded, so
+# "Content-Encoding" is not
+RECORDED_HEADERS = ["Content-Type"]
+
+
+def _key(prepped: requests.PreparedRequest) -> str:
+    """Return the key by which a request is matched with its recorded responses. The
+    host is ignored, so that responses can be replayed for any `api.BASE_URL`."""
+    url = urllib.parse.urlsplit(prepped.url)
+    return f"{prepped.method} {url.path}?{url.query}"
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _encode(content: bytes) -> dict:
+    try:
+        return {"content": content.decode("utf-8"), "encoding": "utf-8"}
+    except UnicodeDecodeError:
+        return {"content": base64.b64encode(content).decode(), "encoding": "base64"}
+
+
+def _decode(interaction: dict) -> bytes:
+    if interaction["encoding"] == "base64":
+        return base64.b64decode(interaction["content"])
+    return interaction["content"].encode("utf-8")
+
+
+class Cassette:
+    """A recording of Knack API responses.
+
+    Use a cassette as a context manager, or call `start()` and `stop()`. Recorded
+    cassettes are saved when they are stopped. Paths which end in `.gz` are gzipped.
+
+    Request headers (which hold API keys) are not recorded.
+
+    Args:
+        path (str): The path of the cassette file.
+        mode (str, optional): `record` or `replay`. Defaults to "replay".
+        speed (float, optional): When replaying, each response is delayed by the time
+            it took when it was recorded, divided by `speed`. E.g., `1` replays at the
+            recorded speed, and `10` at ten times the recorded speed. If `None`,
+            responses are not delayed. Defaults to None.
+
+    Raises:
+        ValueError: If `mode` is not `record` or `replay`.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", speed: float = None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: '{mode}'. Choose from {MODES}")
+
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.interactions = []
+        self._queues = None
+        self._cassette = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        count = len(self.interactions)
+        return f"<Cassette '{self.path}' ({self.mode}, {count} interactions)>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Load the cassette (if replaying), and pass `knackpy.api` requests through
+        it."""
+        if self.mode == "replay":
+            self.load()
+        self._cassette = api.CASSETTE
+        api.CASSETTE = self
+        return self
+
+    def stop(self):
+        """Stop passing requests through the cassette, and save it (if recording)."""
+        api.CASSETTE = self._cassette
+        if self.mode == "record":
+            self.save()
+
+    def load(self):
+        """Load recorded interactions from `path`."""
+        with _open(self.path, "r") as fin:
+            self.interactions = json.load(fin)["interactions"]
+
+        self._queues = collections.defaultdict(collections.deque)
+        for interaction in self.interactions:
+            self._queues[interaction["request"]].append(interaction)
+
+    def save(self):
+        """Save recorded interactions to `path`."""
+        with _open(self.path, "w") as fout:
+            json.dump({"interactions": self.interactions}, fout)
+        logger.debug(f"Saved {len(self.interactions)} interactions to {self.path}")
+
+    def send(
+        self,
+        session: requests.Session,
+        prepped: requests.PreparedRequest,
+        timeout: float = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Send a request, or replay its response. See `knackpy.api._request`.
+
+        Raises:
+            KeyError: When replaying, if there is no recorded response left for the
+                request.
+            requests.exceptions.Timeout: If the request timed out when it was
+                recorded.
+        """
+        if self.mode == "replay":
+            return self._replay(prepped)
+        return self._record(session, prepped, timeout, stream)
+
+    def _record(self, session, prepped, timeout, stream) -> requests.Response:
+        interaction = {"request": _key(prepped)}
+        start = time.perf_counter()
+
+        try:
+            res = session.send(prepped, timeout=timeout, stream=stream)
+            # read the body now, so that it can be recorded. a streamed response's
+            # body can still be iterated over, from memory
+            content = res.content
+        except requests.exceptions.Timeout:
+            interaction.update(error="timeout", elapsed=time.perf_counter() - start)
+            with self._lock:
+                self.interactions.append(interaction)
+            raise
+
+        interaction.update(
+            status=res.status_code,
+            headers={
+                key: res.headers[key] for key in RECORDED_HEADERS if key in res.headers
+            },
+            elapsed=time.perf_counter() - start,
+            **_encode(content),
+        )
+
+        with self._lock:
+            self.interactions.append(interaction)
+
+        return res
+
+    def _replay(self, prepped) -> requests.Response:
+        key = _key(prepped)
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise KeyError(f"No recorded response left for request: {key}")
+            interaction = queue.popleft()
+
+        if self.speed:
+            time.sleep(interaction["elapsed"] / self.speed)
+
+        if interaction.get("error") == "timeout":
+            raise requests.exceptions.ReadTimeout(
+                f"Recorded timeout: {key}", request=prepped
+            )
+
+        content = _decode(interaction)
+        res = requests.Response()
+        res.status_code = interaction["status"]
+        res.headers = requests.structures.CaseInsensitiveDict(interaction["headers"])
+        res.raw = io.BytesIO(content)
+        res.url = prepped.url
+        res.request = prepped
+        res.encoding = requests.utils.get_encoding_from_headers(res.headers)
+        return res
@@ -0,0 +1,136 @@
+"""JSON decoding of Knack API responses.
+
+[orjson](https://github.com/ijl/orjson) is used to decode responses when it is
+installed (`pip install knackpy[orjson]`), and the standard library's `json` module
+is used otherwise. The backend is selected once, at import.
+
+`RecordPage` decodes a page of records incrementally, as it is streamed from the API.
+"""
+import codecs
+import json
+import re
+import typing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def loads(content):
+    """Decode a JSON document.
+
+    Args:
+        content (bytes or str): A JSON document, such as `requests.Response.content`.
+
+    Returns:
+        object: The decoded document.
+    """
+    if orjson:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class RecordPage:
+    """Incrementally decode a page of Knack records from a stream of bytes.
+
+    `requests.Response.json()` needs the entire response body, and the entire decoded
+    page, in memory at once. A `RecordPage` instead yields each record as soon as it
+    has been received and decoded, so that only one record (and one chunk of the
+    response body) need be held in memory at a time.
+
+    Records are decoded with the standard library's `json` decoder, which, unlike
+    orjson, can decode a value from the middle of a buffer.
+
+    The page's other top-level keys (e.g. `total_records`) are available at
+    `RecordPage.meta` once the records have been exhausted.
+
+    Args:
+        chunks (iterable): An iterable of `bytes`, such as what is returned by
+            `requests.Response.iter_content()`.
+        key (str, optional): The key of the page's records array. Defaults to
+            "records".
+    """
+
+    def __init__(self, chunks: typing.Iterable[bytes], key: str = "records"):
+        self.chunks = iter(chunks)
+        self.key = key
+        self.meta = None
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def __iter__(self):
+        return self._records()
+
+    def _read(self) -> str:
+        """Return the next chunk of text, or an empty string at the end of the
+        stream."""
+        for chunk in self.chunks:
+            text = self._text_decoder.decode(chunk)
+            if text:
+                return text
+        return self._text_decoder.decode(b"", final=True)
+
+    def _records(self):
+        buffer = ""
+        pattern = re.compile(r'"' + re.escape(self.key) + r'"\s*:\s*\[')
+
+        while True:
+            match = pattern.search(buffer)
+            if match:
+                break
+            text = self._read()
+            if not text:
+                raise ValueError(f"Response does not contain a '{self.key}' array")
+            buffer += text
+
+        prefix = buffer[: match.start()]
+        buffer = buffer[match.end() :]
+        position = 0
+
+        while True:
+            # skip whitespace and the commas between records
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+
+            if position < len(buffer) and buffer[position] == "]":
+                break
+
+            try:
+                record, position = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # the record is incomplete. read more and try again. we wait for the
+                # partial record to double in size before retrying, so that a record
+                # which spans many chunks is not re-parsed once per chunk
+                partial = [buffer[position:]]
+                target = 2 * len(partial[0])
+                size = 0
+
+                while size == 0 or len(partial[0]) + size < target:
+                    text = self._read()
+                    if not text:
+                        break
+                    partial.append(text)
+                    size += len(text)
+
+                if size == 0:
+                    raise
+
+                buffer = "".join(partial)
+                position = 0
+                continue
+
+            yield record
+
+        suffix = buffer[position + 1 :]
+
+        while True:
+            text = self._read()
+            if not text:
+                break
+            suffix += text
+
+        self.meta = loads(f'{prefix}"{self.key}":[]{suffix}')
+        self.meta.pop(self.key)
@@ -0,0 +1,186 @@
+"""Compare record payloads with records as they are held by Knack, so that only
+changed values need be sent. See `knackpy.app.App.diff`.
+
+Payload values may take any of the forms which the Knack API accepts, which are not
+always the form in which Knack returns them. For example, a connection may be sent as
+a record ID, and is returned as a list of `{"id": ..., "identifier": ...}` dicts. Both
+sides of the comparison are normalized before they are compared.
+"""
+import datetime
+import typing
+
+from . import indexes
+
+# formats in which date_time values may be sent to the Knack API
+DATE_FORMATS = [
+    "%m/%d/%Y",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M%p",
+    "%m/%d/%Y %I:%M %p",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d",
+]
+
+# the subfield which holds the value of fields which may be sent as a plain string
+STRING_SUBFIELDS = {"email": "email", "link": "url"}
+
+# field types whose values may hold a number which Knack returns as a string
+NUMBER_FIELD_TYPES = ["auto_increment", "currency", "number", "rating"]
+
+
+def _is_blank(value) -> bool:
+    return value in [None, "", [], {}]
+
+
+def _text(value) -> str:
+    return "" if _is_blank(value) else str(value).strip()
+
+
+def _ids(value) -> list:
+    values = value if isinstance(value, list) else [value]
+    return sorted(
+        val["id"] if isinstance(val, dict) else val
+        for val in values
+        if not _is_blank(val)
+    )
+
+
+def _date(value) -> typing.Union[datetime.datetime, str]:
+    """Return a naive, local datetime from a raw Knack date value or a payload date
+    value. Values which cannot be parsed are returned as text."""
+    if isinstance(value, datetime.datetime):
+        return value.replace(tzinfo=None)
+    elif isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    elif isinstance(value, dict):
+        if not value.get("hours"):
+            return _date(value.get("date"))
+        return _date(
+            f"{value['date']} {value['hours']}:{value.get('minutes') or '00'}"
+            f"{value.get('am_pm', '')}"
+        )
+
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(_text(value).upper(), date_format)
+        except ValueError:
+            continue
+
+    return _text(value)
+
+
+def _date_range_end_equal(raw, value) -> bool:
+    """Return True unless a payload value sets the end of a date range (its `to`
+    subfield) to a different date than the raw value's."""
+    if not isinstance(value, dict) or "to" not in value:
+        return True
+    raw_to = raw.get("to") if isinstance(raw, dict) else None
+    return _date(raw_to) == _date(value["to"])
+
+
+def _number(value):
+    try:
+        return float(_text(value).replace(",", "").replace("$", ""))
+    except ValueError:
+        return _text(value)
+
+
+def _boolean(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ["yes", "true"]
+    return bool(value)
+
+
+def _subfields(field_def, raw, value) -> bool:
+    if isinstance(value, str) and field_def.type in STRING_SUBFIELDS:
+        value = {STRING_SUBFIELDS[field_def.type]: value}
+
+    if not isinstance(value, dict) or not isinstance(raw, dict):
+        return _text(raw) == _text(value)
+
+    # subfields which are omitted from the payload are left unchanged by Knack
+    return all(_text(raw.get(key)) == _text(val) for key, val in value.items())
+
+
+def equal(field_def, raw, value) -> bool:
+    """Return True if a payload value is equivalent to a field's raw value.
+
+    Args:
+        field_def (knackpy.fields.FieldDef): The field's definition.
+        raw: The field's raw value, as returned by the Knack API.
+        value: The value to be sent to the Knack API.
+
+    Returns:
+        bool: True if sending the value would not change the field.
+    """
+    if _is_blank(raw) or _is_blank(value):
+        return _is_blank(raw) and (
+            _is_blank(value) or (isinstance(value, dict) and not any(value.values()))
+        )
+    elif field_def.type == "connection":
+        return _ids(raw) == _ids(value)
+    elif field_def.type == "date_time":
+        return _date(raw) == _date(value) and _date_range_end_equal(raw, value)
+    elif field_def.type == "boolean":
+        return _boolean(raw) == _boolean(value)
+    elif field_def.type in NUMBER_FIELD_TYPES:
+        return _number(raw) == _number(value)
+    elif isinstance(raw, list) or isinstance(value, list):
+        # e.g. multiple choice fields which allow multiple selections
+        values = value if isinstance(value, list) else [value]
+        raws = raw if isinstance(raw, list) else [raw]
+        return sorted(map(_text, raws)) == sorted(map(_text, values))
+    elif isinstance(raw, dict) or isinstance(value, dict):
+        return _subfields(field_def, raw, value)
+
+    return _text(raw) == _text(value)
+
+
+def key(field_def, value):
+    """Return a hashable, normalized form of a field value, so that a payload value
+    and a raw value which `equal` would consider the same (e.g. `5` and `"5"`) have
+    the same key. See `knackpy.app.App.upsert`.
+
+    Args:
+        field_def (knackpy.fields.FieldDef): The field's definition.
+        value: A raw field value, a payload value, or a key of a
+            `knackpy.indexes.HashIndex`.
+
+    Returns:
+        object: The value's key, or `None` if the value is blank.
+    """
+    if _is_blank(value):
+        return None
+    elif field_def.type == "connection":
+        return tuple(_ids(value))
+    elif isinstance(value, (dict, list, tuple)):
+        return indexes._hashable(value)
+    elif field_def.type in NUMBER_FIELD_TYPES:
+        return _number(value)
+    return _text(value)
+
+
+def changes(record: dict, payload: dict, field_defs: dict) -> dict:
+    """Return the fields of a payload whose values differ from a record's.
+
+    Args:
+        record (dict): A raw Knack record.
+        payload (dict): A Knack record payload, keyed by field key.
+        field_defs (dict): `knackpy.fields.FieldDef`s, keyed by field key.
+
+    Returns:
+        dict: The payload's changed fields and their values.
+    """
+    changed = {}
+
+    for key, value in payload.items():
+        if key == "id":
+            continue
+
+        key_raw = f"{key}_raw"
+        raw = record[key_raw] if key_raw in record else record.get(key)
+
+        if not equal(field_defs[key], raw, value):
+            changed[key] = value
+
+    return changed
@@ -66,6 +66,8 @@ class FieldDef:
                 )
 
         self.identifier = kwargs["identifier"] if kwargs.get("identifier") else False
+        # connection fields only, e.g. `{"object": "object_7", "has": "one", ...}`
+        self.relationship = kwargs.get("relationship")
         self.views = []
         self.settings = FIELD_SETTINGS.get(self.type)
         self.subfields = self.settings.get("subfields") if self.settings else None
@@ -160,6 +162,22 @@ class Field(object):
         self.knack_formatted_value = knack_formatted_value
         self.formatted = self._format()
 
+    @classmethod
+    def _from_built(
+        cls, field_def: FieldDef, timezone, value, knack_formatted_value, formatted
+    ):
+        """Construct a Field whose value has already been formatted. See
+        `Record._from_built`."""
+        field = cls.__new__(cls)
+        field.key = field_def.key
+        field.name = field_def.name
+        field.raw = value
+        field.field_def = field_def
+        field.timezone = timezone
+        field.knack_formatted_value = knack_formatted_value
+        field.formatted = formatted
+        return field
+
     def __repr__(self):
         return f"<Field {{'{self.key}': '{self.formatted}'}}>"
 
@@ -0,0 +1,259 @@
+"""Evaluate [Knack filters](https://www.knack.com/developer-documentation/#filters)
+locally, against records which have already been fetched.
+
+Filters take the same form as those which are passed to the Knack API, e.g.:
+
+```
+{
+    "match": "and",
+    "rules": [
+        {"field": "field_1", "operator": "is", "value": "Pizza"},
+        {"field": "field_2", "operator": "is before", "value": "01/01/2020"},
+    ],
+}
+```
+
+A list of rules is equivalent to `{"match": "and", "rules": [...]}`, and a rule may
+itself be a group of rules, with its own `match`.
+
+Records are evaluated as raw Knack record `dict`s (as found in `App.data`, or at
+`Record.raw`). Text comparisons are case-insensitive and are made against the
+field's formatted text, and date comparisons are made by calendar date.
+"""
+import datetime
+import typing
+
+from .shards import DATE_FORMAT
+
+TEXT_OPERATORS = [
+    "is",
+    "is not",
+    "contains",
+    "does not contain",
+    "starts with",
+    "ends with",
+]
+
+NUMBER_OPERATORS = ["higher than", "lower than"]
+
+DATE_OPERATORS = [
+    "is before",
+    "is after",
+    "is today",
+    "is before today",
+    "is after today",
+    "is today or before",
+    "is today or after",
+]
+
+BLANK_OPERATORS = ["is blank", "is not blank"]
+
+# operators which compare a field's value against a rule's value(s), rather than
+# against the field's text
+MEMBERSHIP_OPERATORS = ["is any", "is not any"]
+
+OPERATORS = (
+    TEXT_OPERATORS
+    + NUMBER_OPERATORS
+    + DATE_OPERATORS
+    + BLANK_OPERATORS
+    + MEMBERSHIP_OPERATORS
+)
+
+
+def _value(record: dict, key: str):
+    """Return a field's raw value, falling back to the formatted value for fields
+    which have no raw value, such as `id`."""
+    key_raw = f"{key}_raw"
+    return record[key_raw] if key_raw in record else record.get(key)
+
+
+def _is_blank(value) -> bool:
+    if value in [None, "", [], [None], {}]:
+        return True
+    if isinstance(value, dict):
+        return all(_is_blank(val) for val in value.values())
+    return False
+
+
+def _text(record: dict, field_def) -> str:
+    """Return a field's value as lower-cased text, as it would appear in Knack."""
+    value = _value(record, field_def.key)
+
+    if _is_blank(value):
+        return ""
+    elif field_def.use_knack_format:
+        value = record.get(field_def.key, value)
+    elif isinstance(value, (dict, list)):
+        value = field_def.formatter(value)
+
+    return str(value).lower() if value is not None else ""
+
+
+def _date(value) -> datetime.date:
+    """Return a date from a raw Knack date value, or from a rule value, which may be
+    a date, a "MM/DD/YYYY" string, or a Knack date `dict`."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    elif isinstance(value, datetime.date):
+        return value
+    elif isinstance(value, dict):
+        value = value["date"]
+    return datetime.datetime.strptime(value, DATE_FORMAT).date()
+
+
+def _number(value) -> float:
+    if isinstance(value, str):
+        # e.g. currency values
+        value = value.replace(",", "").replace("$", "")
+    return float(value)
+
+
+def _ids(value) -> list:
+    """Return a list of record IDs from a connection value or rule value."""
+    values = value if isinstance(value, list) else [value]
+    return [val["id"] if isinstance(val, dict) else val for val in values]
+
+
+def _boolean(value) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ["yes", "true"]
+    return bool(value)
+
+
+def _equals(record: dict, field_def, value) -> bool:
+    raw = _value(record, field_def.key)
+
+    if field_def.type == "connection":
+        return bool(set(_ids(value)) & set(_ids(raw or [])))
+    elif field_def.type == "boolean":
+        return raw is not None and _boolean(raw) == _boolean(value)
+    elif field_def.type == "date_time":
+        return not _is_blank(raw) and _date(raw) == _date(value)
+    elif isinstance(raw, (int, float)) and not isinstance(raw, bool):
+        try:
+            return raw == _number(value)
+        except (TypeError, ValueError):
+            return False
+    elif isinstance(raw, list):
+        # e.g. a multiple choice field with multiple selections
+        return str(value).lower() in [str(val).lower() for val in raw]
+
+    return _text(record, field_def) == str(value).lower()
+
+
+def _compare_dates(raw, operator: str, value, today: datetime.date) -> bool:
+    if _is_blank(raw):
+        return False
+
+    date = _date(raw)
+
+    if operator == "is before":
+        return date < _date(value)
+    elif operator == "is after":
+        return date > _date(value)
+    elif operator == "is today":
+        return date == today
+    elif operator == "is before today":
+        return date < today
+    elif operator == "is after today":
+        return date > today
+    elif operator == "is today or before":
+        return date <= today
+    return date >= today
+
+
+def _evaluate_rule(record: dict, rule: dict, field_defs: dict, today) -> bool:
+    operator = rule["operator"]
+    value = rule.get("value")
+    field_def = field_defs[rule["field"]]
+    raw = _value(record, field_def.key)
+
+    if operator == "is blank":
+        return _is_blank(raw)
+    elif operator == "is not blank":
+        return not _is_blank(raw)
+    elif operator == "is":
+        return _equals(record, field_def, value)
+    elif operator == "is not":
+        return not _equals(record, field_def, value)
+    elif operator in MEMBERSHIP_OPERATORS:
+        values = value if isinstance(value, list) else [value]
+        match = any(_equals(record, field_def, val) for val in values)
+        return match if operator == "is any" else not match
+    elif operator in NUMBER_OPERATORS:
+        if _is_blank(raw):
+            return False
+        if operator == "higher than":
+            return _number(raw) > _number(value)
+        return _number(raw) < _number(value)
+    elif operator in DATE_OPERATORS:
+        return _compare_dates(raw, operator, value, today)
+
+    text = _text(record, field_def)
+    value = str(value).lower()
+
+    if operator == "contains":
+        return value in text
+    elif operator == "does not contain":
+        return value not in text
+    elif operator == "starts with":
+        return text.startswith(value)
+    return text.endswith(value)
+
+
+def _validate(rules: list, field_defs: dict):
+    for rule in rules:
+        if "rules" in rule:
+            _validate(rule["rules"], field_defs)
+            continue
+
+        if rule.get("field") not in field_defs:
+            raise ValueError(f"Unknown filter field: '{rule.get('field')}'")
+
+        if rule.get("operator") not in OPERATORS:
+            raise ValueError(f"Unsupported filter operator: '{rule.get('operator')}'")
+
+
+def _group(filters: typing.Union[dict, list]) -> typing.Tuple[str, list]:
+    if isinstance(filters, list):
+        return "and", filters
+    return filters.get("match", "and"), filters["rules"]
+
+
+def matcher(
+    filters: typing.Union[dict, list], field_defs: list, timezone=None
+) -> typing.Callable:
+    """Return a function which evaluates Knack filters against a record.
+
+    Args:
+        filters (dict or list): Knack filters.
+        field_defs (list): The `knackpy.fields.FieldDef`s of the container being
+            filtered.
+        timezone (pytz.timezone, optional): The app's timezone, which determines the
+            current date for operators such as "is today". Defaults to the system's
+            local time.
+
+    Raises:
+        ValueError: If a rule references an unknown field or an unsupported
+            operator.
+
+    Returns:
+        callable: A function which accepts a raw record `dict` and returns `True` if
+            the record meets the filters.
+    """
+    field_defs = {field_def.key: field_def for field_def in field_defs}
+    match, rules = _group(filters)
+    _validate(rules, field_defs)
+
+    def evaluate(record: dict, match: str = match, rules: list = rules) -> bool:
+        today = datetime.datetime.now(timezone).date()
+        results = (
+            evaluate(record, *_group(rule))
+            if "rules" in rule
+            else _evaluate_rule(record, rule, field_defs, today)
+            for rule in rules
+        )
+        return any(results) if match == "or" else all(results)
+
+    return evaluate
@@ -0,0 +1,144 @@
+"""Instrumentation hooks, which are called with an `Event` for each Knack API request,
+e.g. to feed a metrics backend.
+
+A hook is any callable which accepts an `Event`. Pass a list of hooks to
+`knackpy.app.App` (or to the functions in `knackpy.api`):
+
+```
+>>> def log_event(event):
+...     print(event.name, event.route_type, event.page, event.status, event.elapsed)
+>>> app = knackpy.App(app_id="myappid", api_key="myapikey", hooks=[log_event])
+>>> records = app.get("object_1")
+request object 1 200 0.83
+```
+
+Exceptions raised by hooks are logged, and otherwise ignored, so that a failing
+metrics backend does not interrupt requests.
+"""
+import collections
+import logging
+import time
+import typing
+import urllib.parse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# fired after each attempt at a request, whether it succeeded or not
+REQUEST = "request"
+
+# fired after a failed attempt, when the request is about to be retried
+RETRY = "retry"
+
+# a Knack API request event:
+# - name: `REQUEST` or `RETRY`
+# - method: the HTTP method
+# - route_type: "object", "view", "metadata" or "asset"
+# - url: the request URL, including its query
+# - page: the page number of paginated record requests, otherwise `None`
+# - status: the response status code, or `None` if the request timed out
+# - attempt: the attempt number, starting at 1
+# - max_attempts: the maximum number of attempts
+# - bytes_received: the size of the (decoded) response body, or `None` if the
+#   request timed out, or the response is streamed and its size is unknown
+# - bytes_sent: the size of the request body
+# - elapsed: seconds from sending the request until the response was received
+# - wait: seconds from sending the request until the response headers were received.
+#   this includes the time taken to connect, which is not measured apart
+# - download: seconds spent receiving the response body, or `None` if the response
+#   is streamed (and so is received as it is read)
+# - error: the exception which the attempt raised, if any
+Event = collections.namedtuple(
+    "Event",
+    "name method route_type url page status attempt max_attempts bytes_received "
+    "bytes_sent elapsed wait download error",
+)
+
+
+def route_type(url: str) -> str:
+    """Return the type of a Knack API route: `object`, `view`, `metadata` or
+    `asset`. See `knackpy.api._route`."""
+    path = urllib.parse.urlsplit(url).path
+    if "/assets/" in path or "/download/" in path:
+        return "asset"
+    elif "/pages/" in path:
+        return "view"
+    elif "/objects/" in path:
+        return "object"
+    return "metadata"
+
+
+def _page(url: str) -> typing.Union[int, None]:
+    page = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query).get("page")
+    return int(page[0]) if page else None
+
+
+def _bytes_received(res: requests.Response, stream: bool) -> typing.Union[int, None]:
+    if not stream:
+        return len(res.content)
+    length = res.headers.get("Content-Length")
+    return int(length) if length and "Content-Encoding" not in res.headers else None
+
+
+def _bytes_sent(prepped: requests.PreparedRequest) -> int:
+    body = prepped.body
+    if body is None:
+        return 0
+    elif isinstance(body, str):
+        return len(body.encode("utf-8"))
+    elif isinstance(body, bytes):
+        return len(body)
+    # a streamed body. see `knackpy.multipart.MultipartEncoder`
+    return getattr(body, "bytes_read", 0)
+
+
+def emit(
+    hooks: typing.Iterable[typing.Callable],
+    name: str,
+    prepped: requests.PreparedRequest,
+    start: float,
+    attempt: int,
+    max_attempts: int,
+    res: requests.Response = None,
+    error: Exception = None,
+    stream: bool = False,
+):
+    """Build an `Event` and call each hook with it.
+
+    Args:
+        hooks (iterable): The hooks to call.
+        name (str): `REQUEST` or `RETRY`.
+        prepped (requests.PreparedRequest): The request.
+        start (float): The `time.perf_counter()` at which the request was sent.
+        attempt (int): The attempt number.
+        max_attempts (int): The maximum number of attempts.
+        res (requests.Response, optional): The response, if any. Defaults to None.
+        error (Exception, optional): The exception raised, if any. Defaults to None.
+        stream (bool, optional): If the response is being streamed. Defaults to
+            False.
+    """
+    elapsed = time.perf_counter() - start
+    wait = res.elapsed.total_seconds() if res is not None else None
+    event = Event(
+        name=name,
+        method=prepped.method,
+        route_type=route_type(prepped.url),
+        url=prepped.url,
+        page=_page(prepped.url),
+        status=res.status_code if res is not None else None,
+        attempt=attempt,
+        max_attempts=max_attempts,
+        bytes_received=_bytes_received(res, stream) if res is not None else None,
+        bytes_sent=_bytes_sent(prepped),
+        elapsed=elapsed,
+        wait=wait,
+        download=max(elapsed - wait, 0) if res is not None and not stream else None,
+        error=error,
+    )
+
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            logger.exception(f"Error in hook {hook} for event: {event}")
@@ -0,0 +1,260 @@
+"""In-memory indexes of a container's records, for fast lookups by field value. See
+`knackpy.app.App.index`.
+"""
+import bisect
+import datetime
+import typing
+
+# field types whose values can be ordered by `SortedIndex`
+SORTED_FIELD_TYPES = [
+    "auto_increment",
+    "average",
+    "count",
+    "currency",
+    "date_time",
+    "max",
+    "min",
+    "number",
+    "rating",
+    "sum",
+]
+
+
+def _hashable(value):
+    """Return a hashable equivalent of a raw field value, e.g. for address or name
+    `dict`s."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(val)) for key, val in value.items()))
+    elif isinstance(value, list):
+        return tuple(_hashable(val) for val in value)
+    return value
+
+
+def _is_blank(value) -> bool:
+    return value in [None, "", [], {}]
+
+
+class HashIndex:
+    """A hash index which maps the raw values of a field to the records which have
+    that value.
+
+    Fields which hold many values are indexed by each of their values, so that a
+    record is found by any one of them: a connection field is indexed by each of its
+    connected record IDs, and a multiple choice field by each of its selections.
+    Records whose value is blank are not indexed.
+
+    Args:
+        field_def (knackpy.fields.FieldDef): The field to index.
+    """
+
+    def __init__(self, field_def):
+        self.field_def = field_def
+        self.key = field_def.key
+        self.key_raw = f"{field_def.key}_raw"
+        # the records the index was built from. see `App.lookup`
+        self.source = None
+        self._index = {}
+
+    def __repr__(self):
+        return f"<HashIndex '{self.key}' ({len(self._index)} values)>"
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self, value) -> list:
+        """Return the keys under which a raw field value is indexed."""
+        if _is_blank(value):
+            return []
+        elif self.field_def.type == "connection":
+            return [val["id"] if isinstance(val, dict) else val for val in value]
+        elif isinstance(value, list):
+            return list({_hashable(val) for val in value if not _is_blank(val)})
+        return [_hashable(value)]
+
+    def _value(self, record):
+        raw = record.raw
+        return raw[self.key_raw] if self.key_raw in raw else raw.get(self.key)
+
+    def build(self, records: typing.Iterable):
+        """(Re)build the index from scratch.
+
+        Args:
+            records (iterable): The container's `knackpy.record.Record`s.
+        """
+        self._index = {}
+        self.source = records
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        """Add a `knackpy.record.Record` to the index."""
+        for key in self.keys(self._value(record)):
+            self._index.setdefault(key, []).append(record)
+
+    def remove(self, record):
+        """Remove a `knackpy.record.Record` from the index."""
+        for key in self.keys(self._value(record)):
+            matches = self._index.get(key, [])
+            remaining = [match for match in matches if match is not record]
+            if remaining:
+                self._index[key] = remaining
+            else:
+                self._index.pop(key, None)
+
+    def items(self) -> list:
+        """Return a list of `(key, records)` tuples: each key under which records are
+        indexed, and the records indexed under it. See `keys`."""
+        return [(key, list(records)) for key, records in self._index.items()]
+
+    def lookup(self, value) -> list:
+        """Return the records which have a value.
+
+        Lists are indexed by each of their values, so a lookup is of a single value,
+        and a record whose field holds many values is found by any one of them.
+
+        Args:
+            value: A raw field value. For connection fields, a record ID. For
+                multiple choice fields, one selection.
+
+        Raises:
+            TypeError: If the value is a `list` or `tuple`.
+
+        Returns:
+            list: The matching `knackpy.record.Record`s, if any.
+        """
+        if isinstance(value, (list, tuple)):
+            raise TypeError(
+                f"Cannot look up many values of '{self.key}' at once: look up each "
+                "value"
+            )
+        elif self.field_def.type == "connection" and isinstance(value, dict):
+            value = value["id"]
+        elif isinstance(value, dict):
+            value = _hashable(value)
+        return list(self._index.get(value, []))
+
+
+class SortedIndex:
+    """A sorted index of a `date_time` or numeric field, for finding the records
+    whose value falls within a range.
+
+    Records are held in order of their field value: the corrected unix timestamp (in
+    milliseconds) of `date_time` fields, and the number of numeric fields. Records
+    whose value is blank are not indexed. Ranges are found by binary search.
+
+    Args:
+        field_def (knackpy.fields.FieldDef): The field to index.
+        timezone (pytz.timezone): The app's timezone, in which naive `datetime`s are
+            interpreted.
+
+    Raises:
+        ValueError: If the field's type cannot be ordered. See `SORTED_FIELD_TYPES`.
+    """
+
+    def __init__(self, field_def, timezone):
+        if field_def.type not in SORTED_FIELD_TYPES:
+            raise ValueError(
+                f"Cannot build a sorted index of {field_def.type} field: "
+                f"'{field_def.key}'"
+            )
+
+        self.field_def = field_def
+        self.key = field_def.key
+        self.key_raw = f"{field_def.key}_raw"
+        self.timezone = timezone
+        # the records the index was built from. see `App.lookup`
+        self.source = None
+        self._keys = []
+        self._records = []
+
+    def __repr__(self):
+        return f"<SortedIndex '{self.key}' ({len(self._keys)} values)>"
+
+    def __len__(self):
+        return len(self._keys)
+
+    def sort_key(self, record) -> typing.Union[float, None]:
+        """Return the value by which a `knackpy.record.Record` is ordered, or `None`
+        if its value is blank."""
+        raw = record.raw
+        value = raw[self.key_raw] if self.key_raw in raw else raw.get(self.key)
+
+        if _is_blank(value):
+            return None
+        elif isinstance(value, dict):
+            # date_time. Record.raw holds the corrected timestamp
+            return value.get("unix_timestamp")
+        elif isinstance(value, str):
+            # e.g. currency
+            return float(value.replace(",", "").replace("$", ""))
+        return value
+
+    def _bound(self, value) -> float:
+        """Return a range boundary as a comparable sort key."""
+        if isinstance(value, datetime.datetime):
+            if value.tzinfo is None:
+                value = self.timezone.localize(value)
+            return value.timestamp() * 1000
+        elif isinstance(value, datetime.date):
+            midnight = datetime.datetime.combine(value, datetime.time())
+            return self.timezone.localize(midnight).timestamp() * 1000
+        return value
+
+    def build(self, records: typing.Iterable):
+        """(Re)build the index from scratch.
+
+        Args:
+            records (iterable): The container's `knackpy.record.Record`s.
+        """
+        self.source = records
+        pairs = [(self.sort_key(record), record) for record in records]
+        pairs = sorted(
+            (pair for pair in pairs if pair[0] is not None), key=lambda pair: pair[0]
+        )
+        self._keys = [key for key, record in pairs]
+        self._records = [record for key, record in pairs]
+
+    def add(self, record):
+        """Add a `knackpy.record.Record` to the index."""
+        key = self.sort_key(record)
+        if key is None:
+            return
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._records.insert(position, record)
+
+    def remove(self, record):
+        """Remove a `knackpy.record.Record` from the index."""
+        key = self.sort_key(record)
+        if key is None:
+            return
+        position = bisect.bisect_left(self._keys, key)
+        while position < len(self._keys) and self._keys[position] == key:
+            if self._records[position] is record:
+                del self._keys[position]
+                del self._records[position]
+                return
+            position += 1
+
+    def range(self, start=None, end=None) -> list:
+        """Return the records whose value is greater than or equal to `start` and less
+        than `end`.
+
+        Args:
+            start (datetime, date, int or float, optional): The inclusive lower bound.
+                Numbers are compared with the field's value, which, for `date_time`
+                fields, is a unix timestamp in milliseconds. Defaults to None (no
+                lower bound).
+            end (datetime, date, int or float, optional): The exclusive upper bound.
+                Defaults to None (no upper bound).
+
+        Returns:
+            list: The matching `knackpy.record.Record`s, in order of their value.
+        """
+        low = 0 if start is None else bisect.bisect_left(self._keys, self._bound(start))
+        high = (
+            len(self._keys)
+            if end is None
+            else bisect.bisect_left(self._keys, self._bound(end))
+        )
+        return self._records[low:high]
@@ -0,0 +1,124 @@
+"""Transformations which are applied to raw Knack records as they are fetched, before
+they are stored in `App.data`. See `knackpy.app.App`.
+"""
+import sys
+import typing
+
+# field types whose values are typically drawn from a small set, and so are worth
+# de-duplicating. de-duplicating high-cardinality values would cost memory, not save it
+INTERN_FIELD_TYPES = ["address", "connection", "multiple_choice", "user_roles"]
+
+# longer strings are unlikely to repeat
+MAX_INTERN_LENGTH = 256
+
+
+def strip_formatted_keys(field_defs: list) -> typing.Callable:
+    """Return a function which removes Knack's redundant formatted values from a
+    record.
+
+    Knack returns most fields twice: the formatted value at `field_x` (often an HTML
+    string) and the unformatted value at `field_x_raw`. `Record` only needs the
+    formatted value for fields which use Knack's formatting (see
+    `models.FIELD_SETTINGS`) and for the container's identifier field, which is used
+    in `Record.__repr__`. All other formatted values can be dropped, roughly halving
+    the size of each record.
+
+    Args:
+        field_defs (list): The container's `knackpy.fields.FieldDef` objects.
+
+    Returns:
+        callable: A function which accepts and returns a single record `dict`. The
+            record is modified in place.
+    """
+    keys = [
+        (field_def.key, f"{field_def.key}_raw")
+        for field_def in field_defs
+        if not field_def.use_knack_format and not field_def.identifier
+    ]
+
+    def strip(record: dict) -> dict:
+        for key, key_raw in keys:
+            # the formatted value is the only value available if there is no raw key
+            if key_raw in record:
+                record.pop(key, None)
+        return record
+
+    return strip
+
+
+class Interner:
+    """A function-like object which de-duplicates repeated values across records, so
+    that identical values share a single object in memory.
+
+    Knack records repeat the same strings many times over: every record carries the
+    same field keys (and the same subfield keys, e.g. `unix_timestamp`), and
+    multiple choice values, connection IDs and identifiers, and address subfields
+    are often drawn from a small set of values. The JSON decoder creates a new `str`
+    for every occurrence.
+
+    Dict keys are interned with `sys.intern`. Values of fields whose type is in
+    `INTERN_FIELD_TYPES` are de-duplicated against a lookup table which is kept per
+    field, and which persists across pages (and across calls to the interner), so an
+    `Interner` should be reused for the lifetime of a container's data.
+
+    Args:
+        field_defs (list): The container's `knackpy.fields.FieldDef` objects.
+        max_length (int, optional): Strings longer than this are never
+            de-duplicated. Defaults to `MAX_INTERN_LENGTH`.
+    """
+
+    def __init__(self, field_defs: list, max_length: int = MAX_INTERN_LENGTH):
+        self.max_length = max_length
+        self.tables = {}
+
+        for field_def in field_defs:
+            if field_def.type in INTERN_FIELD_TYPES:
+                # a field's formatted and raw values share a table
+                table = {}
+                self.tables[field_def.key] = table
+                self.tables[f"{field_def.key}_raw"] = table
+
+    def __call__(self, record: dict) -> dict:
+        """De-duplicate the values of a single record.
+
+        Args:
+            record (dict): A Knack record.
+
+        Returns:
+            dict: A new record `dict` whose keys and values are shared with other
+                records wherever possible.
+        """
+        return {
+            sys.intern(key): self._dedupe(value, self.tables.get(key))
+            for key, value in record.items()
+        }
+
+    def _dedupe(self, value, table):
+        if isinstance(value, str):
+            if table is None or len(value) > self.max_length:
+                return value
+            return table.setdefault(value, value)
+
+        elif isinstance(value, list):
+            return [self._dedupe(item, table) for item in value]
+
+        elif isinstance(value, dict):
+            # we never share mutable containers between records, only their contents
+            return {
+                sys.intern(key): self._dedupe(val, table) for key, val in value.items()
+            }
+
+        return value
+
+
+def chain(*transforms: typing.Callable) -> typing.Callable:
+    """Compose transforms into a single function which applies each in turn, ignoring
+    any which are `None`."""
+    transforms = [transform for transform in transforms if transform]
+
+    def apply(record: dict) -> dict:
+        for transform in transforms:
+            record = transform(record)
+        return record
+
+    return apply
@@ -0,0 +1,191 @@
+import mimetypes
+import os
+import typing
+import uuid
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1mb
+
+
+class MultipartEncoder:
+    """A streaming `multipart/form-data` request body for a single file upload.
+
+    `requests` builds the entire multipart body in memory when a file is passed
+    via `files=`. This class instead behaves like a read-only file object, so that
+    `requests` (and ultimately `http.client`) pull the body from disk one chunk at a
+    time. Only `chunk_size` bytes of the file are held in memory at once.
+
+    The source may be a file path, a binary file-like object, or any iterable which
+    yields `bytes`. When the source size is known (paths and seekable files), the
+    body length is known up-front and the request is sent with a `Content-Length`
+    header. Otherwise the body is sent with chunked transfer encoding.
+
+    Args:
+        source (str, file-like, or iterable): A file path, a binary file-like
+            object, or an iterable of `bytes`.
+        filename (str, optional): The filename to report to Knack. Defaults to the
+            basename of the source path or file name. Required for iterables.
+        field_name (str, optional): The form field name. Knack expects "files".
+        chunk_size (int, optional): The number of bytes to read from the source at a
+            time. Defaults to 1mb.
+        callback (callable, optional): A function which will be called with
+            `(bytes_read, total_bytes)` each time a chunk of the body is read.
+            `total_bytes` is `None` if the body length is unknown.
+    """
+
+    def __repr__(self):
+        return f"<MultipartEncoder '{self.filename}'>"
+
+    def __init__(
+        self,
+        source: typing.Union[str, typing.BinaryIO, typing.Iterable[bytes]],
+        *,
+        filename: str = None,
+        field_name: str = "files",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        callback: typing.Callable = None,
+    ):
+        self._owns_file = isinstance(source, str)
+        self._file = open(source, "rb") if self._owns_file else None
+        self._iterable = None
+
+        if not self._file and hasattr(source, "read"):
+            self._file = source
+        elif not self._file:
+            self._iterable = source
+
+        self.filename = filename or self._default_filename(source)
+
+        if not self.filename:
+            raise TypeError("`filename` is required when uploading from an iterable")
+
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self._head = self._render_head(field_name)
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self._start = self._tell()
+        self.len = self._content_length()
+        self.bytes_read = 0
+        self._chunks = self._generate_chunks()
+        self._chunk = b""
+        self._position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    @staticmethod
+    def _default_filename(source):
+        name = source if isinstance(source, str) else getattr(source, "name", None)
+        return os.path.basename(name) if isinstance(name, str) else None
+
+    def _render_head(self, field_name):
+        content_type = (
+            mimetypes.guess_type(self.filename)[0] or "application/octet-stream"
+        )
+        return (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; '
+            f'filename="{self.filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+
+    def _tell(self):
+        try:
+            return self._file.tell()
+        except (AttributeError, OSError):
+            return None
+
+    def _content_length(self):
+        """Return the length of the entire body, or `None` if it cannot be known
+        without consuming the source."""
+        if self._start is None:
+            return None
+        try:
+            file_size = os.fstat(self._file.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            # e.g. io.BytesIO, which has no file descriptor
+            self._file.seek(0, os.SEEK_END)
+            file_size = self._file.tell()
+            self._file.seek(self._start)
+        return len(self._head) + (file_size - self._start) + len(self._tail)
+
+    def _generate_chunks(self):
+        yield self._head
+
+        if self._file:
+            while True:
+                chunk = self._file.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            yield from self._iterable
+
+        yield self._tail
+
+    @property
+    def rewindable(self) -> bool:
+        """If the body can be re-sent, i.e. the source is a seekable file."""
+        return self._start is not None
+
+    def rewind(self):
+        """Reset the body to its first byte so that a failed request can be retried.
+
+        Raises:
+            ValueError: If the source is an iterable, which cannot be re-read.
+        """
+        if not self.rewindable:
+            raise ValueError("Unable to rewind an upload from an iterable source")
+        self._file.seek(self._start)
+        self.bytes_read = 0
+        self._chunks = self._generate_chunks()
+        self._chunk = b""
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes of the multipart body, or the remainder of the body
+        if `size` is negative."""
+        pieces = []
+        remaining = size
+
+        while size < 0 or remaining > 0:
+            if self._position >= len(self._chunk):
+                try:
+                    self._chunk = next(self._chunks)
+                except StopIteration:
+                    break
+                self._position = 0
+                continue
+
+            end = len(self._chunk)
+            if size >= 0:
+                end = min(end, self._position + remaining)
+                remaining -= end - self._position
+
+            # slice rather than re-buffer so that small reads of a large chunk do not
+            # repeatedly copy the remainder of the chunk
+            pieces.append(self._chunk[self._position : end])
+            self._position = end
+
+        data = b"".join(pieces)
+        self.bytes_read += len(data)
+
+        if data and self.callback:
+            self.callback(self.bytes_read, self.len)
+
+        return data
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
@@ -0,0 +1,113 @@
+"""Build plain `dict`s from raw Knack records, without constructing `Record` or
+`Field` objects. See `App.get(as_dicts=True)`.
+"""
+import typing
+
+from . import utils
+
+
+class Plan:
+    """A container's record-building plan: the fields to read from each raw record,
+    and how to format them, resolved once so that building each `dict` does no more
+    than look up and format values.
+
+    A plan applies the same normalization as `knackpy.record.Record`: empty strings
+    and lists are replaced with `None`, and timestamps are corrected to real unix
+    time. The `dict`s it builds are equal to `record.format(keys=False, values=False)`
+    or, if `formatted`, to `record.format()`.
+
+    Args:
+        field_defs (list): The container's `knackpy.fields.FieldDef` objects.
+        timezone (pytz.timezone): The app's timezone.
+        formatted (bool, optional): If True, dicts are keyed by field name, and
+            values are formatted. Otherwise, dicts are keyed by field key, and values
+            are raw. Defaults to False.
+    """
+
+    def __init__(self, field_defs: list, timezone, formatted: bool = False):
+        self.timezone = timezone
+        self.formatted = formatted
+        # (output key, field key, raw field key, use knack's format, formatter)
+        self.steps = [
+            (
+                field_def.name if formatted else field_def.key,
+                field_def.key,
+                f"{field_def.key}_raw",
+                field_def.use_knack_format,
+                self._formatter(field_def) if formatted else None,
+            )
+            for field_def in field_defs
+        ]
+
+    def __repr__(self):
+        return f"<Plan ({len(self.steps)} fields, formatted={self.formatted})>"
+
+    def __call__(self, data: dict) -> dict:
+        """Build a `dict` from a raw Knack record. The raw record is not modified."""
+        record = {}
+
+        for out_key, key, key_raw, use_knack_format, formatter in self.steps:
+            value = self._normalize(data[key_raw] if key_raw in data else data[key])
+
+            if formatter:
+                knack_value = self._normalize(data[key]) if use_knack_format else None
+                input_value = knack_value if knack_value else value
+                # every formatter returns `None` for a `None` value
+                value = None if input_value is None else formatter(input_value, value)
+
+            record[out_key] = value
+
+        return record
+
+    def build(self, data: dict) -> tuple:
+        """Normalize and format a raw Knack record as `knackpy.record.Record` would,
+        for `Record._from_built`. The plan must be `formatted`.
+
+        Only what differs from `data` is returned, so that as little as possible is
+        sent between processes. See `knackpy.parallel`.
+
+        Returns:
+            tuple: The values which normalization changed, keyed by key, and a list
+                of each field's formatted value, in the order of the plan's field
+                definitions.
+        """
+        raw = {key: self._normalize(value) for key, value in data.items()}
+        changes = {key: value for key, value in raw.items() if value is not data[key]}
+        formatted = []
+
+        for out_key, key, key_raw, use_knack_format, formatter in self.steps:
+            value = raw[key_raw] if key_raw in raw else raw[key]
+            knack_value = raw[key] if use_knack_format else None
+            input_value = knack_value if knack_value else value
+            formatted.append(
+                None if input_value is None else formatter(input_value, value)
+            )
+
+        return changes, formatted
+
+    def _normalize(self, value):
+        """See `Record._handle_record`."""
+        if value == "" or value == []:
+            return None
+        if isinstance(value, dict) and "unix_timestamp" in value:
+            return dict(
+                value,
+                unix_timestamp=utils.correct_knack_timestamp(
+                    value["unix_timestamp"], self.timezone
+                ),
+            )
+        return value
+
+    def _formatter(self, field_def) -> typing.Callable:
+        """Return a function of a field's input value and raw value which returns
+        its formatted value. See `Field._format`."""
+        format_value = field_def.formatter
+        kwargs = {"timezone": self.timezone} if field_def.type == "date_time" else {}
+
+        def formatter(input_value, raw):
+            try:
+                return format_value(input_value, **kwargs)
+            except AttributeError:
+                return raw
+
+        return formatter
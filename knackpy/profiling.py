@@ -0,0 +1,312 @@
+"""Attribute wall and CPU time to the phases of Knackpy's pipeline, by container, to
+tell whether a slow job is network-bound or CPU-bound. See `profile`.
+
+Phases:
+    - http: Sending requests and waiting for responses, including retries.
+    - decode: Decoding JSON response bodies.
+    - record: Preparing raw record data: replacing empty values, and correcting
+        timestamps (`Record._handle_record`).
+    - fields: Constructing `Field`s, excluding formatting.
+    - format:<field type>: Formatting the values of each type of field.
+    - dicts: Building plain `dict`s, with `App.get(as_dicts=True)`, including
+        formatting.
+    - export: Writing records to CSV, excluding the phases above.
+
+Time is exclusive: time spent in a phase which runs inside another (e.g., formatting
+inside field construction) is only attributed to the inner phase. CPU time is that of
+the thread in which the phase ran.
+
+Records of streamed pages (see `knackpy.api.get`) are decoded as they are consumed,
+so their decoding is not measured apart.
+"""
+import functools
+import re
+import threading
+import time
+
+from . import api
+from .app import App
+from .fields import Field
+from .plan import Plan
+from .record import Record
+
+# the CPU time of the current thread, where the platform supports it
+_cpu_time = getattr(time, "thread_time", time.process_time)
+
+# the container which a request URL targets
+_CONTAINER_PATTERN = re.compile(r"/(?:objects|views)/([^/]+)/records")
+
+# the container of work which cannot be attributed to one
+UNATTRIBUTED = "-"
+
+# the active profile, if any
+_active = None
+
+
+def _argument(args: tuple, kwargs: dict, position: int, name: str):
+    """Return an argument of a call, whether it was passed by position or by name."""
+    return args[position] if len(args) > position else kwargs.get(name)
+
+
+def _url_container(url: str) -> str:
+    match = _CONTAINER_PATTERN.search(url or "")
+    return match.group(1) if match else UNATTRIBUTED
+
+
+class Profile:
+    """Wall and CPU time, by container and phase. Use `knackpy.profile()` to collect
+    a profile.
+
+    While a profile is active, the functions which make up each phase are wrapped with
+    timers. They are restored when the profile stops, so that profiling costs nothing
+    when it is not in use.
+    """
+
+    def __init__(self):
+        # (container, phase) -> [calls, wall seconds, cpu seconds]
+        self.phases = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patches = []
+
+    def __repr__(self):
+        return f"<Profile ({len(self.phases)} phases)>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Start profiling.
+
+        Raises:
+            RuntimeError: If another profile is active.
+        """
+        global _active
+
+        if _active is not None:
+            raise RuntimeError("Another profile is already active")
+
+        _active = self
+        self._patch(api, "_request", "http", lambda args, kwargs: kwargs.get("url"))
+        self._patch(
+            api,
+            "_decode",
+            "decode",
+            lambda args, kwargs: getattr(
+                _argument(args, kwargs, 0, "res"), "url", None
+            ),
+        )
+        self._patch(Record, "_handle_record", "record")
+        self._patch(Record, "_handle_fields", "fields")
+        self._patch(Field, "_format", lambda args: f"format:{args[0].field_def.type}")
+        self._patch(Plan, "__call__", "dicts")
+        self._patch(App, "to_csv", "export")
+        self._attribute(
+            App,
+            "to_csv",
+            lambda args, kwargs: args[0]._find_container(
+                _argument(args, kwargs, 1, "identifier")
+            ),
+        )
+        self._attribute(
+            App,
+            "_get_container",
+            lambda args, kwargs: _argument(args, kwargs, 1, "container"),
+        )
+        self._attribute(
+            App,
+            "_records",
+            lambda args, kwargs: _argument(args, kwargs, 1, "container_key"),
+        )
+        self._attribute(
+            App,
+            "_dicts",
+            lambda args, kwargs: _argument(args, kwargs, 1, "container_key"),
+        )
+        return self
+
+    def stop(self):
+        """Stop profiling, and restore the functions which were timed."""
+        global _active
+
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+
+        self._patches = []
+        _active = None
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+            self._local.containers = []
+        return self._local.stack
+
+    def _container(self) -> str:
+        self._stack()
+        return self._local.containers[-1] if self._local.containers else UNATTRIBUTED
+
+    def _patch(self, owner, name: str, phase, url_of=None):
+        """Time a function as a phase. `phase` is a phase name, or a function of the
+        call's arguments which returns one. Calls are attributed to the container
+        of the request URL returned by `url_of`, if given, or else to the container
+        whose records are being handled."""
+        original = getattr(owner, name)
+        profile = self
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            stack = profile._stack()
+            # [wall start, cpu start, child wall, child cpu]
+            frame = [time.perf_counter(), _cpu_time(), 0.0, 0.0]
+            stack.append(frame)
+            try:
+                return original(*args, **kwargs)
+            finally:
+                wall = time.perf_counter() - frame[0]
+                cpu = _cpu_time() - frame[1]
+                stack.pop()
+                if stack:
+                    stack[-1][2] += wall
+                    stack[-1][3] += cpu
+                profile._add(
+                    (
+                        _url_container(url_of(args, kwargs))
+                        if url_of
+                        else profile._container()
+                    ),
+                    phase if isinstance(phase, str) else phase(args),
+                    wall - frame[2],
+                    cpu - frame[3],
+                )
+
+        self._patches.append((owner, name, original))
+        setattr(owner, name, timed)
+
+    def _attribute(self, owner, name: str, container_of):
+        """Attribute the work done within an `App` method to the container returned
+        by `container_of`, a function of the call's positional and keyword
+        arguments, including the work of any generator the method returns. Work is
+        unattributed if the container cannot be found, so that the call itself
+        behaves as it would without profiling (e.g. raising its own error)."""
+        original = getattr(owner, name)
+        profile = self
+
+        def attributed(iterator, container_key):
+            profile._stack()
+            containers = profile._local.containers
+            while True:
+                containers.append(container_key)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    containers.pop()
+                yield item
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            try:
+                container = container_of(args, kwargs)
+            except Exception:
+                container = UNATTRIBUTED
+            container_key = (
+                getattr(container, "obj", None)
+                or getattr(container, "view", container)
+                or UNATTRIBUTED
+            )
+            profile._stack()
+            profile._local.containers.append(container_key)
+            try:
+                result = original(*args, **kwargs)
+            finally:
+                profile._local.containers.pop()
+            if hasattr(result, "__next__"):
+                return attributed(result, container_key)
+            return result
+
+        self._patches.append((owner, name, original))
+        setattr(owner, name, wrapper)
+
+    def _add(self, container: str, phase: str, wall: float, cpu: float):
+        with self._lock:
+            totals = self.phases.setdefault((container, phase), [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += wall
+            totals[2] += cpu
+
+    def summary(self) -> dict:
+        """Return the profile's totals.
+
+        Returns:
+            dict: `{"calls": int, "wall": float, "cpu": float}` dicts, keyed by
+                container and then by phase. Times are in seconds.
+        """
+        summary = {}
+        with self._lock:
+            for (container, phase), (calls, wall, cpu) in sorted(self.phases.items()):
+                summary.setdefault(container, {})[phase] = {
+                    "calls": calls,
+                    "wall": wall,
+                    "cpu": cpu,
+                }
+        return summary
+
+    def table(self) -> str:
+        """Return the profile's totals as a table per container, with phases in order
+        of their wall time."""
+        lines = []
+        columns = "{:<28}{:>10}{:>12}{:>12}{:>8}"
+
+        for container, phases in self.summary().items():
+            total_wall = sum(phase["wall"] for phase in phases.values())
+            total_cpu = sum(phase["cpu"] for phase in phases.values())
+            lines.append(
+                columns.format(container, "calls", "wall (s)", "cpu (s)", "wall")
+            )
+
+            for name, phase in sorted(
+                phases.items(), key=lambda item: item[1]["wall"], reverse=True
+            ):
+                share = phase["wall"] / total_wall if total_wall else 0
+                lines.append(
+                    columns.format(
+                        f"  {name}",
+                        phase["calls"],
+                        f"{phase['wall']:.3f}",
+                        f"{phase['cpu']:.3f}",
+                        f"{share:.0%}",
+                    )
+                )
+
+            lines.append(
+                columns.format(
+                    "  total", "", f"{total_wall:.3f}", f"{total_cpu:.3f}", ""
+                )
+            )
+            lines.append("")
+
+        return "\n".join(line.rstrip() for line in lines)
+
+
+def profile() -> Profile:
+    """Profile Knackpy within a `with` block. Wall and CPU time are attributed to
+    each phase of the pipeline (see `knackpy.profiling`), by container.
+
+    ```
+    >>> with knackpy.profile() as prof:
+    ...     app.to_csv("object_1")
+    >>> print(prof.table())
+    object_1                         calls    wall (s)     cpu (s)    wall
+      http                               4       3.021       0.015     71%
+      format:date_time              185000       0.402       0.401      9%
+      ...
+    ```
+
+    Returns:
+        Profile: The profile, which is collected until the `with` block exits.
+    """
+    return Profile()
@@ -40,6 +40,41 @@ class Record(MutableMapping):
         # see the __setitem__ docstring
         self.immutable = True
 
+    @classmethod
+    def _from_built(cls, data, field_defs, identifier, timezone, changes, formatted):
+        """Construct a Record from values which have already been normalized and
+        formatted, e.g. in another process (see `knackpy.parallel`), without
+        normalizing or formatting them again.
+
+        Args:
+            data, field_defs, identifier, timezone: See `Record.__init__`.
+            changes (dict): The values of `data` which normalization changed. See
+                `knackpy.plan.Plan.build`.
+            formatted (list): Each field's formatted value, in the order of
+                `field_defs`.
+        """
+        record = cls.__new__(cls)
+        record.data = data
+        record.field_defs = field_defs
+        record.identifier = identifier
+        record.timezone = timezone
+        record.raw = raw = {**data, **changes}
+        record.fields = fields = {}
+
+        for field_def, formatted_value in zip(field_defs, formatted):
+            key = field_def.key
+            key_raw = f"{key}_raw"
+            fields[key] = _fields.Field._from_built(
+                field_def,
+                timezone,
+                raw[key_raw] if key_raw in raw else raw[key],
+                raw[key] if field_def.use_knack_format else None,
+                formatted_value,
+            )
+
+        record.immutable = True
+        return record
+
     def __repr__(self):
         identifier_value = (
             self.data[self.identifier] if self.identifier else self.data["id"]
@@ -193,11 +228,13 @@ class Record(MutableMapping):
         # see note in knackpy.utils.correct_knack_timestamp
         for key, val in record.items():
             try:
-                val["unix_timestamp"] = utils.correct_knack_timestamp(
-                    val["unix_timestamp"], timezone
-                )
-                record[key] = val
+                timestamp = val["unix_timestamp"]
             except (KeyError, TypeError):
-                pass
+                continue
+            # copy the value, so that the source data is left untouched and
+            # timestamps are not corrected twice if the record is rebuilt
+            record[key] = dict(
+                val, unix_timestamp=utils.correct_knack_timestamp(timestamp, timezone)
+            )
 
         return record
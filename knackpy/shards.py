@@ -0,0 +1,122 @@
+"""Helpers for splitting a records query into non-overlapping date ranges ("shards")
+which can be fetched independently. See `knackpy.app.App.get`.
+"""
+import datetime
+import typing
+
+# the date format of Knack filter values and of the `date` key of raw date values
+DATE_FORMAT = "%m/%d/%Y"
+
+
+def parse_date(value: dict) -> datetime.date:
+    """Return the date of a raw Knack `date_time` value, e.g.:
+    `{"date": "09/11/2019", "unix_timestamp": 1568160000000, ...}`"""
+    return datetime.datetime.strptime(value["date"], DATE_FORMAT).date()
+
+
+def date_ranges(start: datetime.date, end: datetime.date, shards: int) -> list:
+    """Split the days from `start` through `end` into consecutive ranges of (roughly)
+    equal length.
+
+    Each range is a `(start, end)` tuple, where `start` is inclusive and `end` is
+    exclusive. The first range has no start and the last range has no end, so that
+    together the ranges cover all dates.
+
+    Args:
+        start (datetime.date): The earliest date.
+        end (datetime.date): The latest date.
+        shards (int): The number of ranges. There will be fewer ranges if there are
+            fewer days than `shards`.
+
+    Returns:
+        list: A list of `(datetime.date, datetime.date)` tuples.
+    """
+    days = (end - start).days + 1
+    shards = max(1, min(shards, days))
+
+    bounds = [
+        start + datetime.timedelta(days=round(i * days / shards))
+        for i in range(1, shards)
+    ]
+
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+def _user_rules(filters: typing.Union[dict, list, None]) -> list:
+    """Return a user's Knack filters as a list of rules which must all be met.
+
+    Raises:
+        ValueError: If the filters use `"match": "or"` with more than one rule,
+            which cannot be combined with additional rules.
+    """
+    if not filters:
+        return []
+    elif isinstance(filters, list):
+        return list(filters)
+    elif filters.get("match", "and") == "or" and len(filters["rules"]) > 1:
+        raise ValueError("Sharding is not supported with `match: or` filters")
+    return list(filters["rules"])
+
+
+def _range_rules(field_key: str, start: datetime.date, end: datetime.date) -> list:
+    rules = []
+
+    if start:
+        rules.append(
+            {
+                "field": field_key,
+                "operator": "is after",
+                "value": (start - datetime.timedelta(days=1)).strftime(DATE_FORMAT),
+            }
+        )
+    if end:
+        rules.append(
+            {
+                "field": field_key,
+                "operator": "is before",
+                "value": end.strftime(DATE_FORMAT),
+            }
+        )
+
+    return rules
+
+
+def shard_filters(
+    field_key: str, ranges: list, filters: typing.Union[dict, list] = None
+) -> list:
+    """Build one set of Knack filters per date range, each merged with the user's
+    filters. An additional shard is included for records whose date is blank.
+
+    Args:
+        field_key (str): The key of the `date_time` field to shard by.
+        ranges (list): A list of `(start, end)` date tuples. See `date_ranges()`.
+        filters (dict or list, optional): The user's Knack filters.
+
+    Returns:
+        list: A list of Knack filter `dict`s.
+    """
+    rules = _user_rules(filters)
+
+    shards = [
+        {"match": "and", "rules": rules + _range_rules(field_key, start, end)}
+        for start, end in ranges
+    ]
+
+    shards.append(
+        {
+            "match": "and",
+            "rules": rules + [{"field": field_key, "operator": "is blank"}],
+        }
+    )
+
+    return shards
+
+
+def not_blank_filters(field_key: str, filters: typing.Union[dict, list] = None) -> dict:
+    """Merge the user's filters with a rule which excludes records whose date is
+    blank."""
+    rules = _user_rules(filters)
+    return {
+        "match": "and",
+        "rules": rules + [{"field": field_key, "operator": "is not blank"}],
+    }
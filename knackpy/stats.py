@@ -0,0 +1,178 @@
+"""Performance counters and latency histograms, aggregated by `knackpy.app.App`. See
+`App.stats`.
+"""
+import bisect
+import threading
+
+# the upper bounds, in seconds, of the latency histograms' buckets. the last bucket
+# is unbounded
+LATENCY_BUCKETS = [
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+]
+
+PERCENTILES = [50, 90, 99]
+
+
+class Histogram:
+    """A histogram of latencies, with fixed buckets, so that its size does not grow
+    with the number of samples. Percentiles are interpolated within buckets.
+
+    Args:
+        buckets (list, optional): The upper bounds of the buckets, in ascending
+            order. Defaults to `LATENCY_BUCKETS`.
+    """
+
+    def __init__(self, buckets: list = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def __repr__(self):
+        return f"<Histogram ({self.count} samples)>"
+
+    def add(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """Return the approximate value below which `percent` of samples fall, or
+        `None` if there are no samples."""
+        if not self.count:
+            return None
+
+        rank = self.count * percent / 100
+        seen = 0
+
+        for position, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.buckets[position - 1] if position else 0
+                high = (
+                    self.buckets[position] if position < len(self.buckets) else self.max
+                )
+                value = low + (high - low) * (rank - seen) / count
+                # the true percentile cannot fall outside of the observed range
+                return min(max(value, self.min), self.max)
+            seen += count
+
+        return self.max
+
+    def summary(self) -> dict:
+        summary = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+        }
+        for percent in PERCENTILES:
+            summary[f"p{percent}"] = self.percentile(percent)
+        summary["histogram"] = {
+            bound: count
+            for bound, count in zip(self.buckets + [float("inf")], self.counts)
+            if count
+        }
+        return summary
+
+
+class Stats:
+    """Thread-safe counters of an app's requests and records.
+
+    A `Stats` instance is a `knackpy.hooks` hook: call it with each
+    `knackpy.hooks.Event` to count requests. Other counters are incremented with
+    `incr()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def __repr__(self):
+        return f"<Stats ({self.counters['requests']} requests)>"
+
+    def reset(self):
+        """Reset all counters and histograms to zero."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "pages": 0,
+            "records": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "bytes_received": 0,
+            "bytes_sent": 0,
+        }
+        # latency histograms, keyed by endpoint, e.g. "GET object"
+        self.latency = {}
+
+    def incr(self, counter: str, value: int = 1):
+        with self._lock:
+            self.counters[counter] += value
+
+    def __call__(self, event):
+        if event.name == "retry":
+            self.incr("retries")
+            return
+
+        with self._lock:
+            self.counters["requests"] += 1
+            self.counters["bytes_sent"] += event.bytes_sent or 0
+            self.counters["bytes_received"] += event.bytes_received or 0
+
+            if event.status is None:
+                self.counters["timeouts"] += 1
+            elif event.status == 429:
+                self.counters["rate_limited"] += 1
+            elif event.status >= 500:
+                self.counters["server_errors"] += 1
+            elif event.page and event.status < 400:
+                self.counters["pages"] += 1
+
+            endpoint = f"{event.method} {event.route_type}"
+            if endpoint not in self.latency:
+                self.latency[endpoint] = Histogram()
+            self.latency[endpoint].add(event.elapsed)
+
+    def summary(self, reset: bool = False) -> dict:
+        """Return the counters, and a summary of latencies by endpoint.
+
+        Args:
+            reset (bool, optional): If True, reset the counters once they have been
+                summarized. Defaults to False.
+
+        Returns:
+            dict: The counters, and a `latency` dict of latency summaries (in
+                seconds), keyed by endpoint.
+        """
+        with self._lock:
+            summary = dict(self.counters)
+            summary["latency"] = {
+                endpoint: histogram.summary()
+                for endpoint, histogram in sorted(self.latency.items())
+            }
+            if reset:
+                self._clear()
+
+        return summary
@@ -0,0 +1,4 @@
+"""Tools for testing and benchmarking code which uses Knackpy, without a Knack
+application. See `knackpy.testing.synthetic` and `knackpy.testing.server`.
+"""
+from . import server, synthetic  # noqa: F401
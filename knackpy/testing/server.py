@@ -0,0 +1,474 @@
+"""A local stand-in for the Knack API, for testing Knackpy, and measuring its fetch and
+write throughput and retry behaviour, without a Knack application.
+
+`MockServer` implements the routes which `knackpy.api` requests: application
+metadata, paginated (and filtered and sorted) object and view records, record create,
+update and delete, and file and image upload and download. Its responses can be
+delayed, and it can be made to fail with 5xx errors, to hang until clients time out,
+and to limit the rate of requests. Faults are drawn from a seeded random number
+generator, so that a sequence of requests meets the same faults each time.
+
+While the server is running, `knackpy.api.BASE_URL` points at it.
+
+```
+>>> metadata = synthetic.metadata(objects=2)
+>>> with server.MockServer(metadata, error_rate=0.1) as mock:
+...     mock.data["object_1"] = list(synthetic.records(metadata, "object_1", 5000))
+...     app = knackpy.App(app_id=metadata["application"]["id"], api_key="abc")
+...     records = app.get("object_1")
+>>> len(records)
+5000
+```
+"""
+import collections
+import email.parser
+import http.server
+import json
+import math
+import random
+import re
+import socketserver
+import threading
+import time
+import urllib.parse
+
+from .. import api, fields
+from .. import filters as _filters
+from ..app import App
+from ..models import MAX_ROWS_PER_PAGE
+
+# Knack's default number of records per page
+DEFAULT_ROWS_PER_PAGE = 25
+
+# a request which was made to the server. `status` is the response status code
+Request = collections.namedtuple("Request", "method path status")
+
+# (method, path pattern, handler method name)
+ROUTES = [
+    ("GET", r"/applications/(?P<app_id>[^/]+)", "_get_metadata"),
+    ("GET", r"/objects/(?P<obj>[^/]+)/records/?", "_get_records"),
+    ("GET", r"/pages/(?P<scene>[^/]+)/views/(?P<view>[^/]+)/records/?", "_get_records"),
+    ("GET", r"/objects/(?P<obj>[^/]+)/records/(?P<record_id>[^/]+)", "_get_record"),
+    ("POST", r"/objects/(?P<obj>[^/]+)/records/?", "_create"),
+    ("PUT", r"/objects/(?P<obj>[^/]+)/records/(?P<record_id>[^/]+)", "_update"),
+    ("DELETE", r"/objects/(?P<obj>[^/]+)/records/(?P<record_id>[^/]+)", "_delete"),
+    (
+        "POST",
+        r"/applications/(?P<app_id>[^/]+)/assets/(?P<asset_type>file|image)/upload",
+        "_upload",
+    ),
+    (
+        "GET",
+        r"/applications/(?P<app_id>[^/]+)/download/asset/(?P<asset_id>[^/]+)/"
+        r"(?P<filename>[^/]+)",
+        "_download",
+    ),
+]
+
+
+class _Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # keep connections alive, so that sessions can reuse them
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.mock._handle(self)
+
+    do_POST = do_PUT = do_DELETE = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def _read_body(handler) -> bytes:
+    if handler.headers.get("Transfer-Encoding", "").lower() != "chunked":
+        return handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+
+    chunks = []
+    while True:
+        size = int(handler.rfile.readline().split(b";")[0], 16)
+        if not size:
+            handler.rfile.readline()
+            return b"".join(chunks)
+        chunks.append(handler.rfile.read(size))
+        handler.rfile.readline()
+
+
+def _error(message: str) -> dict:
+    return {"errors": [{"message": message}]}
+
+
+def _sort_key(record: dict, key: str):
+    value = record.get(f"{key}_raw", record.get(key))
+    if isinstance(value, dict) and "unix_timestamp" in value:
+        return (0, value["unix_timestamp"])
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    elif value in [None, "", []]:
+        return (2, "")
+    return (1, str(value))
+
+
+class MockServer:
+    """A local HTTP server which behaves like the Knack API.
+
+    Records are held in `data`, keyed by object key, in the form in which Knack
+    returns them (see `knackpy.testing.synthetic.records`). Records which are created
+    or updated through the server hold the payload's values as both their formatted
+    and `_raw` values, except that connections and file and image assets are expanded
+    as Knack would expand them.
+
+    Each request is answered after `latency` seconds. Then, if the request exceeds
+    `rate_limit`, it fails with a 429. Otherwise, a random draw determines if it fails
+    with a 503 (with probability `error_rate`), or hangs for `hang` seconds before it
+    is handled (with probability `timeout_rate`). A request which hangs is still
+    handled, as the Knack API may handle a request after the client has timed out.
+
+    Args:
+        metadata (dict): Knack application metadata.
+        data (dict, optional): Lists of records, keyed by object key. Defaults to
+            None (no records).
+        latency (float, optional): Seconds to wait before answering each request.
+            Defaults to 0.
+        error_rate (float, optional): The probability that a request fails with a
+            503. Defaults to 0.
+        timeout_rate (float, optional): The probability that a request hangs for
+            `hang` seconds. Defaults to 0.
+        hang (float, optional): The number of seconds for which hanging requests
+            hang. Set this above the client's timeout. Defaults to 5.
+        rate_limit (int, optional): The maximum number of requests per second. If
+            `None`, requests are not limited. Defaults to None.
+        seed (int, optional): The random seed of injected faults. Defaults to 0.
+        host (str, optional): The host to listen on. Defaults to "127.0.0.1".
+        port (int, optional): The port to listen on. Defaults to 0 (any free port).
+    """
+
+    def __init__(
+        self,
+        metadata: dict,
+        data: dict = None,
+        latency: float = 0,
+        error_rate: float = 0,
+        timeout_rate: float = 0,
+        hang: float = 5,
+        rate_limit: int = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.metadata = metadata
+        self.application = metadata["application"]
+        self.data = data if data is not None else {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang = hang
+        self.rate_limit = rate_limit
+        self.requests = []
+        # uploaded assets, keyed by asset ID
+        self.assets = {}
+        self.field_defs = fields.field_defs_from_metadata(self.application)
+        self.timezone = App._get_timezone(self.application["settings"]["timezone"])
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = collections.deque()
+        self._created = 0
+        self._base_url = None
+        self._thread = None
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self.url = "http://{}:{}/v1".format(*self._server.server_address[:2])
+
+    def __repr__(self):
+        return f"<MockServer {self.url}>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Start serving requests in a background thread, and point
+        `knackpy.api.BASE_URL` at the server."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self._base_url = api.BASE_URL
+        api.BASE_URL = self.url
+        return self
+
+    def stop(self):
+        """Stop the server, and restore `knackpy.api.BASE_URL`."""
+        api.BASE_URL = self._base_url
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _fault(self) -> str:
+        """Return the fault, if any, to inject into a request."""
+        with self._lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                while self._recent and self._recent[0] <= now - 1:
+                    self._recent.popleft()
+                if len(self._recent) >= self.rate_limit:
+                    return "rate_limit"
+                self._recent.append(now)
+
+            roll = self._rng.random()
+
+        if roll < self.error_rate:
+            return "error"
+        elif roll < self.error_rate + self.timeout_rate:
+            return "timeout"
+        return None
+
+    def _handle(self, handler):
+        url = urllib.parse.urlsplit(handler.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        path = url.path[len("/v1") :] if url.path.startswith("/v1/") else url.path
+        body = _read_body(handler)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        fault = self._fault()
+
+        if fault == "rate_limit":
+            status, payload = 429, _error("Rate limit exceeded")
+        elif fault == "error":
+            status, payload = 503, _error("Service unavailable")
+        else:
+            if fault == "timeout":
+                time.sleep(self.hang)
+            status, payload = self._route(handler.command, path, query, body, handler)
+
+        self.requests.append(Request(handler.command, url.path, status))
+
+        if isinstance(payload, bytes):
+            content, content_type = payload, "application/octet-stream"
+        else:
+            content, content_type = json.dumps(payload).encode(), "application/json"
+
+        try:
+            handler.send_response(status)
+            handler.send_header("Content-Type", content_type)
+            handler.send_header("Content-Length", str(len(content)))
+            handler.end_headers()
+            handler.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            # the client timed out
+            pass
+
+    def _route(self, method: str, path: str, query: dict, body: bytes, handler):
+        for route_method, pattern, name in ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                try:
+                    return getattr(self, name)(
+                        query=query,
+                        body=body,
+                        headers=handler.headers,
+                        **match.groupdict(),
+                    )
+                except (KeyError, ValueError) as e:
+                    return 400, _error(f"Invalid request: {e}")
+
+        return 404, _error(f"Not found: {method} {path}")
+
+    def _object(self, obj: str) -> dict:
+        matches = [item for item in self.application["objects"] if item["key"] == obj]
+        if not matches:
+            raise KeyError(f"Unknown object: {obj}")
+        return matches[0]
+
+    def _view(self, scene: str, view: str) -> dict:
+        for app_scene in self.application["scenes"]:
+            if app_scene["key"] != scene:
+                continue
+            for scene_view in app_scene["views"]:
+                if scene_view["key"] == view:
+                    return scene_view
+        raise KeyError(f"Unknown view: {scene}/{view}")
+
+    def _find(self, obj: str, record_id: str) -> int:
+        """Return the position of a record in `data`, or `None`."""
+        for position, record in enumerate(self.data.get(obj, [])):
+            if record["id"] == record_id:
+                return position
+        return None
+
+    def _get_metadata(self, app_id: str, **kwargs):
+        if app_id != self.application["id"]:
+            return 404, _error(f"Unknown application: {app_id}")
+        return 200, self.metadata
+
+    def _get_records(self, query: dict, obj=None, scene=None, view=None, **kwargs):
+        columns = None
+
+        if view:
+            view_meta = self._view(scene, view)
+            obj = view_meta["source"]["object"]
+            columns = [column["field"]["key"] for column in view_meta["columns"]]
+
+        self._object(obj)
+        records = self.data.get(obj, [])
+
+        if query.get("filters"):
+            field_defs = [
+                field_def for field_def in self.field_defs if field_def.obj == obj
+            ]
+            match = _filters.matcher(
+                json.loads(query["filters"]), field_defs, self.timezone
+            )
+            records = [record for record in records if match(record)]
+
+        if query.get("sort_field"):
+            records = sorted(
+                records,
+                key=lambda record: _sort_key(record, query["sort_field"]),
+                reverse=query.get("sort_order") == "desc",
+            )
+
+        rows_per_page = min(
+            int(query.get("rows_per_page", DEFAULT_ROWS_PER_PAGE)), MAX_ROWS_PER_PAGE
+        )
+        page = int(query.get("page", 1))
+        page_records = records[(page - 1) * rows_per_page : page * rows_per_page]
+
+        if columns:
+            keys = ["id"] + columns + [f"{column}_raw" for column in columns]
+            page_records = [
+                {key: record[key] for key in keys if key in record}
+                for record in page_records
+            ]
+
+        return 200, {
+            "total_pages": max(1, math.ceil(len(records) / rows_per_page)),
+            "current_page": page,
+            "total_records": len(records),
+            "records": page_records,
+        }
+
+    def _get_record(self, obj: str, record_id: str, **kwargs):
+        self._object(obj)
+        position = self._find(obj, record_id)
+        if position is None:
+            return 404, _error(f"Unknown record: {record_id}")
+        return 200, self.data[obj][position]
+
+    def _value(self, field: dict, value) -> tuple:
+        """Return the `(formatted, raw)` values which Knack stores for a payload
+        value."""
+        if field["type"] == "connection":
+            values = value if isinstance(value, list) else [value]
+            ids = [val["id"] if isinstance(val, dict) else val for val in values if val]
+            formatted = "<br />".join(
+                f'<span class="{record_id}">{record_id}</span>' for record_id in ids
+            )
+            return formatted, [
+                {"id": record_id, "identifier": record_id} for record_id in ids
+            ]
+        elif field["type"] in ["file", "image"] and value in self.assets:
+            asset = self.assets[value]
+            raw = {
+                "id": asset["id"],
+                "application_id": self.application["id"],
+                "s3": False,
+                "type": asset["type"],
+                "filename": asset["filename"],
+                "url": asset["url"],
+                "thumb_url": asset["url"],
+                "size": len(asset["content"]),
+                "field_key": field["key"],
+            }
+            return asset["filename"], raw
+        elif isinstance(value, dict):
+            return " ".join(str(val) for val in value.values() if val), value
+        return value, value
+
+    def _write(self, obj: str, record: dict, payload: dict):
+        for field in self._object(obj)["fields"]:
+            key = field["key"]
+            if key in payload:
+                record[key], record[f"{key}_raw"] = self._value(field, payload[key])
+        return record
+
+    def _create(self, obj: str, body: bytes, **kwargs):
+        payload = json.loads(body or b"{}")
+        blank = {"id": None}
+
+        for field in self._object(obj)["fields"]:
+            blank[field["key"]] = ""
+            blank[f"{field['key']}_raw"] = [] if field["type"] == "connection" else ""
+
+        with self._lock:
+            self._created += 1
+            blank["id"] = f"ffffff{self._created:018x}"
+            record = self._write(obj, blank, payload)
+            self.data.setdefault(obj, []).append(record)
+
+        return 200, record
+
+    def _update(self, obj: str, record_id: str, body: bytes, **kwargs):
+        payload = json.loads(body or b"{}")
+
+        with self._lock:
+            position = self._find(obj, record_id)
+            if position is None:
+                return 404, _error(f"Unknown record: {record_id}")
+            record = self._write(obj, dict(self.data[obj][position]), payload)
+            self.data[obj][position] = record
+
+        return 200, record
+
+    def _delete(self, obj: str, record_id: str, **kwargs):
+        self._object(obj)
+
+        with self._lock:
+            position = self._find(obj, record_id)
+            if position is None:
+                return 404, _error(f"Unknown record: {record_id}")
+            del self.data[obj][position]
+
+        return 200, {"delete": True}
+
+    def _upload(self, app_id: str, asset_type: str, body: bytes, headers, **kwargs):
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        parts = [part for part in message.walk() if part.get_filename()]
+
+        if not parts:
+            return 400, _error("No file was uploaded")
+
+        filename = parts[0].get_filename()
+
+        with self._lock:
+            self._created += 1
+            asset_id = f"eeeeee{self._created:018x}"
+
+        url = f"{self.url}/applications/{app_id}/download/asset/{asset_id}/{filename}"
+        self.assets[asset_id] = {
+            "id": asset_id,
+            "type": asset_type,
+            "filename": filename,
+            "url": url,
+            "content": parts[0].get_payload(decode=True),
+        }
+        return 200, {
+            "id": asset_id,
+            "type": asset_type,
+            "filename": filename,
+            "public_url": url,
+            "size": len(self.assets[asset_id]["content"]),
+        }
+
+    def _download(self, asset_id: str, filename: str, **kwargs):
+        if asset_id in self.assets:
+            return 200, self.assets[asset_id]["content"]
+        # e.g. the assets of synthetic records, which have no content
+        return 200, f"{asset_id}/{filename}".encode()
@@ -0,0 +1,510 @@
+"""Generate synthetic Knack application metadata and records, shaped like those which
+are returned by the Knack API, for testing and benchmarking at scale.
+
+Output is deterministic: the same arguments (including `seed`) always produce the same
+metadata and records. Records are generated lazily, and each record is generated
+independently of the others, so that very large containers (e.g., 1M records) can be
+streamed, or paged through in any order, without being held in memory.
+
+```
+>>> metadata = synthetic.metadata(objects=2, seed=1)
+>>> app = knackpy.App(app_id=metadata["application"]["id"], metadata=metadata)
+>>> app.data["object_1"] = list(synthetic.records(metadata, "object_1", 10000))
+```
+"""
+import datetime
+import random
+import typing
+
+from ..models import MAX_ROWS_PER_PAGE
+
+# one field of each type is generated per object, unless a field count is given
+FIELD_TYPES = [
+    "short_text",
+    "paragraph_text",
+    "rich_text",
+    "number",
+    "currency",
+    "rating",
+    "auto_increment",
+    "boolean",
+    "multiple_choice",
+    "date_time",
+    "timer",
+    "file",
+    "image",
+    "name",
+    "email",
+    "address",
+    "phone",
+    "signature",
+    "link",
+    "connection",
+    "equation",
+    "concatenation",
+]
+
+# the share of non-required field values which are blank
+BLANK_RATE = 0.1
+
+TIMEZONE = "Central Time (US & Canada)"
+
+# the base URL of file and image asset URLs
+BASE_URL = "https://api.knack.com/v1"
+
+# records' dates fall between these dates
+MIN_DATE = datetime.datetime(2015, 1, 1)
+MAX_DATE = datetime.datetime(2025, 1, 1)
+
+WORDS = [
+    "alpha",
+    "bravo",
+    "charlie",
+    "delta",
+    "echo",
+    "foxtrot",
+    "golf",
+    "hotel",
+    "india",
+    "juliett",
+    "kilo",
+    "lima",
+    "mike",
+    "november",
+    "oscar",
+    "papa",
+]
+
+CHOICES = ["Pepperoni", "Extra Cheese", "Jalapeños", "Mushrooms", "Olives"]
+
+CITIES = [
+    ("Austin", "TX", "78701"),
+    ("Houston", "TX", "77002"),
+    ("Tulsa", "OK", "74103"),
+]
+
+
+def _id(rng: random.Random) -> str:
+    """Return a Knack-like (24 character hex) ID."""
+    return f"{rng.getrandbits(96):024x}"
+
+
+def record_id(obj: str, index: int, seed: int = 0) -> str:
+    """Return the record ID of the `index`th record of an object."""
+    return f"{seed % 2 ** 32:08x}{int(obj.split('_')[-1]):04x}{index:012x}"
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _field(key: str, field_type: str, obj: str, relationship: dict = None) -> dict:
+    field = {
+        "type": field_type,
+        "required": False,
+        "unique": False,
+        "user": False,
+        "conditional": False,
+        "rules": [],
+        "validation": [],
+        "key": key,
+        "object_key": obj,
+        "name": f"{field_type.replace('_', ' ').title()} {key.split('_')[-1]}",
+        "_id": key.rjust(24, "0"),
+    }
+
+    if field_type == "multiple_choice":
+        field["format"] = {"options": CHOICES, "type": "single"}
+    elif field_type == "connection":
+        field["relationship"] = relationship
+
+    return field
+
+
+def metadata(
+    objects: int = 1,
+    fields: int = None,
+    records: int = 0,
+    seed: int = 0,
+    timezone: str = TIMEZONE,
+) -> dict:
+    """Generate Knack application metadata.
+
+    Each object has a short text identifier field, followed by fields of each type
+    in `FIELD_TYPES`, in turn. Each object's connection fields connect to the next
+    object (the last object connects to the first). Each object also has a scene
+    with a table view of all of the object's fields.
+
+    Args:
+        objects (int, optional): The number of objects. Defaults to 1.
+        fields (int, optional): The number of fields per object, besides its
+            identifier. Defaults to None (one field of each type).
+        records (int, optional): The number of records per object, as reported in
+            the metadata's counts. Defaults to 0.
+        seed (int, optional): The random seed. Defaults to 0.
+        timezone (str, optional): The app's timezone setting. Defaults to
+            `TIMEZONE`.
+
+    Returns:
+        dict: Knack application metadata.
+    """
+    rng = random.Random(seed)
+    fields = len(FIELD_TYPES) if fields is None else fields
+    app_objects = []
+    scenes = []
+    field_number = 1
+
+    for i in range(objects):
+        obj = f"object_{i + 1}"
+        target = f"object_{(i + 1) % objects + 1}"
+        relationship = {"object": target, "has": "one", "belongs_to": "many"}
+        identifier = f"field_{field_number}"
+        obj_fields = [_field(identifier, "short_text", obj)]
+
+        for j in range(fields):
+            field_number += 1
+            obj_fields.append(
+                _field(
+                    f"field_{field_number}",
+                    FIELD_TYPES[j % len(FIELD_TYPES)],
+                    obj,
+                    relationship,
+                )
+            )
+
+        field_number += 1
+
+        app_objects.append(
+            {
+                "key": obj,
+                "name": f"Object {i + 1}",
+                "identifier": identifier,
+                "type": "StandardObject",
+                "_id": _id(rng),
+                "connections": {
+                    "inbound": [],
+                    "outbound": [
+                        {"object": target, "key": field["key"], "name": field["name"]}
+                        for field in obj_fields
+                        if field["type"] == "connection"
+                    ],
+                },
+                "fields": obj_fields,
+            }
+        )
+
+        scenes.append(
+            {
+                "key": f"scene_{i + 1}",
+                "name": f"Object {i + 1} Records",
+                "slug": f"object-{i + 1}-records",
+                "views": [
+                    {
+                        "key": f"view_{i + 1}",
+                        "name": f"Object {i + 1} Table",
+                        "type": "table",
+                        "source": {"object": obj},
+                        "columns": [
+                            {
+                                "header": field["name"],
+                                "type": "field",
+                                "field": {"key": field["key"]},
+                            }
+                            for field in obj_fields
+                        ],
+                    }
+                ],
+            }
+        )
+
+    return {
+        "application": {
+            "name": "Synthetic App",
+            "id": _id(rng),
+            "slug": "synthetic-app",
+            "account": {"slug": "synthetic"},
+            "settings": {"timezone": timezone},
+            "counts": {
+                **{obj["key"]: records for obj in app_objects},
+                "total_entries": records * objects,
+                "asset_size": 0,
+            },
+            "objects": app_objects,
+            "scenes": scenes,
+        }
+    }
+
+
+def _date_value(moment: datetime.datetime) -> dict:
+    hour = moment.hour % 12 or 12
+    am_pm = "AM" if moment.hour < 12 else "PM"
+    # knack's "unix" timestamps are in local time. see utils.correct_knack_timestamp
+    timestamp = int(moment.replace(tzinfo=datetime.timezone.utc).timestamp() * 1000)
+    return {
+        "date": moment.strftime("%m/%d/%Y"),
+        "date_formatted": moment.strftime("%m/%d/%Y"),
+        "hours": f"{hour:02d}",
+        "minutes": moment.strftime("%M"),
+        "am_pm": am_pm,
+        "unix_timestamp": timestamp,
+        "iso_timestamp": moment.strftime("%Y-%m-%dT%H:%M:00.000Z"),
+        "timestamp": f"{moment.strftime('%m/%d/%Y')} {hour:02d}:{moment:%M} "
+        f"{am_pm.lower()}",
+        "time": moment.hour * 60 + moment.minute,
+    }
+
+
+def _moment(rng: random.Random) -> datetime.datetime:
+    minutes = int((MAX_DATE - MIN_DATE).total_seconds() // 60)
+    return MIN_DATE + datetime.timedelta(minutes=rng.randrange(minutes))
+
+
+def _clock(moment: datetime.datetime) -> str:
+    return f"{moment.hour % 12 or 12}:{moment:%M}{'am' if moment.hour < 12 else 'pm'}"
+
+
+def _asset(rng: random.Random, asset_type: str, context: dict, key: str) -> dict:
+    asset_id = _id(rng)
+    filename = f"{rng.choice(WORDS)}.{'jpg' if asset_type == 'image' else 'pdf'}"
+    url = (
+        f"{context['base_url']}/applications/{context['app_id']}/download/asset/"
+        f"{asset_id}/{filename}"
+    )
+    return {
+        "id": asset_id,
+        "application_id": context["app_id"],
+        "s3": True,
+        "type": asset_type,
+        "filename": filename,
+        "url": url,
+        "thumb_url": url,
+        "size": rng.randrange(1000, 10 ** 7),
+        "field_key": key,
+    }
+
+
+def _value(
+    rng: random.Random, field: dict, index: int, context: dict
+) -> typing.Tuple[object, object]:
+    """Return a `(formatted, raw)` pair of values for a field."""
+    field_type = field["type"]
+
+    if field_type == "short_text":
+        value = f"{rng.choice(WORDS)} {index}"
+        return value, value
+    elif field_type == "paragraph_text":
+        value = _words(rng, rng.randrange(5, 30))
+        return value, value
+    elif field_type == "rich_text":
+        value = f"<p><strong>{_words(rng, 2)}</strong> {_words(rng, 8)}</p>"
+        return value, value
+    elif field_type == "number":
+        value = rng.randrange(10000)
+        return value, value
+    elif field_type == "currency":
+        value = f"{rng.randrange(100000) / 100:.2f}"
+        return f"${float(value):,.2f}", value
+    elif field_type == "rating":
+        value = rng.randrange(6)
+        return f"{value:.2f}", value
+    elif field_type == "auto_increment":
+        return index + 1, index + 1
+    elif field_type == "boolean":
+        value = rng.random() < 0.5
+        return "Yes" if value else "No", value
+    elif field_type == "multiple_choice":
+        value = rng.choice(field["format"]["options"])
+        return value, value
+    elif field_type == "date_time":
+        moment = _moment(rng)
+        return f"{moment:%m/%d/%Y} {_clock(moment)}", _date_value(moment)
+    elif field_type == "timer":
+        start = _moment(rng)
+        end = start + datetime.timedelta(minutes=rng.randrange(1, 480))
+        minutes = int((end - start).total_seconds() // 60)
+        formatted = (
+            f"<span>{start:%m/%d/%y}</span>&nbsp;{_clock(start)} to {_clock(end)} = "
+            f"{minutes // 60}:{minutes % 60:02d} hours"
+        )
+        raw = {
+            "total_time": minutes * 60000,
+            "times": [{"from": _date_value(start), "to": _date_value(end)}],
+        }
+        return formatted, raw
+    elif field_type in ["file", "image"]:
+        raw = _asset(rng, field_type, context, field["key"])
+        if field_type == "image":
+            return f'<img src="{raw["url"]}" />', raw
+        formatted = (
+            f'<a class="kn-view-asset" data-field-key="{field["key"]}" '
+            f'data-asset-id="{raw["id"]}" data-file-name="{raw["filename"]}" '
+            f'href="{raw["url"]}">{raw["filename"]}</a>'
+        )
+        return formatted, raw
+    elif field_type == "name":
+        raw = {
+            "first": rng.choice(WORDS).title(),
+            "middle": rng.choice(WORDS).title(),
+            "last": rng.choice(WORDS).title(),
+        }
+        return f"{raw['last']}, {raw['first']} {raw['middle']}", raw
+    elif field_type == "email":
+        email = f"{rng.choice(WORDS)}.{index}@example.com"
+        return f'<a href="mailto:{email}">{email}</a>', {"email": email}
+    elif field_type == "address":
+        city, state, zip_code = rng.choice(CITIES)
+        raw = {
+            "street": f"{rng.randrange(1, 9999)} {rng.choice(WORDS).title()} St",
+            "street2": f"Suite {rng.randrange(1, 500)}",
+            "city": city,
+            "state": state,
+            "zip": zip_code,
+        }
+        formatted = (
+            f"{raw['street']}<br />{raw['street2']}<br />{city}, {state} {zip_code}"
+        )
+        return formatted, raw
+    elif field_type == "phone":
+        area, number = f"{rng.randrange(200, 999)}", f"{rng.randrange(10 ** 7):07d}"
+        formatted = f"({area}) {number[:3]}-{number[3:]}"
+        raw = {
+            "area": area,
+            "number": number,
+            "full": area + number,
+            "formatted": formatted,
+        }
+        return formatted, raw
+    elif field_type == "signature":
+        base30 = "".join(rng.choice("0123456789abcdefYZ_") for _ in range(120))
+        svg = f"<svg>{base30}</svg>"
+        return f'<img src="data:image/svg+xml;base64,{base30}" />', {
+            "base30": base30,
+            "svg": svg,
+        }
+    elif field_type == "link":
+        url = f"https://example.com/{rng.choice(WORDS)}/{index}"
+        return f'<a href="{url}">{url}</a>', {"url": url}
+    elif field_type == "connection":
+        target = field["relationship"]["object"]
+        target_index = rng.randrange(context["connection_count"])
+        connected_id = record_id(target, target_index, context["seed"])
+        identifier = f"{WORDS[target_index % len(WORDS)]} {target_index}"
+        return (
+            f'<span class="{connected_id}">{identifier}</span>',
+            [{"id": connected_id, "identifier": identifier}],
+        )
+    elif field_type == "equation":
+        value = round(rng.random() * 1000, 8)
+        return round(value, 2), value
+    elif field_type == "concatenation":
+        value = f"{_words(rng, 3)} ({index})"
+        return value, value
+
+    raise ValueError(f"Unsupported field type: '{field_type}'")
+
+
+def _blank(field: dict):
+    return [] if field["type"] == "connection" else ""
+
+
+def records(
+    metadata: dict,
+    obj: str,
+    count: int,
+    seed: int = 0,
+    start: int = 0,
+    connection_count: int = None,
+    base_url: str = BASE_URL,
+) -> typing.Iterator[dict]:
+    """Generate an object's records, with formatted and `_raw` values, as they would
+    be returned by the Knack API.
+
+    Args:
+        metadata (dict): Knack application metadata. See `metadata()`.
+        obj (str): An object key.
+        count (int): The number of records to generate.
+        seed (int, optional): The random seed. Defaults to 0.
+        start (int, optional): The index of the first record to generate, e.g., to
+            generate a single page of a larger container. Defaults to 0.
+        connection_count (int, optional): The number of records in connected objects,
+            from which connected records are chosen. Defaults to `start + count`.
+        base_url (str, optional): The base URL of file and image asset URLs, e.g.
+            a `knackpy.testing.server.MockServer`'s `url`. Defaults to `BASE_URL`.
+
+    Yields:
+        dict: A Knack record.
+    """
+    app = metadata["application"]
+    obj_meta = [item for item in app["objects"] if item["key"] == obj][0]
+    context = {
+        "app_id": app["id"],
+        "seed": seed,
+        "connection_count": connection_count or start + count or 1,
+        "base_url": base_url,
+    }
+    obj_number = int(obj.split("_")[-1])
+
+    for index in range(start, start + count):
+        rng = random.Random(seed * 1000003 + obj_number * 7919 + index)
+        record = {"id": record_id(obj, index, seed)}
+
+        for field in obj_meta["fields"]:
+            key = field["key"]
+
+            if key != obj_meta["identifier"] and rng.random() < BLANK_RATE:
+                record[key] = ""
+                record[f"{key}_raw"] = _blank(field)
+                continue
+
+            formatted, raw = _value(rng, field, index, context)
+            record[key] = formatted
+            record[f"{key}_raw"] = raw
+
+        yield record
+
+
+def pages(
+    metadata: dict,
+    obj: str,
+    count: int,
+    rows_per_page: int = MAX_ROWS_PER_PAGE,
+    seed: int = 0,
+    base_url: str = BASE_URL,
+) -> typing.Iterator[dict]:
+    """Generate the pages of an object's records, as they would be returned by the
+    Knack API.
+
+    Args:
+        metadata (dict): Knack application metadata. See `metadata()`.
+        obj (str): An object key.
+        count (int): The total number of records.
+        rows_per_page (int, optional): The number of records per page. Defaults to
+            `knackpy.models.MAX_ROWS_PER_PAGE`.
+        seed (int, optional): The random seed. Defaults to 0.
+        base_url (str, optional): The base URL of file and image asset URLs.
+            Defaults to `BASE_URL`.
+
+    Yields:
+        dict: A page of Knack records, e.g.: `{"total_pages": 2, "current_page": 1,
+            "total_records": 1500, "records": [...]}`
+    """
+    total_pages = max(1, -(-count // rows_per_page))
+
+    for page in range(1, total_pages + 1):
+        start = (page - 1) * rows_per_page
+        yield {
+            "total_pages": total_pages,
+            "current_page": page,
+            "total_records": count,
+            "records": list(
+                records(
+                    metadata,
+                    obj,
+                    min(rows_per_page, count - start),
+                    seed=seed,
+                    start=start,
+                    connection_count=count,
+                    base_url=base_url,
+                )
+            ),
+        }
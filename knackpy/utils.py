@@ -1,6 +1,18 @@
 import collections
 import datetime
 import math
+import sys
+import types
+
+# types which are never measured by `deep_sizeof`, because they are shared code
+# rather than data
+_CODE_TYPES = (
+    type,
+    types.BuiltinFunctionType,
+    types.FunctionType,
+    types.MethodType,
+    types.ModuleType,
+)
 
 
 def valid_name(key):
@@ -84,3 +96,49 @@ def humanize_bytes(bytes_):
     p = math.pow(1024, i)
     s = round(bytes_ / p, 2)
     return f"{s}{size_name[i]}"
+
+
+def deep_sizeof(obj, seen: set = None, skip: tuple = ()) -> int:
+    """Return the approximate number of bytes held by an object and everything it
+    references: the contents of dicts, lists, tuples and sets, and the attributes
+    of other objects.
+
+    Args:
+        obj (object): The object to measure.
+        seen (set, optional): The IDs of objects which have already been measured,
+            and so are not measured again. It is updated with the IDs of the objects
+            which are measured. Defaults to None.
+        skip (tuple, optional): Types which are not measured, e.g. objects which are
+            shared with other containers. Defaults to ().
+
+    Returns:
+        int: The number of bytes.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+
+    while stack:
+        item = stack.pop()
+
+        if id(item) in seen or isinstance(item, skip + _CODE_TYPES):
+            continue
+
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+
+        if isinstance(item, (str, bytes, int, float, type(None))):
+            continue
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+
+    return size
@@ -40,10 +40,11 @@ def build_config(env, readme="README.md"):
         "long_description": long_description,
         "long_description_content_type": "text/markdown",
         "install_requires": ["pytz", "requests"],
+        "extras_require": {"orjson": ["orjson"]},
         "keywords": "knack api api-client integration python",
         "license": "Public Domain",
         "name": package_name,
-        "packages": ["knackpy"],
+        "packages": ["knackpy", "knackpy.testing"],
         "tests_require": ["pytest", "coverage"],
         "url": "http://github.com/cityofaustin/knackpy",
         "version": "1.1.1",
@@ -284,3 +284,153 @@ def test_update_record_state_delete(app_static):
         len([record for record in app_static.records[OBJ] if record["id"] == record_id])
         == 0
     )
+
+
+def test_get_shard_by_non_date_field_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.get(OBJ, refresh=True, shard_by="field_7")
+
+
+def test_get_shard_by_with_record_limit_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.get(OBJ, refresh=True, shard_by="field_12", record_limit=1)
+
+
+def test_get_include_connected_objects(app_static, monkeypatch):
+    fetched = []
+
+    def fetch(container, **kwargs):
+        fetched.append(container.obj)
+        return []
+
+    monkeypatch.setattr(app_static, "_fetch", fetch)
+    app_static.get(OBJ, include=["field_128"])
+    assert fetched == ["object_7"]
+    assert app_static.data["object_7"] == []
+
+
+def test_get_include_non_connection_field_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.get(OBJ, include=["field_7"])
+
+
+def test_update_record_state_update_in_place(app_static):
+    records = app_static.get(OBJ)
+    record = dict(app_static.data[OBJ][2], field_7="changed", field_7_raw="changed")
+    app_static._update_record_state(record, OBJ, "update")
+    assert app_static.records[OBJ] is records
+    assert app_static.data[OBJ][2]["field_7_raw"] == "changed"
+    assert records[2]["field_7"] == "changed"
+
+
+def test_update_record_state_updates_indexes(app_static):
+    records = app_static.get(OBJ)
+    index = app_static.index(OBJ, "field_7")
+    record = dict(app_static.data[OBJ][0], field_7_raw="changed")
+    app_static._update_record_state(record, OBJ, "update")
+    assert index.source is records
+    assert app_static.lookup(OBJ, "field_7", "hello") == []
+    assert app_static.lookup(OBJ, "field_7", "changed") == [records[0]]
+
+
+def test_update_record_state_delete_many(app_static):
+    app_static.get(OBJ)
+    app_static.index(OBJ, "id")
+    record_ids = [record["id"] for record in app_static.data[OBJ]]
+
+    for record_id in record_ids[::2]:
+        app_static._update_record_state({"delete": True}, OBJ, "delete", record_id)
+
+    remaining = set(record_ids[1::2])
+    assert {record["id"] for record in app_static.data[OBJ]} == remaining
+    assert [record["id"] for record in app_static.records[OBJ]] == [
+        record["id"] for record in app_static.data[OBJ]
+    ]
+    assert all(app_static.lookup(OBJ, "id", record_id) for record_id in remaining)
+    assert not app_static.lookup(OBJ, "id", record_ids[0])
+
+
+def test_update_record_state_generated_records(app_static):
+    app_static.get(OBJ, generate=True)
+    record = dict(app_static.data[OBJ][0], id="abc123")
+    app_static._update_record_state(record, OBJ, "create")
+    assert OBJ not in app_static.records
+    assert len(app_static.get(OBJ)) == 26
+
+
+def test_memory_usage(app_static):
+    usage = app_static.memory_usage(OBJ)
+    assert usage["records"] == 25
+    assert usage["record_objects"] == 0
+    assert usage["data_bytes"] > 0
+    assert usage["total_bytes"] == sum(
+        usage[key] for key in ["data_bytes", "records_bytes", "index_bytes"]
+    )
+
+    records = app_static.get(OBJ)
+    app_static.index(OBJ, "field_7")
+    usage = app_static.memory_usage()[OBJ]
+    assert usage["record_objects"] == 25
+    assert usage["fields"] == sum(len(record.fields) for record in records)
+    assert usage["records_bytes"] > 0
+    assert usage["index_bytes"] > 0
+    assert usage["total_bytes"] == sum(
+        usage[key] for key in ["data_bytes", "records_bytes", "index_bytes"]
+    )
+
+
+def test_memory_usage_generated_records(app_static):
+    app_static.get(OBJ, generate=True)
+    usage = app_static.memory_usage(OBJ)
+    assert usage["record_objects"] is None
+    assert usage["fields"] == 0
+
+
+def test_memory_usage_sample(app_static):
+    app_static.get(OBJ)
+    usage = app_static.memory_usage(OBJ)
+    sampled = app_static.memory_usage(OBJ, sample=5)
+    assert sampled["records"] == usage["records"]
+    assert 0.5 < sampled["data_bytes"] / usage["data_bytes"] < 2
+
+
+def test_deep_sizeof_shared():
+    shared = "x" * 1000
+    seen = set()
+    first = knackpy.utils.deep_sizeof([shared], seen)
+    second = knackpy.utils.deep_sizeof([shared], seen)
+    assert first > 1000 > second
+
+
+def test_get_as_dicts(app_static):
+    dicts = app_static.get(OBJ, as_dicts=True)
+    assert len(dicts) == 25
+    assert all(type(record) is dict for record in dicts)
+    assert OBJ not in app_static.records
+    assert dicts == [
+        record.format(keys=False, values=False) for record in app_static.get(OBJ)
+    ]
+    # records which have already been built are not returned
+    assert type(app_static.get(OBJ, as_dicts=True)[0]) is dict
+
+
+def test_get_as_dicts_formatted_generate(app_static):
+    dicts = app_static.get(OBJ, as_dicts=True, formatted=True, generate=True)
+    assert isinstance(dicts, types.GeneratorType)
+    assert list(dicts) == [record.format() for record in app_static.get(OBJ)]
+
+
+def test_update_record_state_delete_keeps_order(app_static):
+    records = app_static.get(OBJ)
+    record_ids = [record["id"] for record in app_static.data[OBJ]]
+    app_static._update_record_state({"delete": True}, OBJ, "delete", record_ids[3])
+    del record_ids[3]
+    assert [record["id"] for record in app_static.data[OBJ]] == record_ids
+    assert [record["id"] for record in records] == record_ids
+    # later records are still found by position
+    record = dict(app_static.data[OBJ][10], field_7_raw="changed")
+    app_static._update_record_state(record, OBJ, "update")
+    assert records[10]["field_7"] == "changed"
+    assert app_static._positions(OBJ) == {
+        record_id: position for position, record_id in enumerate(record_ids)
+    }
@@ -0,0 +1,188 @@
+import json
+import time
+
+import knackpy
+import pytest
+import requests
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app_static():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())["records"]
+
+    app = knackpy.app.App(
+        app_id=metadata["application"]["id"],
+        api_key="abc",
+        metadata=metadata,
+        rate_limit=None,
+    )
+    app.data = {OBJ: data}
+    return app
+
+
+@pytest.fixture
+def fake_record(app_static, monkeypatch):
+    sent = []
+
+    def record(**kwargs):
+        data = kwargs["data"]
+        sent.append((kwargs["method"], data))
+        if data.get("field_7") == "fail":
+            raise requests.exceptions.HTTPError("400 Client Error")
+        res = {**app_static.data[OBJ][1], "id": f"new_{len(sent)}", **data}
+        res.update({f"{key}_raw": val for key, val in data.items() if key != "id"})
+        return res
+
+    monkeypatch.setattr(knackpy.api, "record", record)
+    return sent
+
+
+def test_rate_limiter():
+    limiter = knackpy.bulk.RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.wait()
+    assert time.monotonic() - start >= 0.1
+
+
+def test_rate_limiter_unlimited():
+    limiter = knackpy.bulk.RateLimiter(None)
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+    assert time.monotonic() - start < 0.1
+
+
+def test_upsert(app_static, fake_record):
+    rows = [
+        # the "id" field, which is unique. unchanged
+        {"field_125": "1", "field_7": "hello"},
+        # changed
+        {"field_125": "3", "field_7": "goodbye"},
+        # new
+        {"field_125": "9999", "field_7": "new"},
+    ]
+    results = app_static.upsert(OBJ, rows, "field_125")
+    assert [result.method for result in results] == [None, "update", "create"]
+    assert all(result.error is None for result in results)
+    assert sorted(method for method, data in fake_record) == ["create", "update"]
+    assert ("update", {"id": app_static.data[OBJ][1]["id"], "field_7": "goodbye"}) in (
+        fake_record
+    )
+    assert app_static.lookup(OBJ, "field_125", "9999")
+
+
+def test_upsert_reports_errors(app_static, fake_record):
+    rows = [{"field_125": "9998", "field_7": "fail"}, {"field_125": "9999"}]
+    results = app_static.upsert(OBJ, rows, "field_125")
+    assert isinstance(results[0].error, requests.exceptions.HTTPError)
+    assert results[1].method == "create" and results[1].error is None
+
+
+def test_upsert_view_fail(app_static):
+    view = [container for container in app_static.containers if container.view][0]
+    with pytest.raises(ValueError):
+        app_static.upsert(view.view, [], "field_125")
+
+
+def test_records_many_delete(app_static, fake_record):
+    record_ids = [record["id"] for record in app_static.data[OBJ][:20]]
+    results = app_static.records_many("delete", OBJ, iter(record_ids), workers=3)
+    assert [result.data["id"] for result in results] == record_ids
+    assert [result.index for result in results] == list(range(20))
+    assert len(app_static.data[OBJ]) == 5
+
+
+def test_records_many_collects_errors(app_static, fake_record):
+    payloads = [{"field_7": "ok"}, {"field_7": "fail"}, {"field_7": "ok"}]
+    results = app_static.records_many("create", OBJ, payloads)
+    assert [result.error is None for result in results] == [True, False, True]
+    assert len(app_static.data[OBJ]) == 27
+
+
+def test_records_many_unknown_method_fail(app_static):
+    with pytest.raises(TypeError):
+        app_static.records_many("upsert", OBJ, [])
+
+
+def test_upsert_duplicate_rows(app_static, fake_record):
+    rows = [
+        {"field_125": "9999", "field_7": "a"},
+        {"field_125": "3", "field_7": "goodbye"},
+        {"field_125": " 9999", "field_7": "b"},
+    ]
+    results = app_static.upsert(OBJ, rows, "field_125")
+    assert isinstance(results[0].error, ValueError)
+    assert isinstance(results[2].error, ValueError)
+    assert results[1].method == "update" and results[1].error is None
+    assert [method for method, data in fake_record] == ["update"]
+
+
+def test_upsert_normalizes_keys(app_static, fake_record):
+    # field_125 is a text field whose values are strings, and field_10 a number
+    # field whose values are numbers
+    rows = [{"field_125": 3, "field_7": "goodbye"}]
+    results = app_static.upsert(OBJ, rows, "field_125")
+    assert results[0].method == "update"
+    record_id = app_static.data[OBJ][1]["id"]
+    assert results[0].data == {"id": record_id, "field_7": "goodbye"}
+    record = app_static.data[OBJ][2]
+    results = app_static.upsert(
+        OBJ, [{"field_10": str(record["field_10_raw"]), "field_7": "x"}], "field_10"
+    )
+    assert results[0].method == "update"
+    assert fake_record[-1][1]["id"] == record["id"]
+
+
+def test_records_many_collects_other_errors(app_static, monkeypatch):
+    # `api.record` raises a KeyError when an update has no record ID
+    monkeypatch.setattr(knackpy.api, "record", lambda **kwargs: kwargs["data"]["id"])
+    results = app_static.records_many("update", OBJ, [{"field_7": "no id"}])
+    assert isinstance(results[0].error, KeyError)
+
+
+def test_write_many_closes_session(app_static, fake_record, monkeypatch):
+    sessions = []
+    session = knackpy.bulk.session
+
+    def tracked_session(workers):
+        sessions.append(session(workers))
+        return sessions[-1]
+
+    monkeypatch.setattr(knackpy.bulk, "session", tracked_session)
+    closed = []
+    writes = ((index, "create", {"field_7": "ok"}) for index in range(10))
+    results = app_static._write_many(OBJ, writes, 2)
+    next(results)
+    monkeypatch.setattr(sessions[0], "close", lambda: closed.append(True))
+    results.close()
+    assert closed == [True]
+
+
+def test_upsert_field_names(app_static, fake_record):
+    # field_125 is named "_id", and field_7 "Short Text"
+    rows = [
+        {"_id": "9999", "Short Text": "new"},
+        {"_id": "3", "Short Text": "goodbye"},
+    ]
+    results = app_static.upsert(OBJ, rows, "_id")
+    assert [result.method for result in results] == ["create", "update"]
+    assert ("create", {"field_125": "9999", "field_7": "new"}) in fake_record
+    assert ("update", {"id": app_static.data[OBJ][1]["id"], "field_7": "goodbye"}) in (
+        fake_record
+    )
+    assert app_static.lookup(OBJ, "field_125", "9999")
+
+
+def test_upsert_unknown_field(app_static, fake_record):
+    rows = [{"field_125": "9999", "nope": "x"}, {"field_125": "9998"}]
+    results = app_static.upsert(OBJ, rows, "field_125")
+    assert isinstance(results[0].error, ValueError)
+    assert results[1].method == "create" and results[1].error is None
+    assert fake_record == [("create", {"field_125": "9998"})]
@@ -0,0 +1,109 @@
+import time
+
+import knackpy
+from knackpy import cassette
+from knackpy.testing import server, synthetic
+import pytest
+import requests
+
+OBJ = "object_1"
+
+
+@pytest.fixture
+def metadata():
+    return synthetic.metadata(seed=1)
+
+
+@pytest.fixture
+def data(metadata):
+    return {OBJ: list(synthetic.records(metadata, OBJ, 1500))}
+
+
+@pytest.fixture
+def recorded(metadata, data, tmp_path, monkeypatch):
+    """Record a metadata request and a paginated fetch from a slow mock server, and
+    return the recording's path and the fetched records."""
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    path = str(tmp_path / "cassette.json")
+    app_id = metadata["application"]["id"]
+
+    with server.MockServer(metadata, data=data, latency=0.1, error_rate=0.3, seed=2):
+        with cassette.Cassette(path, mode="record"):
+            knackpy.api.get_metadata(app_id=app_id)
+            records = knackpy.api.get(app_id=app_id, obj=OBJ, max_attempts=10)
+
+    return path, records
+
+
+def test_record(recorded):
+    path, records = recorded
+    recording = cassette.Cassette(path)
+    recording.load()
+    statuses = [interaction["status"] for interaction in recording.interactions]
+    assert len(records) == 1500
+    assert statuses.count(200) == 3
+    assert 503 in statuses
+    assert knackpy.api.CASSETTE is None
+
+
+def test_replay(recorded, metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    path, records = recorded
+    app_id = metadata["application"]["id"]
+
+    with cassette.Cassette(path):
+        assert knackpy.api.get_metadata(app_id=app_id) == metadata
+        assert knackpy.api.get(app_id=app_id, obj=OBJ, max_attempts=10) == records
+
+
+def test_replay_stream(recorded, metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    path, records = recorded
+    app_id = metadata["application"]["id"]
+
+    with cassette.Cassette(path):
+        knackpy.api.get_metadata(app_id=app_id)
+        streamed = knackpy.api.get(app_id=app_id, obj=OBJ, max_attempts=10, stream=True)
+        assert list(streamed) == records
+
+
+def test_replay_speed(recorded, metadata):
+    path, records = recorded
+    app_id = metadata["application"]["id"]
+
+    with cassette.Cassette(path, speed=None):
+        start = time.perf_counter()
+        knackpy.api.get_metadata(app_id=app_id)
+        assert time.perf_counter() - start < 0.1
+
+    with cassette.Cassette(path, speed=1):
+        start = time.perf_counter()
+        knackpy.api.get_metadata(app_id=app_id)
+        assert time.perf_counter() - start >= 0.1
+
+
+def test_replay_exhausted(recorded, metadata):
+    path, records = recorded
+    app_id = metadata["application"]["id"]
+
+    with cassette.Cassette(path):
+        knackpy.api.get_metadata(app_id=app_id)
+        with pytest.raises(KeyError):
+            knackpy.api.get_metadata(app_id=app_id)
+
+
+def test_replay_timeout(metadata, data, tmp_path, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    path = str(tmp_path / "cassette.json.gz")
+    app_id = metadata["application"]["id"]
+
+    for mode in ["record", "replay"]:
+        with server.MockServer(metadata, data=data, timeout_rate=1, hang=0.3):
+            with cassette.Cassette(path, mode=mode):
+                with pytest.raises(requests.exceptions.Timeout):
+                    knackpy.api.get_metadata(app_id=app_id, timeout=0.1, max_attempts=2)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        cassette.Cassette("cassette.json", mode="rewind")
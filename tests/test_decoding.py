@@ -0,0 +1,68 @@
+import json
+
+import knackpy
+import pytest
+
+
+def test_backend():
+    assert knackpy.decoding.BACKEND in ["orjson", "json"]
+
+
+def test_loads_bytes():
+    with open("tests/_all_fields.json", "rb") as fin:
+        content = fin.read()
+    assert knackpy.decoding.loads(content) == json.loads(content)
+
+
+def test_default_headers_request_gzip():
+    assert "gzip" in knackpy.api.DEFAULT_HEADERS["Accept-Encoding"]
+
+
+@pytest.fixture
+def page():
+    with open("tests/_all_fields.json", "r") as fin:
+        records = json.loads(fin.read())["records"]
+    # include a multi-byte character, which may be split across chunks
+    records[0]["field_7"] = "café ☕"
+    return {
+        "total_pages": 1,
+        "current_page": 1,
+        "total_records": len(records),
+        "records": records,
+    }
+
+
+def chunk(content, size):
+    return (content[i : i + size] for i in range(0, len(content), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1000000])
+def test_record_page(page, chunk_size):
+    content = json.dumps(page, indent=1).encode("utf-8")
+    record_page = knackpy.decoding.RecordPage(chunk(content, chunk_size))
+    assert list(record_page) == page["records"]
+    assert record_page.meta["total_records"] == page["total_records"]
+
+
+def test_record_page_records_first(page):
+    content = json.dumps({"records": page["records"], "total_records": 25}).encode()
+    record_page = knackpy.decoding.RecordPage(chunk(content, 100))
+    assert len(list(record_page)) == 25
+    assert record_page.meta == {"total_records": 25}
+
+
+def test_record_page_empty():
+    record_page = knackpy.decoding.RecordPage([b'{"total_records": 0, "records": []}'])
+    assert list(record_page) == []
+    assert record_page.meta == {"total_records": 0}
+
+
+def test_record_page_missing_records():
+    with pytest.raises(ValueError):
+        list(knackpy.decoding.RecordPage([b'{"message": "nope"}']))
+
+
+def test_record_page_truncated(page):
+    content = json.dumps(page).encode()[:-500]
+    with pytest.raises(ValueError):
+        list(knackpy.decoding.RecordPage(chunk(content, 100)))
@@ -0,0 +1,113 @@
+import json
+
+import knackpy
+import pytest
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app_static():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())["records"]
+
+    app = knackpy.app.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+    app.data = {OBJ: data}
+    return app
+
+
+@pytest.fixture
+def record_id(app_static):
+    return app_static.data[OBJ][0]["id"]
+
+
+@pytest.mark.parametrize(
+    "field,value",
+    [
+        ("field_7", "hello"),
+        ("field_10", "100"),
+        ("field_30", "$100.43"),
+        ("field_29", "Yes"),
+        ("field_6", "Extra Cheese"),
+        ("field_12", "09/11/2019"),
+        ("field_14", "01/01/2012 4:14pm"),
+        ("field_128", "5ea46ad2b6ce4b0015000ae8"),
+        ("field_128", ["5ea46ad2b6ce4b0015000ae8"]),
+        ("field_19", {"first": "Pizza", "last": "the Hut"}),
+        ("field_20", "pizzathehut@spaceballs.com"),
+        ("field_21", {"city": "Austin", "state": "TX"}),
+        ("field_15", {"date": "09/11/2019 4:14pm", "to": "09/11/2019 5:14pm"}),
+        ("field_15", {"date": "09/11/2019 4:14pm"}),
+    ],
+)
+def test_diff_unchanged(app_static, record_id, field, value):
+    assert app_static.diff(OBJ, {"id": record_id, field: value}) == {}
+
+
+@pytest.mark.parametrize(
+    "field,value",
+    [
+        ("field_7", "goodbye"),
+        ("field_10", 101),
+        ("field_29", False),
+        ("field_12", "09/12/2019"),
+        ("field_14", "01/01/2012"),
+        ("field_128", []),
+        ("field_19", {"first": "Pizza", "last": "the Hutt"}),
+        ("field_15", {"date": "09/11/2019 4:14pm", "to": "09/11/2019 6:14pm"}),
+    ],
+)
+def test_diff_changed(app_static, record_id, field, value):
+    assert app_static.diff(OBJ, {"id": record_id, field: value}) == {field: value}
+
+
+def test_diff_by_field_name(app_static, record_id):
+    field_name = app_static._find_container_field_def(OBJ, "field_7").name
+    assert app_static.diff(OBJ, {"id": record_id, field_name: "bye"}) == {
+        "field_7": "bye"
+    }
+
+
+def test_diff_unknown_record_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.diff(OBJ, {"id": "abc123", "field_7": "hello"})
+
+
+def test_record_only_changed(app_static, record_id, monkeypatch):
+    sent = []
+
+    def record(**kwargs):
+        sent.append(kwargs["data"])
+        return dict(app_static.data[OBJ][0], **kwargs["data"])
+
+    monkeypatch.setattr(knackpy.api, "record", record)
+    payload = {"id": record_id, "field_7": "hello", "field_10": 5}
+
+    app_static.record(data=payload, method="update", obj=OBJ, only_changed=True)
+    assert sent == [{"id": record_id, "field_10": 5}]
+
+    res = app_static.record(
+        data={"id": record_id, "field_7": "hello"},
+        method="update",
+        obj=OBJ,
+        only_changed=True,
+    )
+    assert len(sent) == 1
+    assert res["id"] == record_id
+
+
+def test_record_only_changed_returns_copy(app_static, record_id, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "record", lambda **kwargs: pytest.fail())
+    res = app_static.record(
+        data={"id": record_id, "field_7": "hello"},
+        method="update",
+        obj=OBJ,
+        only_changed=True,
+    )
+    res["field_7"] = "mutated"
+    assert app_static.data[OBJ][0]["field_7"] == "hello"
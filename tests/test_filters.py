@@ -0,0 +1,103 @@
+import json
+
+import knackpy
+import pytest
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app_static():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())["records"]
+
+    app = knackpy.app.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+    app.data = {OBJ: data}
+    return app
+
+
+def rule(field, operator, value=None):
+    return {"field": field, "operator": operator, "value": value}
+
+
+def test_filter_is(app_static):
+    records = app_static.filter(OBJ, [rule("field_7", "is", "HELLO")])
+    assert [record["field_7"] for record in records] == ["hello"]
+
+
+def test_filter_contains(app_static):
+    records = app_static.filter(OBJ, [rule("field_7", "contains", "short text")])
+    assert len(records) == 2
+
+
+def test_filter_higher_than(app_static):
+    records = app_static.filter(OBJ, [rule("field_10", "higher than", 99)])
+    assert sorted(record["field_10"] for record in records) == [100, 2555]
+
+
+def test_filter_is_before(app_static):
+    records = app_static.filter(OBJ, [rule("field_12", "is before", "09/12/2019")])
+    assert len(records) == 2
+
+
+def test_filter_is_blank(app_static):
+    blank = app_static.filter(OBJ, [rule("field_7", "is blank")])
+    not_blank = app_static.filter(OBJ, [rule("field_7", "is not blank")])
+    assert len(blank) + len(not_blank) == len(app_static.get(OBJ))
+    assert len(not_blank) == 3
+
+
+def test_filter_connection(app_static):
+    records = app_static.filter(
+        OBJ, [rule("field_128", "is", "5ea46ad2b6ce4b0015000ae8")]
+    )
+    assert len(records) == 1
+
+
+def test_filter_boolean(app_static):
+    assert not app_static.filter(OBJ, [rule("field_29", "is", "No")])
+
+
+def test_filter_match_or(app_static):
+    filters = {
+        "match": "or",
+        "rules": [rule("field_6", "is", "Mushrooms"), rule("field_10", "is", 100)],
+    }
+    assert len(app_static.filter(OBJ, filters)) == 2
+
+
+def test_filter_nested_groups(app_static):
+    filters = {
+        "match": "and",
+        "rules": [
+            rule("field_7", "is not blank"),
+            {
+                "match": "or",
+                "rules": [
+                    rule("field_10", "lower than", 1),
+                    rule("field_6", "is any", ["Extra Cheese", "Mushrooms"]),
+                ],
+            },
+        ],
+    }
+    assert len(app_static.filter(OBJ, filters)) == 3
+
+
+def test_filter_generated_records(app_static):
+    app_static.get(OBJ, generate=True)
+    assert len(app_static.filter(OBJ, [rule("field_7", "is", "hello")])) == 1
+
+
+def test_filter_unknown_field_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.filter(OBJ, [rule("field_99999", "is", "hello")])
+
+
+def test_filter_unknown_operator_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.filter(OBJ, [rule("field_7", "is sort of", "hello")])
@@ -0,0 +1,107 @@
+import io
+
+import knackpy
+from knackpy import hooks
+from knackpy.testing import server, synthetic
+import pytest
+import requests
+
+OBJ = "object_1"
+
+
+@pytest.fixture
+def metadata():
+    return synthetic.metadata(seed=1)
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def app(metadata, events, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    data = {OBJ: list(synthetic.records(metadata, OBJ, 1500))}
+    with server.MockServer(metadata, data=data, error_rate=0.3, seed=2):
+        yield knackpy.App(
+            app_id=metadata["application"]["id"],
+            api_key="abc",
+            max_attempts=10,
+            hooks=[events.append],
+        )
+
+
+def test_route_type():
+    base = "https://api.knack.com/v1"
+    assert hooks.route_type(f"{base}/applications/abc") == "metadata"
+    assert hooks.route_type(f"{base}/objects/object_1/records/") == "object"
+    assert hooks.route_type(f"{base}/pages/scene_1/views/view_1/records") == "view"
+    assert hooks.route_type(f"{base}/applications/abc/assets/file/upload") == "asset"
+
+
+def test_metadata_event(app, events):
+    event = events[-1]
+    assert event.name == hooks.REQUEST
+    assert event.route_type == "metadata"
+    assert event.status == 200
+    assert event.page is None
+    assert event.bytes_received > 0
+    assert event.elapsed >= event.wait >= 0
+
+
+def test_paginated_events(app, events):
+    events.clear()
+    app.get(OBJ)
+    requested = [event for event in events if event.name == hooks.REQUEST]
+    retried = [event for event in events if event.name == hooks.RETRY]
+    succeeded = [event for event in requested if event.status == 200]
+    assert [event.page for event in succeeded] == [1, 2]
+    assert all(event.route_type == "object" for event in events)
+    assert len(requested) == len(succeeded) + len(retried)
+    assert all(event.status == 503 and event.error for event in retried)
+    assert all(event.attempt < event.max_attempts for event in retried)
+    assert sum(event.bytes_received for event in succeeded) > 0
+
+
+def test_stream_events(app, events):
+    events.clear()
+    list(knackpy.api.get(app_id=app.app_id, obj=OBJ, stream=True, hooks=app.hooks))
+    assert events
+    assert all(event.download is None for event in events)
+
+
+def test_write_and_upload_events(app, events):
+    events.clear()
+    app.upload(
+        container=OBJ,
+        field="field_13",
+        asset_type="file",
+        file=io.BytesIO(b"hello"),
+        filename="hello.txt",
+    )
+    succeeded = [event for event in events if event.status == 200]
+    assert [event.route_type for event in succeeded] == ["asset", "object"]
+    assert [event.method for event in succeeded] == ["POST", "POST"]
+
+
+def test_timeout_event(metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    events = []
+    with server.MockServer(metadata, timeout_rate=1, hang=0.3):
+        with pytest.raises(requests.exceptions.Timeout):
+            knackpy.api.get_metadata(
+                app_id="abc", timeout=0.1, max_attempts=2, hooks=[events.append]
+            )
+    assert [event.name for event in events] == ["request", "retry", "request"]
+    assert all(event.status is None for event in events)
+    assert all(isinstance(event.error, requests.exceptions.Timeout) for event in events)
+
+
+def test_hook_errors_ignored(metadata):
+    def broken(event):
+        raise RuntimeError("metrics backend unavailable")
+
+    with server.MockServer(metadata):
+        app_id = metadata["application"]["id"]
+        assert knackpy.api.get_metadata(app_id=app_id, hooks=[broken]) == metadata
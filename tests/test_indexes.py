@@ -0,0 +1,104 @@
+import datetime
+import json
+
+import knackpy
+import pytest
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app_static():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())["records"]
+
+    app = knackpy.app.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+    app.data = {OBJ: data}
+    return app
+
+
+def test_lookup(app_static):
+    records = app_static.lookup(OBJ, "field_7", "hello")
+    assert len(records) == 1
+    assert records[0]["field_7"] == "hello"
+
+
+def test_lookup_by_field_name(app_static):
+    field_name = app_static._find_container_field_def(OBJ, "field_7").name
+    assert app_static.lookup(OBJ, field_name, "hello")
+
+
+def test_lookup_missing_value(app_static):
+    assert app_static.lookup(OBJ, "field_7", "nope") == []
+
+
+def test_lookup_blank_not_indexed(app_static):
+    assert app_static.lookup(OBJ, "field_7", "") == []
+
+
+def test_lookup_connection(app_static):
+    record_id = "5ea46ad2b6ce4b0015000ae8"
+    assert len(app_static.lookup(OBJ, "field_128", record_id)) == 1
+    assert len(app_static.lookup(OBJ, "field_128", {"id": record_id})) == 1
+
+
+def test_lookup_many_values_fail(app_static):
+    record_id = "5ea46ad2b6ce4b0015000ae8"
+    with pytest.raises(TypeError):
+        app_static.lookup(OBJ, "field_128", [record_id])
+    with pytest.raises(TypeError):
+        app_static.lookup(OBJ, "field_128", (record_id,))
+
+
+def test_lookup_number(app_static):
+    assert len(app_static.lookup(OBJ, "field_10", 0)) == 23
+
+
+def test_index_unknown_field_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.index(OBJ, "field_99999")
+
+
+def test_index_follows_record_state(app_static):
+    app_static.lookup(OBJ, "field_7", "hello")
+    new_record = dict(app_static.data[OBJ][1], id="abc123", field_7_raw="hello")
+    app_static._update_record_state(new_record, OBJ, "create")
+    assert len(app_static.lookup(OBJ, "field_7", "hello")) == 2
+
+    app_static._update_record_state({"delete": True}, OBJ, "delete", "abc123")
+    assert len(app_static.lookup(OBJ, "field_7", "hello")) == 1
+
+
+def test_range_date_time(app_static):
+    records = app_static.range(
+        OBJ, "field_13", datetime.datetime(2020, 8, 1), datetime.datetime(2020, 9, 1)
+    )
+    assert len(records) == 11
+    timestamps = [record.raw["field_13_raw"]["unix_timestamp"] for record in records]
+    assert timestamps == sorted(timestamps)
+
+
+def test_range_is_half_open(app_static):
+    records = app_static.range(OBJ, "field_13")
+    first = records[0].raw["field_13_raw"]["unix_timestamp"]
+    assert app_static.range(OBJ, "field_13", end=first) == []
+    assert app_static.range(OBJ, "field_13", start=first)[0] is records[0]
+
+
+def test_range_number(app_static):
+    records = app_static.range(OBJ, "field_10", 1, 3000)
+    assert [record["field_10"] for record in records] == [100, 2555]
+
+
+def test_range_currency(app_static):
+    assert len(app_static.range(OBJ, "field_30", start=100)) == 1
+
+
+def test_range_non_sortable_field_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.range(OBJ, "field_7", 1, 2)
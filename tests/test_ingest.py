@@ -0,0 +1,78 @@
+import copy
+import json
+
+import knackpy
+import pytest
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())
+        data = data["records"]
+
+    app = knackpy.App(app_id=metadata["application"]["id"], metadata=metadata)
+    app.data = {OBJ: data}
+    return app
+
+
+@pytest.fixture
+def field_defs(app):
+    return app._container_field_defs(OBJ)
+
+
+def test_strip_formatted_keys(app, field_defs):
+    strip = knackpy.ingest.strip_formatted_keys(field_defs)
+    record = strip(copy.deepcopy(app.data[OBJ][0]))
+    # dropped: redundant formatted value
+    assert "field_8" not in record and "field_8_raw" in record
+    # kept: use_knack_format field types and the identifier field
+    assert "field_19" in record and "field_16" in record and "field_6" in record
+    assert "id" in record
+
+
+def test_strip_formatted_keys_records_unchanged(app, field_defs):
+    strip = knackpy.ingest.strip_formatted_keys(field_defs)
+    stripped = [strip(record) for record in copy.deepcopy(app.data[OBJ])]
+    expected = [record.format() for record in app.get(OBJ)]
+    app.data[OBJ] = stripped
+    actual = app._records(OBJ)
+    assert [repr(record) for record in actual]
+    assert [record.format() for record in actual] == expected
+
+
+def test_interner_values_equal(app, field_defs):
+    interner = knackpy.ingest.Interner(field_defs)
+    records = copy.deepcopy(app.data[OBJ])
+    assert [interner(record) for record in records] == app.data[OBJ]
+
+
+def test_interner_shares_values(app, field_defs):
+    interner = knackpy.ingest.Interner(field_defs)
+    # copy.deepcopy does not copy strs, so we decode new ones, as if from two pages
+    content = json.dumps(app.data[OBJ][0])
+    first, second = [interner(json.loads(content)) for i in range(2)]
+    # field_6 is a multiple choice field
+    assert first["field_6_raw"] is second["field_6_raw"]
+    assert first["field_128_raw"][0]["id"] is second["field_128_raw"][0]["id"]
+    assert [key for key in first][5] is [key for key in second][5]
+
+
+def test_interner_skips_high_cardinality_fields(app, field_defs):
+    interner = knackpy.ingest.Interner(field_defs)
+    content = json.dumps(app.data[OBJ][0])
+    first, second = [interner(json.loads(content)) for i in range(2)]
+    # field_7 is a short text field
+    assert first["field_7_raw"] is not second["field_7_raw"]
+
+
+def test_app_intern_values(app):
+    transform = knackpy.App(
+        app_id=app.app_id, metadata={"application": app.metadata}, intern_values=True
+    )._ingest_transform(OBJ)
+    assert transform(copy.deepcopy(app.data[OBJ][0])) == app.data[OBJ][0]
@@ -0,0 +1,98 @@
+import json
+
+import knackpy
+import pytest
+import requests
+
+OBJ = "object_3"
+
+TARGET = "object_7"
+
+CONNECTED_ID = "5ea46ad2b6ce4b0015000ae8"
+
+
+@pytest.fixture
+def app_static():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())["records"]
+
+    app = knackpy.app.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+    app.data = {OBJ: data}
+    return app
+
+
+def target_record(app, record_id):
+    record = {field_def.key: "" for field_def in app._container_field_defs(TARGET)}
+    record["id"] = record_id
+    return record
+
+
+def test_join(app_static):
+    app_static.data[TARGET] = [
+        target_record(app_static, record_id)
+        for record_id in [CONNECTED_ID, "not_connected"]
+    ]
+    rows = app_static.join(OBJ, "field_128")
+    assert len(rows) == len(app_static.data[OBJ])
+    assert [connected[0]["id"] for record, connected in rows if connected] == [
+        CONNECTED_ID
+    ]
+
+
+def test_join_referenced_only(app_static, monkeypatch):
+    requested = []
+
+    def get_record(**kwargs):
+        requested.append(kwargs["record_id"])
+        return target_record(app_static, kwargs["record_id"])
+
+    monkeypatch.setattr(knackpy.api, "get_record", get_record)
+    rows = app_static.join(OBJ, "field_128", referenced_only=True)
+    assert requested == [CONNECTED_ID]
+    assert sum(len(connected) for record, connected in rows) == 1
+    assert TARGET not in app_static.data
+
+
+def test_join_referenced_only_missing(app_static, monkeypatch):
+    def get_record(**kwargs):
+        res = requests.Response()
+        res.status_code = 404
+        raise requests.exceptions.HTTPError(response=res)
+
+    monkeypatch.setattr(knackpy.api, "get_record", get_record)
+    rows = app_static.join(OBJ, "field_128", referenced_only=True)
+    assert len(rows) == len(app_static.data[OBJ])
+    assert all(connected == [] for record, connected in rows)
+
+
+def test_join_referenced_only_error(app_static, monkeypatch):
+    def get_record(**kwargs):
+        res = requests.Response()
+        res.status_code = 403
+        raise requests.exceptions.HTTPError(response=res)
+
+    monkeypatch.setattr(knackpy.api, "get_record", get_record)
+    with pytest.raises(requests.exceptions.HTTPError):
+        app_static.join(OBJ, "field_128", referenced_only=True)
+
+
+def test_join_referenced_only_rate_limited(app_static, monkeypatch):
+    waits = []
+    monkeypatch.setattr(app_static.rate_limiter, "wait", lambda: waits.append(1))
+    monkeypatch.setattr(
+        knackpy.api,
+        "get_record",
+        lambda **kwargs: target_record(app_static, kwargs["record_id"]),
+    )
+    app_static.join(OBJ, "field_128", referenced_only=True)
+    assert waits == [1]
+
+
+def test_join_non_connection_field_fail(app_static):
+    with pytest.raises(ValueError):
+        app_static.join(OBJ, "field_7")
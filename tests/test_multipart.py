@@ -0,0 +1,78 @@
+import io
+
+import knackpy
+import pytest
+import requests
+
+PATH = "tests/plaid.jpg"
+
+
+@pytest.fixture
+def file_bytes():
+    with open(PATH, "rb") as fin:
+        return fin.read()
+
+
+def test_encoder_path_body(file_bytes):
+    with knackpy.multipart.MultipartEncoder(PATH, chunk_size=1024) as encoder:
+        body = encoder.read()
+    assert file_bytes in body
+    assert b'filename="plaid.jpg"' in body
+    assert body.endswith(f"--{encoder.boundary}--\r\n".encode())
+    assert len(body) == encoder.len
+
+
+def test_encoder_small_reads(file_bytes):
+    with knackpy.multipart.MultipartEncoder(PATH, chunk_size=1024) as encoder:
+        body = b"".join(iter(lambda: encoder.read(100), b""))
+    assert len(body) == encoder.len
+    assert file_bytes in body
+
+
+def test_encoder_file_like_sets_content_length(file_bytes):
+    encoder = knackpy.multipart.MultipartEncoder(
+        io.BytesIO(file_bytes), filename="plaid.jpg"
+    )
+    prepped = requests.Request("POST", "http://fake.url", data=encoder).prepare()
+    assert prepped.headers["Content-Length"] == str(encoder.len)
+
+
+def test_encoder_iterable_is_chunked(file_bytes):
+    chunks = (file_bytes[i : i + 500] for i in range(0, len(file_bytes), 500))
+    encoder = knackpy.multipart.MultipartEncoder(chunks, filename="plaid.jpg")
+    prepped = requests.Request("POST", "http://fake.url", data=encoder).prepare()
+    assert encoder.len is None
+    assert prepped.headers["Transfer-Encoding"] == "chunked"
+    assert file_bytes in b"".join(encoder)
+
+
+def test_encoder_iterable_requires_filename():
+    with pytest.raises(TypeError):
+        knackpy.multipart.MultipartEncoder(iter([b"abc"]))
+
+
+def test_encoder_callback_and_rewind():
+    progress = []
+    encoder = knackpy.multipart.MultipartEncoder(
+        PATH, callback=lambda sent, total: progress.append((sent, total))
+    )
+    first = encoder.read()
+    encoder.rewind()
+    second = encoder.read()
+    encoder.close()
+    assert first == second
+    assert progress[-1] == (encoder.len, encoder.len)
+
+
+def test_encoder_iterable_not_rewindable():
+    encoder = knackpy.multipart.MultipartEncoder(iter([b"abc"]), filename="abc.txt")
+    with pytest.raises(ValueError):
+        encoder.rewind()
+
+
+def test_upload_requires_path_or_file():
+    with pytest.raises(TypeError):
+        knackpy.api.upload(
+            app_id="abc", api_key="123", obj="object_1", field="field_1",
+            asset_type="file",
+        )
@@ -0,0 +1,81 @@
+import json
+
+import knackpy
+from knackpy.fields import Field
+from knackpy.plan import Plan
+from knackpy.record import Record
+from knackpy.testing import synthetic
+import pytest
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())
+        data = data["records"]
+
+    app = knackpy.App(app_id=metadata["application"]["id"], metadata=metadata)
+    app.data = {OBJ: data}
+    return app
+
+
+def test_parallel_records(app):
+    serial = app._records(OBJ)
+    records = app.get(OBJ, processes=2)
+    assert all(isinstance(record, Record) for record in records)
+    assert [record.format() for record in records] == [
+        record.format() for record in serial
+    ]
+    assert app.records[OBJ] is records
+
+
+def test_parallel_dicts(app):
+    assert app.get(OBJ, as_dicts=True, processes=2) == app.get(OBJ, as_dicts=True)
+    assert app.get(OBJ, as_dicts=True, formatted=True, processes=2) == app.get(
+        OBJ, as_dicts=True, formatted=True
+    )
+
+
+def test_parallel_pages_in_order(monkeypatch):
+    monkeypatch.setattr(knackpy.parallel, "MAX_ROWS_PER_PAGE", 7)
+    metadata = synthetic.metadata()
+    data = list(synthetic.records(metadata, "object_1", 50))
+    app = knackpy.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+    app.data = {"object_1": data}
+    dicts = app.get("object_1", as_dicts=True, processes=3)
+    assert [record["id"] for record in dicts] == [record["id"] for record in data]
+
+
+def test_parallel_generate_fail(app):
+    with pytest.raises(ValueError):
+        app.get(OBJ, generate=True, processes=2)
+
+
+def test_parallel_records_built_by_workers(app, monkeypatch):
+    # work done in worker processes is not counted in this process
+    calls = []
+
+    def counted(original):
+        def wrapper(*args, **kwargs):
+            calls.append(original.__name__)
+            return original(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(Record, "_handle_record", counted(Record._handle_record))
+    monkeypatch.setattr(Field, "_format", counted(Field._format))
+    monkeypatch.setattr(Plan, "build", counted(Plan.build))
+
+    records = app.get(OBJ, processes=2)
+    assert len(records) == 25
+    assert calls == []
+
+    app._records(OBJ)
+    assert "_handle_record" in calls and "_format" in calls
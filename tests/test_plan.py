@@ -0,0 +1,62 @@
+import copy
+import json
+import warnings
+
+import knackpy
+from knackpy.testing import synthetic
+import pytest
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())
+        data = data["records"]
+
+    app = knackpy.App(app_id=metadata["application"]["id"], metadata=metadata)
+    app.data = {OBJ: data}
+    return app
+
+
+def test_plan_raw(app):
+    plan = knackpy.plan.Plan(app._container_field_defs(OBJ), app.timezone)
+    records = app._records(OBJ)
+    assert [plan(data) for data in app.data[OBJ]] == [
+        record.format(keys=False, values=False) for record in records
+    ]
+
+
+def test_plan_formatted(app):
+    plan = knackpy.plan.Plan(
+        app._container_field_defs(OBJ), app.timezone, formatted=True
+    )
+    records = app._records(OBJ)
+    assert [plan(data) for data in app.data[OBJ]] == [
+        record.format() for record in records
+    ]
+
+
+def test_plan_all_field_types():
+    metadata = synthetic.metadata(fields=len(synthetic.FIELD_TYPES))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        app = knackpy.App(app_id=metadata["application"]["id"], metadata=metadata)
+    app.data = {"object_1": list(synthetic.records(metadata, "object_1", 200))}
+    records = app.get("object_1")
+    assert app.get("object_1", as_dicts=True, formatted=True) == [
+        record.format() for record in records
+    ]
+
+
+def test_plan_leaves_data_untouched(app):
+    plan = knackpy.plan.Plan(app._container_field_defs(OBJ), app.timezone)
+    original = copy.deepcopy(app.data[OBJ])
+    first = [plan(data) for data in app.data[OBJ]]
+    assert app.data[OBJ] == original
+    # timestamps are not corrected twice
+    assert [plan(data) for data in app.data[OBJ]] == first
@@ -0,0 +1,112 @@
+import json
+
+import knackpy
+from knackpy.fields import Field
+from knackpy.testing import server, synthetic
+import pytest
+
+OBJ = "object_3"
+
+
+@pytest.fixture
+def app_static():
+    with open("tests/_metadata.json", "r") as fin:
+        metadata = json.loads(fin.read())
+
+    with open("tests/_all_fields.json", "r") as fin:
+        data = json.loads(fin.read())["records"]
+
+    app = knackpy.app.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+    app.data = {OBJ: data}
+    return app
+
+
+def test_profile_phases(app_static, tmp_path):
+    with knackpy.profile() as prof:
+        app_static.get(OBJ)
+        app_static.to_csv(OBJ, out_dir=str(tmp_path))
+
+    phases = prof.summary()[OBJ]
+    assert phases["record"]["calls"] == 25
+    assert phases["fields"]["calls"] == 25
+    assert phases["format:date_time"]["calls"] == 25 * 5
+    assert phases["export"]["calls"] == 1
+    assert all(phase["wall"] >= 0 for phase in phases.values())
+
+
+def test_profile_exclusive_time(app_static):
+    with knackpy.profile() as prof:
+        app_static.get(OBJ)
+
+    phases = prof.summary()[OBJ]
+    formatting = sum(
+        phase["wall"] for name, phase in phases.items() if name.startswith("format:")
+    )
+    assert phases["fields"]["wall"] > 0
+    assert formatting > 0
+
+
+def test_profile_generated_records(app_static):
+    with knackpy.profile() as prof:
+        records = app_static.get(OBJ, generate=True)
+        assert OBJ not in prof.summary()
+        list(records)
+
+    assert prof.summary()[OBJ]["record"]["calls"] == 25
+
+
+def test_profile_restores(app_static):
+    original = Field._format
+    with knackpy.profile():
+        assert Field._format is not original
+    assert Field._format is original
+    assert knackpy.api._request.__module__ == "knackpy.api"
+
+
+def test_profile_nested():
+    with knackpy.profile():
+        with pytest.raises(RuntimeError):
+            knackpy.profile().start()
+
+
+def test_profile_http():
+    metadata = synthetic.metadata(seed=1)
+    data = {"object_1": list(synthetic.records(metadata, "object_1", 10))}
+
+    with server.MockServer(metadata, data=data, latency=0.05):
+        app = knackpy.App(app_id=metadata["application"]["id"], api_key="abc")
+        with knackpy.profile() as prof:
+            app.get("object_1")
+
+    phases = prof.summary()["object_1"]
+    assert phases["http"]["calls"] == 1
+    assert phases["http"]["wall"] >= 0.05
+    assert phases["decode"]["calls"] == 1
+    assert "object_1" in prof.table()
+
+
+def test_profile_dicts(app_static):
+    with knackpy.profile() as prof:
+        app_static.get(OBJ, as_dicts=True, formatted=True)
+
+    phases = prof.summary()[OBJ]
+    assert phases["dicts"]["calls"] == 25
+    assert "fields" not in phases
+
+
+def test_profile_keyword_arguments(app_static, tmp_path):
+    with knackpy.profile() as prof:
+        app_static.to_csv(identifier=OBJ, out_dir=str(tmp_path))
+        app_static._records(container_key=OBJ)
+
+    phases = prof.summary()[OBJ]
+    assert phases["export"]["calls"] == 1
+    assert phases["record"]["calls"] == 50
+
+
+def test_profile_keeps_errors(app_static):
+    with knackpy.profile():
+        with pytest.raises(IndexError):
+            app_static.to_csv("no such container")
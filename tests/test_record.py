@@ -1,6 +1,7 @@
 import json
 
 import knackpy
+from knackpy.record import Record
 import pytest
 
 OBJ_KEY = "object_3"
@@ -113,3 +114,28 @@ def test_unifom_length(records):
     # one per field def
     for record in records:
         assert len(record.field_defs) == len(record.fields)
+
+
+def test_record_does_not_mutate_data(app):
+    before = json.dumps(app.data[OBJ_KEY], sort_keys=True)
+    app.get(OBJ_KEY)
+    app.get(OBJ_KEY, refresh=False)
+    app.records = {}
+    app.get(OBJ_KEY)
+    assert json.dumps(app.data[OBJ_KEY], sort_keys=True) == before
+
+
+def test_record_from_built(app, records):
+    field_defs = records[0].field_defs
+    plan = knackpy.plan.Plan(field_defs, app.timezone, formatted=True)
+    built = [
+        Record._from_built(
+            data, field_defs, records[0].identifier, app.timezone, *plan.build(data)
+        )
+        for data in app.data[OBJ_KEY]
+    ]
+    assert [record.raw for record in built] == [record.raw for record in records]
+    assert [record.format() for record in built] == [
+        record.format() for record in records
+    ]
+    assert [repr(record) for record in built] == [repr(record) for record in records]
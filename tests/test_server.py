@@ -0,0 +1,182 @@
+import io
+
+import knackpy
+from knackpy.testing import server, synthetic
+import pytest
+import requests
+
+OBJ = "object_1"
+
+
+@pytest.fixture
+def metadata():
+    return synthetic.metadata(objects=2, seed=1)
+
+
+@pytest.fixture
+def mock(metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    with server.MockServer(metadata) as mock:
+        mock.data[OBJ] = list(synthetic.records(metadata, OBJ, 1200, base_url=mock.url))
+        yield mock
+
+
+@pytest.fixture
+def app(metadata, mock):
+    return knackpy.App(app_id=metadata["application"]["id"], api_key="abc")
+
+
+def test_base_url_restored(metadata):
+    with server.MockServer(metadata) as mock:
+        assert knackpy.api.BASE_URL == mock.url
+    assert knackpy.api.BASE_URL is None
+
+
+def test_metadata(app, metadata):
+    assert app.metadata == metadata["application"]
+
+
+def test_get_paginated(app, mock):
+    records = app.get(OBJ)
+    assert len(records) == 1200
+    assert [req.status for req in mock.requests] == [200] * 3
+
+
+def test_get_record_limit(app):
+    assert len(app.get(OBJ, record_limit=10)) == 10
+
+
+def test_get_view(app, mock):
+    view = mock.metadata["application"]["scenes"][0]["views"][0]
+    assert len(app.get(view["key"])) == 1200
+
+
+def test_get_filters(app):
+    filters = {
+        "match": "and",
+        "rules": [{"field": "field_5", "operator": "higher than", "value": 5000}],
+    }
+    expected = app.filter(OBJ, filters)
+    app.records = {}
+    app.data = {}
+    records = app.get(OBJ, filters=filters)
+    assert 0 < len(records) < 1200
+    assert [record["id"] for record in records] == [record["id"] for record in expected]
+
+
+def test_get_sorted(mock):
+    records = knackpy.api.get(
+        app_id="abc", obj=OBJ, record_limit=100, sort_field="field_5", sort_order="desc"
+    )
+    numbers = [record["field_5_raw"] for record in records]
+    assert numbers == sorted(numbers, reverse=True)
+
+
+def test_get_record(app, mock):
+    record_id = mock.data[OBJ][10]["id"]
+    record = knackpy.api.get_record(
+        app_id="abc", api_key="abc", obj=OBJ, record_id=record_id
+    )
+    assert record == mock.data[OBJ][10]
+
+
+def test_get_unknown_record_not_retried(mock):
+    with pytest.raises(requests.exceptions.HTTPError):
+        knackpy.api.get_record(app_id="abc", api_key="abc", obj=OBJ, record_id="nope")
+    assert [req.status for req in mock.requests] == [404]
+
+
+def test_record_crud(app, mock):
+    created = app.record(
+        data={"field_2": "hello", "field_21": "abc"}, method="create", obj=OBJ
+    )
+    assert created["field_2_raw"] == "hello"
+    assert created["field_21_raw"] == [{"id": "abc", "identifier": "abc"}]
+    assert mock.data[OBJ][-1] == created
+
+    updated = app.record(
+        data={"id": created["id"], "field_2": "bye"}, method="update", obj=OBJ
+    )
+    assert updated["field_2"] == "bye"
+    assert updated["field_21_raw"] == created["field_21_raw"]
+
+    app.record(data={"id": created["id"]}, method="delete", obj=OBJ)
+    assert len(mock.data[OBJ]) == 1200
+
+
+def test_update_unknown_record(app):
+    with pytest.raises(requests.exceptions.HTTPError):
+        app.record(data={"id": "nope"}, method="update", obj=OBJ)
+
+
+def test_join_referenced_only_missing(app, mock):
+    # object_2 is empty, so every connected record is missing
+    mock.data["object_2"] = []
+    mock.data[OBJ] = mock.data[OBJ][:10]
+    rows = app.join(OBJ, "field_21", referenced_only=True)
+    assert len(rows) == 10
+    assert all(connected == [] for record, connected in rows)
+    assert 404 in [req.status for req in mock.requests]
+
+
+def test_error_retries(metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    data = {OBJ: list(synthetic.records(metadata, OBJ, 2000))}
+    with server.MockServer(metadata, data=data, error_rate=0.5, seed=3) as mock:
+        records = knackpy.api.get(app_id="abc", obj=OBJ, max_attempts=10)
+    statuses = [req.status for req in mock.requests]
+    assert len(records) == 2000
+    assert 503 in statuses
+    assert statuses.count(200) == 2
+
+
+def test_errors_deterministic(metadata):
+    statuses = []
+    for _ in range(2):
+        with server.MockServer(metadata, error_rate=0.5, seed=3) as mock:
+            for _ in range(10):
+                requests.get(f"{mock.url}/applications/{metadata['application']['id']}")
+        statuses.append([req.status for req in mock.requests])
+    assert statuses[0] == statuses[1]
+    assert set(statuses[0]) == {200, 503}
+
+
+def test_timeout(metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    with server.MockServer(metadata, timeout_rate=1, hang=0.5):
+        with pytest.raises(requests.exceptions.Timeout):
+            knackpy.api.get(app_id="abc", obj=OBJ, timeout=0.1, max_attempts=2)
+
+
+def test_rate_limit(metadata):
+    with server.MockServer(metadata, rate_limit=2) as mock:
+        url = f"{mock.url}/applications/{metadata['application']['id']}"
+        statuses = [requests.get(url).status_code for _ in range(5)]
+    assert statuses[:2] == [200, 200]
+    assert 429 in statuses[2:]
+
+
+def test_latency(metadata):
+    with server.MockServer(metadata, latency=0.2) as mock:
+        res = requests.get(f"{mock.url}/applications/{metadata['application']['id']}")
+    assert res.elapsed.total_seconds() >= 0.2
+
+
+def test_upload_download(app, mock):
+    content = b"hello knackpy" * 1000
+    record = app.upload(
+        container=OBJ,
+        field="field_13",
+        asset_type="file",
+        file=io.BytesIO(content),
+        filename="hello.txt",
+    )
+    asset = record["field_13_raw"]
+    assert asset["filename"] == "hello.txt"
+    assert requests.get(asset["url"]).content == content
+
+
+def test_download_synthetic_asset(mock):
+    record = [record for record in mock.data[OBJ] if record["field_14_raw"]][0]
+    res = requests.get(record["field_14_raw"]["url"])
+    assert res.status_code == 200
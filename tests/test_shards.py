@@ -0,0 +1,53 @@
+import datetime
+
+import knackpy
+import pytest
+
+FIELD = "field_12"
+
+
+def test_parse_date():
+    value = {"date": "09/11/2019", "unix_timestamp": 1568160000000}
+    assert knackpy.shards.parse_date(value) == datetime.date(2019, 9, 11)
+
+
+def test_date_ranges_cover_all_dates():
+    start = datetime.date(2020, 1, 1)
+    end = datetime.date(2020, 12, 31)
+    ranges = knackpy.shards.date_ranges(start, end, 4)
+    assert len(ranges) == 4
+    assert ranges[0][0] is None and ranges[-1][1] is None
+    # each range ends where the next begins
+    for (_, range_end), (range_start, _) in zip(ranges, ranges[1:]):
+        assert range_end == range_start
+
+
+def test_date_ranges_fewer_days_than_shards():
+    day = datetime.date(2020, 1, 1)
+    assert knackpy.shards.date_ranges(day, day, 4) == [(None, None)]
+
+
+def test_shard_filters():
+    ranges = [(None, datetime.date(2020, 1, 5)), (datetime.date(2020, 1, 5), None)]
+    user_filters = {"match": "and", "rules": [{"field": "field_1", "operator": "is"}]}
+    filters = knackpy.shards.shard_filters(FIELD, ranges, user_filters)
+    # one per range, plus one for blank dates
+    assert len(filters) == 3
+    assert filters[0]["rules"][1] == {
+        "field": FIELD,
+        "operator": "is before",
+        "value": "01/05/2020",
+    }
+    assert filters[1]["rules"][1] == {
+        "field": FIELD,
+        "operator": "is after",
+        "value": "01/04/2020",
+    }
+    assert filters[2]["rules"][1]["operator"] == "is blank"
+    assert all(f["rules"][0] == user_filters["rules"][0] for f in filters)
+
+
+def test_shard_filters_or_fail():
+    user_filters = {"match": "or", "rules": [{}, {}]}
+    with pytest.raises(ValueError):
+        knackpy.shards.shard_filters(FIELD, [(None, None)], user_filters)
@@ -0,0 +1,86 @@
+import knackpy
+from knackpy import stats
+from knackpy.testing import server, synthetic
+import pytest
+
+OBJ = "object_1"
+
+
+@pytest.fixture
+def metadata():
+    return synthetic.metadata(seed=1)
+
+
+@pytest.fixture
+def app(metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    data = {OBJ: list(synthetic.records(metadata, OBJ, 1500))}
+    with server.MockServer(metadata, data=data, error_rate=0.3, seed=2):
+        yield knackpy.App(
+            app_id=metadata["application"]["id"], api_key="abc", max_attempts=10
+        )
+
+
+def test_histogram_percentiles():
+    histogram = stats.Histogram(buckets=[1, 2, 3, 4])
+    for value in [0.5] * 50 + [1.5] * 40 + [3.5] * 10:
+        histogram.add(value)
+    assert histogram.count == 100
+    assert 0.5 <= histogram.percentile(50) <= 1
+    assert 1 < histogram.percentile(90) <= 2
+    assert 3 < histogram.percentile(99) <= 3.5
+    assert histogram.summary()["histogram"] == {1: 50, 2: 40, 4: 10}
+
+
+def test_histogram_unbounded():
+    histogram = stats.Histogram(buckets=[1])
+    histogram.add(5)
+    assert histogram.percentile(99) == 5
+    assert histogram.summary()["histogram"] == {float("inf"): 1}
+
+
+def test_histogram_empty():
+    summary = stats.Histogram().summary()
+    assert summary["count"] == 0
+    assert summary["p50"] is None
+
+
+def test_app_stats(app):
+    app.get(OBJ)
+    app.get(OBJ)
+    summary = app.stats()
+    assert summary["pages"] == 2
+    assert summary["records"] == 1500
+    assert summary["server_errors"] > 0
+    assert summary["retries"] == summary["server_errors"]
+    assert summary["requests"] == 1 + summary["pages"] + summary["server_errors"]
+    assert summary["cache_hits"] == 1
+    assert summary["cache_misses"] == 1
+    assert summary["bytes_received"] > 0
+    latency = summary["latency"]["GET object"]
+    assert latency["count"] == summary["requests"] - 1
+    assert latency["min"] <= latency["p50"] <= latency["p99"] <= latency["max"]
+
+
+def test_app_stats_reset(app):
+    app.get(OBJ)
+    assert app.stats(reset=True)["requests"] > 0
+    summary = app.stats()
+    assert summary["requests"] == 0
+    assert summary["latency"] == {}
+
+
+def test_app_stats_writes(app):
+    app.record(data={"field_2": "hello"}, method="create", obj=OBJ)
+    summary = app.stats()
+    assert summary["bytes_sent"] == len(b'{"field_2": "hello"}')
+    assert "POST object" in summary["latency"]
+
+
+def test_app_stats_rate_limited(metadata, monkeypatch):
+    monkeypatch.setattr(knackpy.api, "_random_pause", lambda: None)
+    with server.MockServer(metadata, rate_limit=1):
+        app = knackpy.App(app_id=metadata["application"]["id"], api_key="abc")
+        with pytest.raises(Exception):
+            app._get_metadata()
+    assert app.stats()["rate_limited"] == app.max_attempts
@@ -0,0 +1,97 @@
+import knackpy
+from knackpy.testing import synthetic
+import pytest
+
+
+@pytest.fixture
+def metadata():
+    return synthetic.metadata(objects=2, seed=1)
+
+
+@pytest.fixture
+def app(metadata):
+    app = knackpy.app.App(
+        app_id=metadata["application"]["id"], api_key="abc", metadata=metadata
+    )
+    app.data = {
+        obj: list(synthetic.records(metadata, obj, 50, seed=1))
+        for obj in ["object_1", "object_2"]
+    }
+    return app
+
+
+def test_metadata_field_types(metadata):
+    for obj in metadata["application"]["objects"]:
+        field_types = {field["type"] for field in obj["fields"]}
+        assert field_types == set(synthetic.FIELD_TYPES)
+
+
+def test_metadata_field_count():
+    metadata = synthetic.metadata(objects=3, fields=50)
+    objects = metadata["application"]["objects"]
+    keys = [field["key"] for obj in objects for field in obj["fields"]]
+    assert all(len(obj["fields"]) == 51 for obj in objects)
+    assert len(set(keys)) == len(keys)
+
+
+def test_metadata_deterministic():
+    assert synthetic.metadata(seed=1) == synthetic.metadata(seed=1)
+    assert synthetic.metadata(seed=1) != synthetic.metadata(seed=2)
+
+
+def test_records_deterministic(metadata):
+    records = list(synthetic.records(metadata, "object_1", 20, seed=1))
+    assert records == list(synthetic.records(metadata, "object_1", 20, seed=1))
+    assert records != list(synthetic.records(metadata, "object_1", 20, seed=2))
+
+
+def test_records_start(metadata):
+    records = list(synthetic.records(metadata, "object_1", 20, connection_count=20))
+    tail = synthetic.records(metadata, "object_1", 5, start=15, connection_count=20)
+    assert records[15:] == list(tail)
+
+
+def test_records_connections(metadata):
+    ids = {record["id"] for record in synthetic.records(metadata, "object_2", 30)}
+    for record in synthetic.records(metadata, "object_1", 30):
+        for key, value in record.items():
+            if key.endswith("_raw") and isinstance(value, list):
+                assert all(connected["id"] in ids for connected in value)
+
+
+def test_records_format(app):
+    for obj in ["object_1", "object_2"]:
+        records = app.get(obj)
+        assert len(records) == 50
+        assert all(record.format() for record in records)
+
+
+def test_pages(metadata):
+    pages = list(synthetic.pages(metadata, "object_1", 2500, seed=1))
+    assert [page["current_page"] for page in pages] == [1, 2, 3]
+    assert [len(page["records"]) for page in pages] == [1000, 1000, 500]
+    assert all(page["total_records"] == 2500 for page in pages)
+
+
+def test_pages_match_records(metadata):
+    records = [
+        record
+        for page in synthetic.pages(metadata, "object_1", 25, rows_per_page=10)
+        for record in page["records"]
+    ]
+    assert records == list(synthetic.records(metadata, "object_1", 25))
+
+
+def test_records_date_time_formatted_matches_raw(metadata):
+    date_keys = [
+        field["key"]
+        for field in metadata["application"]["objects"][0]["fields"]
+        if field["type"] == "date_time"
+    ]
+    for record in synthetic.records(metadata, "object_1", 50, seed=1):
+        for key in date_keys:
+            raw = record[f"{key}_raw"]
+            if not raw:
+                continue
+            clock = f"{int(raw['hours'])}:{raw['minutes']}{raw['am_pm'].lower()}"
+            assert record[key] == f"{raw['date']} {clock}"